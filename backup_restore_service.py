@@ -2,41 +2,566 @@
 Backup and Restore Service for Qdrant/Haystack MCP Server.
 
 Implements local backup and restore functionality for Qdrant collections.
-Backs up to local JSON files and can restore from those files with verification.
+Backs up to local NDJSON/JSON files and can restore from those files with verification.
 """
+import contextlib
+import gzip
+import heapq
+import itertools
 import json
+import mmap
 import os
+import queue
+import shutil
 import sys
-from typing import Dict, List, Optional, Any
+import tarfile
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Any, Union
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 import hashlib
+import io
 
+import numpy as np
 from haystack.dataclasses.document import Document
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct
+from qdrant_client.models import Batch
 
-from bulk_operations_service import _get_qdrant_client
-from verification_service import verify_content_quality
+from bulk_operations_service import _get_qdrant_client, _point_id_sort_key, _uuid_slice_bounds
+from verification_service import (
+    verify_content_quality,
+    MIN_CONTENT_LENGTH,
+    REQUIRED_METADATA_FIELDS
+)
+
+# orjson is an optional speedup for the (potentially huge) document payloads;
+# fall back to stdlib json when it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# zstandard is optional and only needed for compress="zstd" backups
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# ijson is optional; it lets legacy (pre-2.1) JSON array backups be restored
+# without loading the whole array into memory
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+_ORJSON_OPTION = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+def _dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to JSON bytes (orjson when available).
+    
+    Output is compact unless ``indent`` is set, which indents by two spaces for
+    files meant to be read by humans (metadata.json, manifest.json).
+    """
+    if orjson is not None:
+        option = _ORJSON_OPTION | orjson.OPT_INDENT_2 if indent else _ORJSON_OPTION
+        return orjson.dumps(obj, default=str, option=option)
+    return json.dumps(obj, default=str, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Deserialize JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Number of scroll pages fetched ahead of the consumer by _scroll_pages
+SCROLL_PREFETCH_PAGES = 4
+
+# Default scroll page sizes. Scroll cost is dominated by per-request overhead, so
+# payload-only pages can be large; vectors dominate page size when embeddings are
+# included, so those pages are kept smaller.
+DEFAULT_SCROLL_PAGE_SIZE = 1000
+EMBEDDINGS_SCROLL_PAGE_SIZE = 200
+
+# Number of key-range slices a collection is scrolled in concurrently during backup.
+# Requested slice counts are capped so a large value can't flood the server with
+# concurrent scrolls (each slice is one thread plus its prefetch thread).
+DEFAULT_PARALLEL_SLICES = 4
+MAX_PARALLEL_SLICES = 16
+
+# Documents per restore batch (one existence check, embed call and write each).
+# Larger batches amortize the per-request overhead of retrieve/upsert and let the
+# embedder run at a more efficient batch size.
+RESTORE_BATCH_SIZE = 500
+
+# Maximum number of restore batches being written to Qdrant at the same time
+RESTORE_MAX_IN_FLIGHT = 8
+
+# With duplicate_strategy="skip", a target collection holding at most this many
+# points (and no more than the backup) has its IDs scrolled once into a set
+# instead of being queried with one retrieve per restore batch
+EXISTING_IDS_SCAN_LIMIT = 200_000
+
+# Maximum number of per-document issues reported by _verify_restored_documents
+MAX_REPORTED_ISSUES = 10
+
+# gzip level for compressed backups; level 1 keeps most of the size reduction on
+# text payloads at a fraction of the CPU cost of the default level
+GZIP_COMPRESS_LEVEL = 1
+
+# zstd level for compress="zstd" backups; level 3 (zstd's default) compresses
+# better than gzip -1 while still being faster
+ZSTD_COMPRESS_LEVEL = 3
+
+# Documents file suffix per compression
+_DOCUMENTS_SUFFIXES = {None: ".ndjson", "gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+
+# Embeddings are stored as raw little-endian rows in a binary sidecar next to each
+# documents file (4 bytes per value instead of ~10 bytes of JSON text). float16
+# halves that again with negligible effect on dense retrieval; restore widens the
+# values back to float32, which is what Qdrant stores.
+EMBEDDING_DTYPES = {"float32": "<f4", "float16": "<f2"}
+
+_END_OF_SCROLL = object()
+
+
+def _scroll_pages(
+    client: QdrantClient,
+    collection_name: str,
+    scroll_filter=None,
+    limit: int = 100,
+    with_payload: bool = True,
+    with_vectors: bool = False,
+    prefetch: int = SCROLL_PREFETCH_PAGES,
+    offset=None,
+    stop_before: Optional[tuple] = None
+) -> Iterator[List[Any]]:
+    """
+    Yield scroll pages of a collection, fetching ahead on a background thread.
+    
+    The producer thread issues ``client.scroll`` calls into a bounded queue, so the
+    network round-trip for the next page overlaps with whatever the caller does with
+    the current one (serialization, disk writes). Errors raised while scrolling are
+    re-raised in the caller.
+    
+    ``offset`` and ``stop_before`` (a ``_point_id_sort_key``) restrict the scroll to
+    a half-open range of point IDs, which is how ``_backup_collection`` slices a
+    collection across worker threads.
+    """
+    pages: queue.Queue = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    
+    def _put(item) -> bool:
+        # Poll so the producer can't block forever if the consumer stops early
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _produce(offset):
+        try:
+            while True:
+                points, next_offset = client.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=scroll_filter,
+                    limit=limit,
+                    offset=offset,
+                    with_payload=with_payload,
+                    with_vectors=with_vectors
+                )
+                if stop_before is not None and points and _point_id_sort_key(points[-1].id) >= stop_before:
+                    # Reached the next slice - keep only the points in our range
+                    points = [p for p in points if _point_id_sort_key(p.id) < stop_before]
+                    next_offset = None
+                if points and not _put(points):
+                    return
+                if not points or next_offset is None:
+                    break
+                offset = next_offset
+        except Exception as e:
+            _put(e)
+            return
+        _put(_END_OF_SCROLL)
+    
+    producer = threading.Thread(target=_produce, args=(offset,), name=f"scroll-{collection_name}", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = pages.get()
+            if item is _END_OF_SCROLL:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+
+
+def _point_vector(vector):
+    """Return the default vector of a point, handling both named and unnamed vectors."""
+    if isinstance(vector, dict):
+        if "default" in vector:
+            return vector["default"]
+        return next(iter(vector.values()), None)
+    return vector
+
+
+def _collection_documents_files(
+    backup_dir: Path,
+    backup_metadata: Dict[str, Any],
+    collection_key: str,
+    stem: str
+) -> List[Path]:
+    """
+    List the documents files of one collection in a backup, in restore order.
+    
+    Sliced backups record their part files in the collection's metadata; older
+    backups have a single documents file.
+    """
+    collection_info = backup_metadata.get("collections", {}).get(collection_key) or {}
+    if "files" in collection_info:
+        return [backup_dir / filename for filename in collection_info["files"]]
+    documents_file = _find_documents_file(backup_dir, stem)
+    return [documents_file] if documents_file is not None else []
+
+
+def _collection_embeddings(backup_metadata: Dict[str, Any], collection_key: str) -> Optional[Dict[str, Any]]:
+    """Embeddings sidecar metadata of one collection in a backup, if it has any."""
+    collection_info = backup_metadata.get("collections", {}).get(collection_key) or {}
+    return collection_info.get("embeddings")
+
+
+def _find_documents_file(backup_dir: Path, stem: str) -> Optional[Path]:
+    """
+    Locate a collection's documents file inside a backup directory.
+    
+    Prefers the streamed (optionally gzip or zstd compressed) NDJSON format
+    (backup_version >= 2.1) and falls back to the legacy single JSON array written
+    by older backups.
+    """
+    for suffix in (".ndjson.gz", ".ndjson.zst", ".ndjson", ".json"):
+        candidate = backup_dir / f"{stem}{suffix}"
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _iter_backup_documents(documents_file: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Yield documents from a backup documents file one at a time.
+    
+    NDJSON files (plain, .gz or .zst) are read line by line so memory stays bounded
+    regardless of backup size. Legacy JSON array files are parsed incrementally
+    with ijson when it is installed and loaded in full otherwise.
+    """
+    name = documents_file.name
+    if name.endswith(".ndjson.zst"):
+        if zstandard is None:
+            raise ImportError("The zstandard package is required to read zstd-compressed backups")
+        # One zstd frame is written per scroll page, so read across frames
+        with open(documents_file, "rb") as raw_file:
+            reader = zstandard.ZstdDecompressor().stream_reader(raw_file, read_across_frames=True)
+            with io.BufferedReader(reader) as f:
+                for line in f:
+                    if line.strip():
+                        yield _loads(line)
+    elif name.endswith(".ndjson") or name.endswith(".ndjson.gz"):
+        opener = gzip.open if name.endswith(".gz") else open
+        with opener(documents_file, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield _loads(line)
+    elif ijson is not None:
+        with open(documents_file, "rb") as f:
+            # use_float keeps numbers (embeddings) as floats instead of Decimal
+            yield from ijson.items(f, "item", use_float=True)
+    else:
+        yield from _loads(documents_file.read_bytes())
+
+
+def _iter_documents_files(
+    documents_files: List[Path],
+    embeddings: Optional[Dict[str, Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield documents from several backup documents files in order.
+    
+    ``embeddings`` is the collection's embeddings metadata (backup_version >= 2.2).
+    Each documents file's sidecar is memory-mapped, so resident memory doesn't grow
+    with the number of vectors, and a document's ``embedding_row`` is replaced by
+    its ``embedding`` read from that row (widened to float32 if stored as float16).
+    """
+    for documents_file in documents_files:
+        sidecar = embeddings["files"].get(documents_file.name) if embeddings else None
+        if sidecar is None:
+            yield from _iter_backup_documents(documents_file)
+            continue
+        
+        matrix = np.memmap(
+            documents_file.with_name(sidecar),
+            dtype=embeddings["dtype"],
+            mode="r"
+        ).reshape(-1, embeddings["dim"])
+        for doc_data in _iter_backup_documents(documents_file):
+            row = doc_data.pop("embedding_row", None)
+            if row is not None:
+                doc_data["embedding"] = matrix[row].astype(np.float32).tolist()
+            yield doc_data
+
+
+class _HashingWriter:
+    """
+    Write-through wrapper that tracks the SHA256 and size of the bytes written.
+    
+    Sits directly on top of the output file (below any compression layer), so the
+    checksum matches the bytes on disk without reading the file back.
+    """
+    
+    def __init__(self, raw: Any):
+        self._raw = raw
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+    
+    def write(self, data: bytes) -> int:
+        self.sha256.update(data)
+        self.size += len(data)
+        return self._raw.write(data)
+    
+    def flush(self) -> None:
+        self._raw.flush()
+    
+    def resume_at(self, size: int) -> None:
+        """Truncate the file to ``size`` bytes and re-seed the checksum from that prefix."""
+        self._raw.seek(0)
+        self._raw.truncate(size)
+        while chunk := self._raw.read(CHECKSUM_BUFFER_SIZE):
+            self.sha256.update(chunk)
+            self.size += len(chunk)
+
+
+def _slice_progress_path(out_path: Path) -> Path:
+    """Checkpoint file recording how far a backup slice file has been written."""
+    return out_path.with_name(f"{out_path.name}.progress.json")
+
+
+def _write_progress(progress_path: Path, progress: Dict[str, Any]) -> None:
+    """Atomically replace a progress checkpoint file."""
+    tmp_path = progress_path.with_name(f"{progress_path.name}.tmp")
+    tmp_path.write_bytes(_dumps(progress))
+    os.replace(tmp_path, progress_path)
+
+
+def _embeddings_path(documents_path: Path) -> Path:
+    """Binary embeddings sidecar belonging to a documents file."""
+    stem = documents_path.name.partition(".ndjson")[0]
+    return documents_path.with_name(f"{stem}.embeddings.bin")
+
+
+def _backup_slice(
+    client: QdrantClient,
+    collection_name: str,
+    out_path: Path,
+    qdrant_filter,
+    include_embeddings: bool,
+    scroll_page_size: int,
+    offset=None,
+    stop_before: Optional[tuple] = None,
+    compression: Optional[str] = "gzip",
+    resume: bool = False,
+    embedding_dtype: str = EMBEDDING_DTYPES["float32"]
+) -> Dict[str, Any]:
+    """
+    Stream one key-range slice of a collection to an NDJSON (optionally gzip or
+    zstd compressed) file.
+    
+    With ``include_embeddings`` the vectors are not written into the JSON lines;
+    each page's vectors are appended as one ``embedding_dtype`` block to a binary sidecar
+    (``<stem>.embeddings.bin``) and the document records its ``embedding_row``.
+    
+    The SHA256 checksums and sizes are computed from the bytes as they are written,
+    so the files never have to be read back for the manifest.
+    
+    Each scroll page is appended as a whole (one gzip member or zstd frame per page
+    when compressing), after which ``<file>.progress.json`` records the file sizes, the
+    document count and the last point ID written. With ``resume`` an existing
+    checkpoint is picked up: the files are truncated to the checkpointed sizes, the
+    checksums are re-seeded from those prefixes and scrolling continues after the
+    last point ID.
+    
+    Returns:
+        Dictionary with count, embedding_rows, embedding_dim and the manifest
+        entries of the documents file (and embeddings sidecar, if any)
+    """
+    progress_path = _slice_progress_path(out_path)
+    embeddings_path = _embeddings_path(out_path)
+    progress = None
+    if resume and progress_path.exists() and out_path.exists():
+        progress = _loads(progress_path.read_bytes())
+        if progress.get("done"):
+            return progress["result"]
+    
+    zstd_compressor = zstandard.ZstdCompressor(level=ZSTD_COMPRESS_LEVEL) if compression == "zstd" else None
+    
+    total_count = 0
+    embedding_rows = 0
+    embedding_dim = None
+    last_key = None
+    mode = "r+b" if progress else "wb"
+    with contextlib.ExitStack() as stack:
+        hashing_writer = _HashingWriter(stack.enter_context(open(out_path, mode)))
+        embeddings_writer = None
+        if include_embeddings:
+            embeddings_writer = _HashingWriter(stack.enter_context(open(embeddings_path, mode)))
+        
+        if progress:
+            # Drop anything written after the last checkpoint, then rehash what is kept
+            hashing_writer.resume_at(progress["size"])
+            if embeddings_writer is not None:
+                embeddings_writer.resume_at(progress["embeddings_size"])
+            total_count = progress["count"]
+            embedding_rows = progress["embedding_rows"]
+            embedding_dim = progress["embedding_dim"]
+            offset = progress["last_id"]
+            last_key = _point_id_sort_key(offset)
+        
+        # Scroll through the slice; the next page is fetched while this one is written
+        for points in _scroll_pages(
+            client,
+            collection_name,
+            scroll_filter=qdrant_filter,
+            limit=scroll_page_size,
+            with_payload=True,
+            with_vectors=include_embeddings,
+            offset=offset,
+            stop_before=stop_before
+        ):
+            if last_key is not None:
+                # The scroll offset is inclusive; skip the point written before the restart
+                points = [point for point in points if _point_id_sort_key(point.id) > last_key]
+                last_key = None
+                if not points:
+                    continue
+            
+            # Convert points to document format. Per-point lookups are bound once
+            # per page, and the vector layout (named or not) is checked on the
+            # first point only since it is the same for the whole collection.
+            lines = []
+            vectors = []
+            append_line = lines.append
+            append_vector = vectors.append
+            dumps = _dumps
+            named_vectors = isinstance(points[0].vector, dict)
+            for point in points:
+                # The payload already holds content, meta and any other fields;
+                # copy it in one C-level dict merge and only fill in defaults
+                doc_data = {"id": str(point.id), **point.payload}
+                doc_data.setdefault("content", "")
+                if doc_data.get("meta") is None:
+                    doc_data["meta"] = {}
+                
+                # Reference the embedding's row in the sidecar if requested
+                vector = point.vector
+                if vector and embeddings_writer is not None:
+                    doc_data["embedding_row"] = embedding_rows + len(vectors)
+                    append_vector(_point_vector(vector) if named_vectors else vector)
+                
+                append_line(dumps(doc_data))
+            
+            page = b"\n".join(lines) + b"\n"
+            # A complete gzip member / zstd frame per page keeps the file readable
+            # at every checkpoint
+            if compression == "gzip":
+                page = gzip.compress(page, compresslevel=GZIP_COMPRESS_LEVEL, mtime=0)
+            elif compression == "zstd":
+                page = zstd_compressor.compress(page)
+            hashing_writer.write(page)
+            hashing_writer.flush()
+            total_count += len(points)
+            
+            if vectors:
+                # One C-level conversion and write for the whole page
+                matrix = np.asarray(vectors, dtype=embedding_dtype)
+                embedding_dim = matrix.shape[1]
+                embeddings_writer.write(matrix.tobytes())
+                embeddings_writer.flush()
+                embedding_rows += len(vectors)
+            
+            _write_progress(progress_path, {
+                "last_id": points[-1].id,
+                "count": total_count,
+                "size": hashing_writer.size,
+                "embedding_rows": embedding_rows,
+                "embedding_dim": embedding_dim,
+                "embeddings_size": embeddings_writer.size if embeddings_writer is not None else 0
+            })
+    
+    files = [{
+        "filename": out_path.name,
+        "checksum": hashing_writer.sha256.hexdigest(),
+        "size": hashing_writer.size
+    }]
+    if embeddings_writer is not None:
+        files.append({
+            "filename": embeddings_path.name,
+            "checksum": embeddings_writer.sha256.hexdigest(),
+            "size": embeddings_writer.size
+        })
+    
+    result = {
+        "count": total_count,
+        "embedding_rows": embedding_rows,
+        "embedding_dim": embedding_dim,
+        "files": files
+    }
+    _write_progress(progress_path, {"done": True, "result": result})
+    return result
 
 
 def _backup_collection(
     collection_name: str,
     backup_path: Path,
+    file_stem: str,
     include_embeddings: bool = False,
-    filters: Optional[Dict[str, Any]] = None
-) -> tuple[List[Dict[str, Any]], int]:
+    filters: Optional[Dict[str, Any]] = None,
+    scroll_page_size: Optional[int] = None,
+    parallel_slices: int = DEFAULT_PARALLEL_SLICES,
+    compression: Optional[str] = "gzip",
+    resume: bool = False,
+    embedding_dtype: str = EMBEDDING_DTYPES["float32"]
+) -> tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Helper function to backup a single collection.
     
+    Streams every document as one NDJSON line while scrolling, so peak memory is a
+    few scroll pages regardless of collection size. With ``parallel_slices > 1``
+    the point ID space is split into ranges that are scrolled concurrently, each
+    into its own ``<file_stem>.part<i>.ndjson`` file; otherwise a single
+    ``<file_stem>.ndjson`` is written. ``compression`` ("gzip", "zstd" or None)
+    selects ``.ndjson.gz``, ``.ndjson.zst`` or plain ``.ndjson`` files.
+    Embeddings go to a binary sidecar per documents file. Empty slice files are
+    removed. With ``resume`` each slice continues from its progress checkpoint
+    (see ``_backup_slice``).
+    
     Returns:
-        Tuple of (documents_data, document_count)
+        Tuple of (manifest entries of the written files in order, collection
+        metadata with document_count, files and - when embeddings were written -
+        embeddings: {dtype, dim, files: documents file -> sidecar})
     """
     client = _get_qdrant_client()
-    documents_data = []
-    offset = None
-    total_count = 0
+    if scroll_page_size is None:
+        scroll_page_size = EMBEDDINGS_SCROLL_PAGE_SIZE if include_embeddings else DEFAULT_SCROLL_PAGE_SIZE
+    parallel_slices = max(1, min(parallel_slices, MAX_PARALLEL_SLICES))
     
     # Convert Haystack filter to Qdrant filter if provided
     qdrant_filter = None
@@ -44,51 +569,127 @@ def _backup_collection(
         from bulk_operations_service import _convert_haystack_filter_to_qdrant
         qdrant_filter = _convert_haystack_filter_to_qdrant(filters)
     
-    while True:
-        # Scroll through collection
-        scroll_result = client.scroll(
-            collection_name=collection_name,
-            scroll_filter=qdrant_filter,
-            limit=100,
-            offset=offset,
-            with_payload=True,
-            with_vectors=include_embeddings
-        )
-        
-        points, next_offset = scroll_result
-        
-        if not points:
-            break
-        
-        # Convert points to document format
-        for point in points:
-            doc_data = {
-                "id": str(point.id),
-                "content": point.payload.get("content", ""),
-                "meta": point.payload.get("meta", {}) or {},
-            }
-            
-            # Add embedding if requested
-            if include_embeddings and point.vector:
-                # Handle both named and default vectors
-                if isinstance(point.vector, dict):
-                    doc_data["embedding"] = point.vector.get("default", list(point.vector.values())[0] if point.vector else None)
-                else:
-                    doc_data["embedding"] = point.vector
-            
-            # Add all other payload fields
-            for key, value in point.payload.items():
-                if key not in ["content", "meta"]:
-                    doc_data[key] = value
-            
-            documents_data.append(doc_data)
-            total_count += 1
+    extension = _DOCUMENTS_SUFFIXES[compression]
+    if parallel_slices == 1:
+        out_paths = [backup_path / f"{file_stem}{extension}"]
+    else:
+        out_paths = [backup_path / f"{file_stem}.part{i}{extension}" for i in range(parallel_slices)]
+    
+    with ThreadPoolExecutor(max_workers=parallel_slices) as executor:
+        futures = [
+            executor.submit(
+                _backup_slice,
+                client,
+                collection_name,
+                out_path,
+                qdrant_filter,
+                include_embeddings,
+                scroll_page_size,
+                offset,
+                stop_before,
+                compression,
+                resume,
+                embedding_dtype
+            )
+            for out_path, (offset, stop_before) in zip(out_paths, _uuid_slice_bounds(parallel_slices))
+        ]
+        results = [future.result() for future in futures]
+    
+    written_files = []
+    documents_files = []
+    embedding_files = {}
+    embedding_dim = None
+    total_count = 0
+    for out_path, result in zip(out_paths, results):
+        total_count += result["count"]
+        if result["count"] == 0 and parallel_slices > 1:
+            out_path.unlink(missing_ok=True)
+            _embeddings_path(out_path).unlink(missing_ok=True)
+            _slice_progress_path(out_path).unlink(missing_ok=True)
+            continue
         
-        if next_offset is None:
-            break
-        offset = next_offset
+        documents_entry, *embeddings_entry = result["files"]
+        written_files.append(documents_entry)
+        documents_files.append(documents_entry["filename"])
+        if embeddings_entry and result["embedding_rows"] == 0:
+            # No point in this slice had a vector
+            _embeddings_path(out_path).unlink(missing_ok=True)
+        elif embeddings_entry:
+            written_files.append(embeddings_entry[0])
+            embedding_files[documents_entry["filename"]] = embeddings_entry[0]["filename"]
+            embedding_dim = result["embedding_dim"]
+    
+    collection_info = {
+        "document_count": total_count,
+        "files": documents_files
+    }
+    if embedding_files:
+        collection_info["embeddings"] = {
+            "dtype": embedding_dtype,
+            "dim": embedding_dim,
+            "files": embedding_files
+        }
+    
+    return written_files, collection_info
+
+
+def _find_incomplete_backup(backup_directory: Path, collection_name: str) -> Optional[Path]:
+    """
+    Return the newest backup of a collection that was started but never finished.
+    
+    A backup is incomplete when its run checkpoint (progress.json) is still present
+    and manifest.json, which is written last, is missing.
+    """
+    if not backup_directory.is_dir():
+        return None
+    
+    prefix = f"backup_{collection_name}_"
+    candidates = []
+    with os.scandir(backup_directory) as entries:
+        for entry in entries:
+            if not entry.name.startswith(prefix) or not entry.is_dir():
+                continue
+            started = os.path.isfile(os.path.join(entry.path, "progress.json"))
+            if started and not os.path.isfile(os.path.join(entry.path, "manifest.json")):
+                candidates.append(entry.name)
     
-    return documents_data, total_count
+    # Directory names end in a sortable UTC timestamp
+    return backup_directory / max(candidates) if candidates else None
+
+
+def _archive_backup(backup_path: Path) -> Path:
+    """
+    Pack a completed backup directory into a single ``<backup_id>.tar`` and remove
+    the directory.
+    
+    metadata.json is stored as the first member so list_backups only has to read
+    the archive's head. The documents files are already compressed, so the tar
+    itself is not. The archive is written under a temporary name and renamed into
+    place, so a ``.tar`` only ever exists for a complete backup.
+    """
+    archive_path = backup_path.with_name(f"{backup_path.name}.tar")
+    tmp_path = archive_path.with_name(f"{archive_path.name}.tmp")
+    
+    members = sorted(
+        (path for path in backup_path.iterdir() if path.name != "metadata.json"),
+        key=lambda path: (path.name != "manifest.json", path.name)
+    )
+    with tarfile.open(tmp_path, "w") as archive:
+        for path in [backup_path / "metadata.json", *members]:
+            archive.add(path, arcname=path.name)
+    
+    os.replace(tmp_path, archive_path)
+    shutil.rmtree(backup_path)
+    return archive_path
+
+
+def _read_archive_metadata(archive_path: str) -> Dict[str, Any]:
+    """Read metadata.json from a backup archive (normally its first member)."""
+    with tarfile.open(archive_path, "r") as archive:
+        member = archive.next()
+        if member is None or member.name != "metadata.json":
+            member = archive.getmember("metadata.json")
+        return _loads(archive.extractfile(member).read())
 
 
 def create_backup(
@@ -97,17 +698,31 @@ def create_backup(
     collection_name: Optional[str] = None,
     include_embeddings: bool = False,
     filters: Optional[Dict[str, Any]] = None,
-    code_document_store: Optional[QdrantDocumentStore] = None
+    code_document_store: Optional[QdrantDocumentStore] = None,
+    scroll_page_size: Optional[int] = None,
+    parallel_slices: int = DEFAULT_PARALLEL_SLICES,
+    compress: Union[bool, str] = True,
+    resume: bool = False,
+    embedding_dtype: str = "float32",
+    archive: bool = False
 ) -> Dict[str, Any]:
     """
     Create a local backup of Qdrant collections (documentation and optionally code).
     
     Creates a timestamped backup directory containing:
-    - documents.json: All documentation documents with metadata
-    - code_documents.json: All code documents with metadata (if code_document_store provided)
+    - documents.ndjson.gz: All documentation documents with metadata (one JSON document per
+      line, gzip-compressed), or documents.part<i>.ndjson.gz slices when parallel_slices > 1
+    - code_documents.ndjson.gz: All code documents with metadata (if code_document_store
+      provided), sliced the same way
+    - <stem>.embeddings.bin: Embedding rows for each documents file (if
+      include_embeddings), referenced from the documents by embedding_row
     - metadata.json: Backup metadata (timestamp, collection info, stats)
     - manifest.json: File manifest with checksums
     
+    While the backup runs, progress.json (run settings) and one
+    <file>.progress.json checkpoint per documents file are kept in the backup
+    directory; they are removed once manifest.json has been written.
+    
     Args:
         document_store: QdrantDocumentStore instance for documentation
         backup_directory: Directory to store backups (default: "./backups")
@@ -115,63 +730,147 @@ def create_backup(
         include_embeddings: Whether to include embeddings in backup (default: False)
         filters: Optional Haystack filter dictionary to filter documents
         code_document_store: Optional QdrantDocumentStore instance for code collection
+        scroll_page_size: Points fetched per scroll request. Larger pages mean fewer
+            round-trips; defaults to DEFAULT_SCROLL_PAGE_SIZE, or the smaller
+            EMBEDDINGS_SCROLL_PAGE_SIZE when embeddings are included.
+        parallel_slices: Number of point ID ranges scrolled concurrently per
+            collection (default: DEFAULT_PARALLEL_SLICES; 1 disables slicing,
+            capped at MAX_PARALLEL_SLICES)
+        compress: Compression of the documents files: True or "gzip" (default,
+            .ndjson.gz), "zstd" (.ndjson.zst, smaller and faster; requires the
+            zstandard package) or False for plain .ndjson files
+        resume: Continue the newest interrupted backup of the collection from its
+            checkpoints instead of starting over (default: False). The interrupted
+            run's backup_id, include_embeddings, filters, parallel_slices,
+            compress and embedding_dtype settings are reused. Starts a new
+            backup if none is found.
+        embedding_dtype: Storage precision of embeddings, "float32" (default,
+            lossless) or "float16" (half the size)
+        archive: Pack the finished backup into a single <backup_id>.tar instead
+            of leaving a directory of files (default: False). restore_backup and
+            list_backups accept both forms.
         
     Returns:
         Dictionary with backup information:
         - status: "success" or "error"
-        - backup_path: Path to backup directory
+        - backup_path: Path to backup directory (or .tar archive)
         - backup_id: Unique backup identifier
         - document_count: Total number of documents backed up
         - documentation_count: Number of documentation documents
         - code_count: Number of code documents (0 if not backed up)
         - backup_metadata: Backup metadata
+        - resumed: Whether an interrupted backup was continued
     """
+    compression = "gzip" if compress is True else (compress or None)
+    if compression not in _DOCUMENTS_SUFFIXES:
+        return {
+            "status": "error",
+            "error": f"Invalid compress: {compress}. Must be True, False, 'gzip' or 'zstd'"
+        }
+    if compression == "zstd" and zstandard is None:
+        return {
+            "status": "error",
+            "error": "compress='zstd' requires the zstandard package"
+        }
+    
+    if embedding_dtype not in EMBEDDING_DTYPES:
+        return {
+            "status": "error",
+            "error": f"Invalid embedding_dtype: {embedding_dtype}. Must be one of {list(EMBEDDING_DTYPES)}"
+        }
+    
     try:
         # Get collection names
         docs_collection = collection_name or document_store.index
         code_collection = code_document_store.index if code_document_store else None
         
-        # Create backup directory with timestamp
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        backup_id = f"backup_{docs_collection}_{timestamp}"
-        backup_path = Path(backup_directory) / backup_id
-        backup_path.mkdir(parents=True, exist_ok=True)
+        backup_path = _find_incomplete_backup(Path(backup_directory), docs_collection) if resume else None
+        resumed = backup_path is not None
         
-        # Backup documentation collection
-        docs_data, docs_count = _backup_collection(
-            collection_name=docs_collection,
-            backup_path=backup_path,
-            include_embeddings=include_embeddings,
-            filters=filters
-        )
+        if resumed:
+            # Continue with the settings the interrupted run was started with
+            run_progress_path = backup_path / "progress.json"
+            run_state = _loads(run_progress_path.read_bytes())
+            backup_id = backup_path.name
+            created_at = run_state["created_at"]
+            include_embeddings = run_state["include_embeddings"]
+            filters = run_state["filters"]
+            parallel_slices = run_state["parallel_slices"]
+            compression = run_state["compression"]
+            embedding_dtype = run_state.get("embedding_dtype", "float32")
+        else:
+            # Create backup directory with timestamp
+            # Single clock read shared by the directory name, metadata and manifest
+            now = datetime.now(timezone.utc)
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
+            created_at = now.isoformat().replace("+00:00", "Z")
+            backup_id = f"backup_{docs_collection}_{timestamp}"
+            backup_path = Path(backup_directory) / backup_id
+            backup_path.mkdir(parents=True, exist_ok=True)
+            
+            run_progress_path = backup_path / "progress.json"
+            _write_progress(run_progress_path, {
+                "created_at": created_at,
+                "include_embeddings": include_embeddings,
+                "filters": filters,
+                "parallel_slices": parallel_slices,
+                "compression": compression,
+                "embedding_dtype": embedding_dtype
+            })
         
-        # Save documentation documents to JSON
-        documents_file = backup_path / "documents.json"
-        with open(documents_file, "w", encoding="utf-8") as f:
-            json.dump(docs_data, f, indent=2, default=str)
-        documents_checksum = _calculate_file_checksum(documents_file)
+        backup_options = {
+            "backup_path": backup_path,
+            "include_embeddings": include_embeddings,
+            "filters": filters,
+            "scroll_page_size": scroll_page_size,
+            "parallel_slices": parallel_slices,
+            "compression": compression,
+            "resume": resumed,
+            "embedding_dtype": EMBEDDING_DTYPES[embedding_dtype]
+        }
         
-        # Backup code collection if provided
-        code_count = 0
-        code_checksum = None
-        if code_document_store and code_collection:
-            try:
-                code_data, code_count = _backup_collection(
+        # The documentation and code collections are independent, so both are
+        # scrolled and written concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            # Backup documentation collection, streaming straight to NDJSON
+            # (compact - this is the large payload; metadata.json and manifest.json
+            # stay indented for humans)
+            docs_future = executor.submit(
+                _backup_collection,
+                collection_name=docs_collection,
+                file_stem="documents",
+                **backup_options
+            )
+            
+            # Backup code collection if provided
+            code_future = None
+            if code_document_store and code_collection:
+                code_future = executor.submit(
+                    _backup_collection,
                     collection_name=code_collection,
-                    backup_path=backup_path,
-                    include_embeddings=include_embeddings,
-                    filters=filters
+                    file_stem="code_documents",
+                    **backup_options
                 )
+            
+            documents_files, docs_info = docs_future.result()
+            docs_count = docs_info["document_count"]
+            
+            code_count = 0
+            code_documents_files = []
+            if code_future is not None:
+                try:
+                    code_documents_files, code_info = code_future.result()
+                    code_count = code_info["document_count"]
+                except Exception as e:
+                    # Log error but continue with docs backup
+                    print(f"Warning: Failed to backup code collection: {e}", file=sys.stderr)
+                    code_count = 0
                 
-                # Save code documents to JSON
-                code_documents_file = backup_path / "code_documents.json"
-                with open(code_documents_file, "w", encoding="utf-8") as f:
-                    json.dump(code_data, f, indent=2, default=str)
-                code_checksum = _calculate_file_checksum(code_documents_file)
-            except Exception as e:
-                # Log error but continue with docs backup
-                print(f"Warning: Failed to backup code collection: {e}", file=sys.stderr)
-                code_count = 0
+                if code_count == 0:
+                    # Don't leave empty or partial files behind that the manifest doesn't cover
+                    for code_documents_file in backup_path.glob("code_documents*"):
+                        code_documents_file.unlink()
+                    code_documents_files = []
         
         total_count = docs_count + code_count
         
@@ -181,63 +880,66 @@ def create_backup(
             "collections": {
                 "documentation": {
                     "collection_name": docs_collection,
-                    "document_count": docs_count
+                    **docs_info
                 }
             },
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": created_at,
             "document_count": total_count,
             "documentation_count": docs_count,
             "code_count": code_count,
             "include_embeddings": include_embeddings,
+            "compression": compression,
             "filters_applied": filters is not None,
             "filters": filters,
-            "backup_version": "2.0"  # Version 2.0 supports multiple collections
+            # 2.0 added multiple collections, 2.1 streams NDJSON, 2.2 moves embeddings
+            # into binary sidecars
+            "backup_version": "2.2"
         }
         
         # Add code collection info if backed up
         if code_collection and code_count > 0:
             backup_metadata["collections"]["code"] = {
                 "collection_name": code_collection,
-                "document_count": code_count
+                **code_info
             }
         
-        metadata_file = backup_path / "metadata.json"
-        with open(metadata_file, "w", encoding="utf-8") as f:
-            json.dump(backup_metadata, f, indent=2, default=str)
-        metadata_checksum = _calculate_file_checksum(metadata_file)
+        # Serialize once so the checksum and size come from the in-memory bytes
+        metadata_bytes = _dumps(backup_metadata, indent=True)
+        (backup_path / "metadata.json").write_bytes(metadata_bytes)
         
-        # Create manifest
+        # Create manifest (code documents files are only present if backed up);
+        # documents checksums were computed while streaming
         manifest_files = [
-            {
-                "filename": "documents.json",
-                "checksum": documents_checksum,
-                "size": documents_file.stat().st_size
-            },
+            *documents_files,
             {
                 "filename": "metadata.json",
-                "checksum": metadata_checksum,
-                "size": metadata_file.stat().st_size
-            }
+                "checksum": hashlib.sha256(metadata_bytes).hexdigest(),
+                "size": len(metadata_bytes)
+            },
+            *code_documents_files
         ]
         
-        # Add code documents to manifest if backed up
-        if code_collection and code_count > 0:
-            code_documents_file = backup_path / "code_documents.json"
-            manifest_files.append({
-                "filename": "code_documents.json",
-                "checksum": code_checksum,
-                "size": code_documents_file.stat().st_size
-            })
-        
         manifest = {
             "backup_id": backup_id,
             "files": manifest_files,
-            "created_at": datetime.utcnow().isoformat() + "Z"
+            "created_at": created_at
         }
         
-        manifest_file = backup_path / "manifest.json"
-        with open(manifest_file, "w", encoding="utf-8") as f:
-            json.dump(manifest, f, indent=2, default=str)
+        (backup_path / "manifest.json").write_bytes(_dumps(manifest, indent=True))
+        
+        # The backup is complete; checkpoints are only needed to resume
+        for progress_file in backup_path.glob("*.progress.json"):
+            progress_file.unlink()
+        run_progress_path.unlink()
+        
+        if archive:
+            backup_path = _archive_backup(backup_path)
+        
+        try:
+            _record_backup_in_index(backup_path.parent, _backup_summary(backup_metadata, backup_path.name))
+        except OSError:
+            # The backup itself is complete; only the listing index could not be updated
+            pass
         
         return {
             "status": "success",
@@ -247,7 +949,8 @@ def create_backup(
             "documentation_count": docs_count,
             "code_count": code_count,
             "backup_metadata": backup_metadata,
-            "manifest": manifest
+            "manifest": manifest,
+            "resumed": resumed
         }
     
     except Exception as e:
@@ -258,17 +961,54 @@ def create_backup(
         }
 
 
+def _batched(iterable: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to batch_size items from an iterable."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _existing_point_ids(client: QdrantClient, collection_name: str, point_ids: List[Any]) -> set:
+    """
+    Return the subset of point_ids (as strings) that already exist in a collection.
+    
+    One ``retrieve`` call per batch looks IDs up in Qdrant's ID index, so the cost is
+    proportional to the documents being restored rather than the collection size.
+    """
+    point_ids = [point_id for point_id in point_ids if point_id is not None]
+    if not point_ids:
+        return set()
+    points = client.retrieve(
+        collection_name=collection_name,
+        ids=point_ids,
+        with_payload=False,
+        with_vectors=False
+    )
+    return {str(p.id) for p in points}
+
+
 def _restore_collection(
-    documents_data: List[Dict[str, Any]],
+    documents_data: Iterable[Dict[str, Any]],
     document_store: QdrantDocumentStore,
     collection_name: str,
     duplicate_strategy: str,
     embedder,
-    backup_has_embeddings: bool
+    backup_has_embeddings: bool,
+    client: Optional[QdrantClient] = None,
+    expected_count: Optional[int] = None
 ) -> tuple[int, int, List[str]]:
     """
     Helper function to restore a single collection.
     
+    With duplicate_strategy="skip", existing documents are found with one
+    ``retrieve`` per batch, which only touches the IDs being restored. When the
+    target collection is empty no lookups are made at all, and when it is small
+    compared to the backup (``expected_count`` documents) its IDs are scrolled once
+    instead.
+    
     Returns:
         Tuple of (restored_count, skipped_count, errors)
     """
@@ -277,72 +1017,104 @@ def _restore_collection(
     errors = []
     
     # Get Qdrant client
-    client = _get_qdrant_client()
+    if client is None:
+        client = _get_qdrant_client()
     
-    # Check for existing documents if duplicate_strategy is "skip"
-    existing_doc_ids = set()
+    # IDs already in the target collection, or None to look them up per batch
+    known_ids = None
     if duplicate_strategy == "skip":
-        offset = None
-        while True:
-            scroll_result = client.scroll(
-                collection_name=collection_name,
-                limit=100,
-                offset=offset,
-                with_payload=False,
-                with_vectors=False
-            )
-            points, next_offset = scroll_result
-            if not points:
-                break
-            existing_doc_ids.update(str(p.id) for p in points)
-            if next_offset is None:
-                break
-            offset = next_offset
+        try:
+            target_count = client.count(collection_name=collection_name, exact=True).count
+        except Exception:
+            target_count = None
+        if target_count == 0:
+            known_ids = set()
+        elif target_count is not None and expected_count and target_count <= min(expected_count, EXISTING_IDS_SCAN_LIMIT):
+            known_ids = {
+                str(point.id)
+                for points in _scroll_pages(client, collection_name, limit=DEFAULT_SCROLL_PAGE_SIZE, with_payload=False)
+                for point in points
+            }
     
-    # Check if documents actually have embeddings
-    all_docs_have_embeddings = all(
-        "embedding" in doc_data and doc_data.get("embedding") is not None
-        for doc_data in documents_data
-    ) if documents_data else False
+    def _drop_existing(batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Skip documents that already exist if duplicate_strategy is "skip"
+        nonlocal skipped_count
+        if duplicate_strategy != "skip":
+            return batch
+        if known_ids is not None:
+            existing_ids = known_ids
+        else:
+            existing_ids = _existing_point_ids(client, collection_name, [d.get("id") for d in batch])
+        if not existing_ids:
+            return batch
+        kept = [d for d in batch if str(d.get("id")) not in existing_ids]
+        skipped_count += len(batch) - len(kept)
+        return kept
     
     # Use Haystack path (regenerates embeddings) if:
     # 1. Embedder is provided (allows embedding regeneration), OR
-    # 2. Backup doesn't have embeddings, OR  
-    # 3. Documents don't have embeddings
-    use_haystack_path = embedder is not None or (not backup_has_embeddings) or (not all_docs_have_embeddings)
+    # 2. Backup doesn't have embeddings
+    # The backup metadata is authoritative, so documents_data (possibly a one-shot
+    # generator) is never pre-scanned; individual documents missing an embedding
+    # are handled inside the direct upsert loop.
+    use_haystack_path = embedder is not None or not backup_has_embeddings
     
-    if use_haystack_path:
-        # Use Haystack's write_documents to restore with automatic embedding regeneration
-        batch_size = 100
-        documents_to_restore = []
+    def _to_document(doc_data: Dict[str, Any]) -> Document:
+        # Recreate Haystack Document from backup data
+        content = doc_data.get("content", "")
+        meta = doc_data.get("meta", {})
         
-        for doc_data in documents_data:
-            doc_id = doc_data.get("id")
-            
-            # Skip if duplicate and strategy is "skip"
-            if duplicate_strategy == "skip" and doc_id in existing_doc_ids:
-                skipped_count += 1
-                continue
-            
-            # Recreate Haystack Document from backup data
-            content = doc_data.get("content", "")
-            meta = doc_data.get("meta", {})
-            
-            # Preserve original doc_id if available
-            if "doc_id" in meta:
-                meta["doc_id"] = meta["doc_id"]
-            
-            # Create Document (embeddings will be regenerated by Haystack)
-            doc = Document(
-                content=content,
-                meta=meta
-            )
-            
-            documents_to_restore.append(doc)
-            
-            # Write in batches
-            if len(documents_to_restore) >= batch_size:
+        # Preserve original doc_id if available
+        if "doc_id" in meta:
+            meta["doc_id"] = meta["doc_id"]
+        
+        # Create Document (embeddings will be regenerated by Haystack)
+        return Document(
+            content=content,
+            meta=meta
+        )
+    
+    # Batches are written on a thread pool while the next one is read (and embedded),
+    # with at most RESTORE_MAX_IN_FLIGHT writes outstanding.
+    executor = ThreadPoolExecutor(max_workers=RESTORE_MAX_IN_FLIGHT)
+    in_flight: Dict[Future, str] = {}
+    
+    def _collect(done) -> None:
+        nonlocal restored_count
+        for future in done:
+            error_label = in_flight.pop(future)
+            try:
+                restored_count += future.result()
+            except Exception as e:
+                errors.append(f"{error_label}: {str(e)}")
+    
+    def _submit(error_label: str, write_batch, batch) -> None:
+        if len(in_flight) >= RESTORE_MAX_IN_FLIGHT:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            _collect(done)
+        in_flight[executor.submit(write_batch, batch)] = error_label
+    
+    def _write_documents(documents: List[Document]) -> int:
+        document_store.write_documents(documents)
+        return len(documents)
+    
+    def _upsert_points(points: Batch) -> int:
+        client.upsert(
+            collection_name=collection_name,
+            points=points
+        )
+        return len(points.ids)
+    
+    try:
+        if use_haystack_path:
+            # Use Haystack's write_documents to restore with automatic embedding regeneration
+            for batch in _batched(documents_data, RESTORE_BATCH_SIZE):
                 try:
+                    documents_to_restore = [_to_document(doc_data) for doc_data in _drop_existing(batch)]
+                    
+                    if not documents_to_restore:
+                        continue
+                    
                     # Embed documents before writing (required by Haystack)
                     if embedder:
                         result = embedder.run(documents=documents_to_restore)
@@ -350,83 +1122,52 @@ def _restore_collection(
                     else:
                         documents_with_embeddings = documents_to_restore
                     
-                    document_store.write_documents(documents_with_embeddings)
-                    restored_count += len(documents_with_embeddings)
-                    documents_to_restore = []
+                    _submit("Batch restore error", _write_documents, documents_with_embeddings)
                 except Exception as e:
                     errors.append(f"Batch restore error: {str(e)}")
         
-        # Write remaining documents
-        if documents_to_restore:
-            try:
-                if embedder:
-                    result = embedder.run(documents=documents_to_restore)
-                    documents_with_embeddings = result.get("documents", documents_to_restore)
-                else:
-                    documents_with_embeddings = documents_to_restore
-                
-                document_store.write_documents(documents_with_embeddings)
-                restored_count += len(documents_with_embeddings)
-            except Exception as e:
-                errors.append(f"Final batch restore error: {str(e)}")
-    
-    else:
-        # Use direct Qdrant upsert when we have embeddings (faster, preserves original IDs)
-        batch_size = 100
-        points_to_upsert = []
-        
-        for doc_data in documents_data:
-            doc_id = doc_data.get("id")
-            
-            # Skip if duplicate and strategy is "skip"
-            if duplicate_strategy == "skip" and doc_id in existing_doc_ids:
-                skipped_count += 1
-                continue
-            
-            # Prepare point for upsert
-            payload = {
-                "content": doc_data.get("content", ""),
-                "meta": doc_data.get("meta", {})
-            }
-            
-            # Add other payload fields
-            for key, value in doc_data.items():
-                if key not in ["id", "content", "meta", "embedding"]:
-                    payload[key] = value
-            
-            # Prepare vector (we know it exists here)
-            vector = doc_data.get("embedding")
-            
-            point = PointStruct(
-                id=doc_id,
-                vector=vector,
-                payload=payload
-            )
-            
-            points_to_upsert.append(point)
-            
-            # Upsert in batches
-            if len(points_to_upsert) >= batch_size:
+        else:
+            # Use direct Qdrant upsert when we have embeddings (faster, preserves original IDs)
+            for batch in _batched(documents_data, RESTORE_BATCH_SIZE):
                 try:
-                    client.upsert(
-                        collection_name=collection_name,
-                        points=points_to_upsert
-                    )
-                    restored_count += len(points_to_upsert)
-                    points_to_upsert = []
+                    # Column-oriented batch: one Batch model per upsert instead of a
+                    # validated PointStruct per document
+                    ids = []
+                    vectors = []
+                    payloads = []
+                    documents_without_embedding = []
+                    for doc_data in _drop_existing(batch):
+                        # Prepare vector; a document saved without one goes through Haystack
+                        vector = doc_data.get("embedding")
+                        if vector is None:
+                            documents_without_embedding.append(_to_document(doc_data))
+                            continue
+                        
+                        # Prepare point for upsert: every field except id and
+                        # embedding goes back into the payload
+                        payload = dict(doc_data)
+                        point_id = payload.pop("id", None)
+                        del payload["embedding"]
+                        payload.setdefault("content", "")
+                        payload.setdefault("meta", {})
+                        
+                        ids.append(point_id)
+                        vectors.append(vector)
+                        payloads.append(payload)
+                    
+                    if documents_without_embedding:
+                        _submit("Batch restore error", _write_documents, documents_without_embedding)
+                    if ids:
+                        _submit(
+                            "Batch upsert error",
+                            _upsert_points,
+                            Batch(ids=ids, vectors=vectors, payloads=payloads)
+                        )
                 except Exception as e:
                     errors.append(f"Batch upsert error: {str(e)}")
-        
-        # Upsert remaining points
-        if points_to_upsert:
-            try:
-                client.upsert(
-                    collection_name=collection_name,
-                    points=points_to_upsert
-                )
-                restored_count += len(points_to_upsert)
-            except Exception as e:
-                errors.append(f"Final batch upsert error: {str(e)}")
+    finally:
+        _collect(wait(in_flight).done)
+        executor.shutdown()
     
     return restored_count, skipped_count, errors
 
@@ -445,7 +1186,8 @@ def restore_backup(
     Restore collections from a local backup (documentation and optionally code).
     
     Args:
-        backup_path: Path to backup directory
+        backup_path: Path to backup directory, or to a backup archive (.tar)
+            created with archive=True
         document_store: QdrantDocumentStore instance for documentation
         collection_name: Optional collection name (defaults to document_store.index)
         verify_after_restore: Whether to verify documents after restore (default: True)
@@ -466,6 +1208,25 @@ def restore_backup(
     try:
         backup_dir = Path(backup_path)
         
+        if backup_dir.is_file() and tarfile.is_tarfile(backup_dir):
+            # Unpack next to the archive (same filesystem) and restore from there
+            with tempfile.TemporaryDirectory(dir=backup_dir.parent, prefix=".restore_") as extract_dir:
+                with tarfile.open(backup_dir, "r") as archive:
+                    if hasattr(tarfile, "data_filter"):
+                        archive.extractall(extract_dir, filter="data")
+                    else:
+                        archive.extractall(extract_dir)
+                return restore_backup(
+                    backup_path=extract_dir,
+                    document_store=document_store,
+                    collection_name=collection_name,
+                    verify_after_restore=verify_after_restore,
+                    duplicate_strategy=duplicate_strategy,
+                    embedder=embedder,
+                    code_document_store=code_document_store,
+                    code_embedder=code_embedder
+                )
+        
         if not backup_dir.exists():
             return {
                 "status": "error",
@@ -480,8 +1241,7 @@ def restore_backup(
                 "error": "Manifest file not found in backup directory"
             }
         
-        with open(manifest_file, "r", encoding="utf-8") as f:
-            manifest = json.load(f)
+        manifest = _loads(manifest_file.read_bytes())
         
         # Verify file checksums
         verification_result = _verify_backup_integrity(backup_dir, manifest)
@@ -494,24 +1254,20 @@ def restore_backup(
         
         # Load metadata
         metadata_file = backup_dir / "metadata.json"
-        with open(metadata_file, "r", encoding="utf-8") as f:
-            backup_metadata = json.load(f)
+        backup_metadata = _loads(metadata_file.read_bytes())
         
         # Check backup version for backward compatibility
         backup_version = backup_metadata.get("backup_version", "1.0")
         is_multi_collection = backup_version >= "2.0" or "collections" in backup_metadata
         
-        # Load documentation documents
-        documents_file = backup_dir / "documents.json"
-        if not documents_file.exists():
+        # Locate documentation documents (streamed lazily during restore)
+        documents_files = _collection_documents_files(backup_dir, backup_metadata, "documentation", "documents")
+        if not documents_files:
             return {
                 "status": "error",
-                "error": "documents.json not found in backup directory"
+                "error": "documents.ndjson (or legacy documents.json) not found in backup directory"
             }
         
-        with open(documents_file, "r", encoding="utf-8") as f:
-            documents_data = json.load(f)
-        
         # Get collection names
         if is_multi_collection:
             collections_info = backup_metadata.get("collections", {})
@@ -529,14 +1285,22 @@ def restore_backup(
         # Check if backup has embeddings
         backup_has_embeddings = backup_metadata.get("include_embeddings", False)
         
+        # One client shared by both collections and the verification pass
+        client = _get_qdrant_client()
+        
         # Restore documentation collection
         docs_restored, docs_skipped, docs_errors = _restore_collection(
-            documents_data=documents_data,
+            documents_data=_iter_documents_files(
+                documents_files,
+                _collection_embeddings(backup_metadata, "documentation")
+            ),
             document_store=document_store,
             collection_name=docs_collection,
             duplicate_strategy=duplicate_strategy,
             embedder=embedder,
-            backup_has_embeddings=backup_has_embeddings
+            backup_has_embeddings=backup_has_embeddings,
+            client=client,
+            expected_count=backup_metadata.get("documentation_count", backup_metadata.get("document_count"))
         )
         
         # Restore code collection if backup contains it and code_document_store is provided
@@ -545,20 +1309,22 @@ def restore_backup(
         code_errors = []
         code_collection = None
         
-        code_documents_file = backup_dir / "code_documents.json"
-        if code_documents_file.exists() and code_document_store:
+        code_documents_files = _collection_documents_files(backup_dir, backup_metadata, "code", "code_documents")
+        if code_documents_files and code_document_store:
             try:
-                with open(code_documents_file, "r", encoding="utf-8") as f:
-                    code_documents_data = json.load(f)
-                
                 code_collection = code_document_store.index
                 code_restored, code_skipped, code_errors = _restore_collection(
-                    documents_data=code_documents_data,
+                    documents_data=_iter_documents_files(
+                        code_documents_files,
+                        _collection_embeddings(backup_metadata, "code")
+                    ),
                     document_store=code_document_store,
                     collection_name=code_collection,
                     duplicate_strategy=duplicate_strategy,
                     embedder=code_embedder or embedder,  # Fallback to docs embedder if code embedder not provided
-                    backup_has_embeddings=backup_has_embeddings
+                    backup_has_embeddings=backup_has_embeddings,
+                    client=client,
+                    expected_count=backup_metadata.get("code_count")
                 )
             except Exception as e:
                 code_errors.append(f"Failed to restore code collection: {str(e)}")
@@ -594,13 +1360,15 @@ def restore_backup(
                 verification_results["documentation"] = _verify_restored_documents(
                     document_store,
                     docs_collection,
-                    sample_size=min(100, docs_restored)
+                    sample_size=min(100, docs_restored),
+                    client=client
                 )
             if code_restored > 0 and code_collection:
                 verification_results["code"] = _verify_restored_documents(
                     code_document_store,
                     code_collection,
-                    sample_size=min(100, code_restored)
+                    sample_size=min(100, code_restored),
+                    client=client
                 )
             result["verification_results"] = verification_results
         
@@ -614,12 +1382,116 @@ def restore_backup(
         }
 
 
-def list_backups(backup_directory: str = "./backups") -> Dict[str, Any]:
+# Summary of every completed backup in a backup directory, one JSON object per
+# line, so list_backups can read one file instead of opening every backup
+BACKUP_INDEX_FILE = "index.jsonl"
+
+
+def _backup_summary(metadata: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """list_backups entry for a backup (without backup_path), keyed by its file name."""
+    return {
+        "name": name,
+        "backup_id": metadata.get("backup_id", name),
+        "collection_name": metadata.get("collection_name"),
+        "timestamp": metadata.get("timestamp"),
+        "document_count": metadata.get("document_count", 0),
+        "include_embeddings": metadata.get("include_embeddings", False)
+    }
+
+
+def _append_backup_index(backup_directory: Path, summaries: List[Dict[str, Any]]) -> None:
+    """Append backup summaries to the directory's index (one write, O_APPEND)."""
+    if summaries:
+        with open(backup_directory / BACKUP_INDEX_FILE, "ab") as f:
+            f.write(b"".join(_dumps(summary) + b"\n" for summary in summaries))
+
+
+def _record_backup_in_index(backup_directory: Path, summary: Dict[str, Any]) -> None:
+    """
+    Add a completed backup to the directory's index.
+    
+    Without an index yet the directory is scanned and the index written from the
+    scan (which already covers the new backup), so backups made before the index
+    existed are not left out. A concurrent list_backups scan may record the same
+    backup again; _read_backup_index keeps one entry per name.
+    """
+    if (backup_directory / BACKUP_INDEX_FILE).exists():
+        _append_backup_index(backup_directory, [summary])
+    else:
+        _append_backup_index(backup_directory, _scan_backups(backup_directory))
+
+
+def _read_backup_index(backup_directory: Path) -> Optional[List[Dict[str, Any]]]:
+    """Read the backup index (one entry per name, last wins), or None if the directory has none yet."""
+    summaries = {}
+    try:
+        with open(backup_directory / BACKUP_INDEX_FILE, "rb") as f:
+            for line in f:
+                if line.strip():
+                    summary = _loads(line)
+                    summaries[summary["name"]] = summary
+    except FileNotFoundError:
+        return None
+    return list(summaries.values())
+
+
+def _scan_backups(backup_directory: Path) -> List[Dict[str, Any]]:
+    """Build summaries of all completed backups by reading each one's metadata."""
+    summaries = []
+    
+    # Find all backup directories and archives. os.scandir's DirEntry caches
+    # the file type, and metadata.json is simply opened rather than probed first.
+    with os.scandir(backup_directory) as entries:
+        for entry in entries:
+            if not entry.name.startswith("backup_"):
+                continue
+            
+            is_archive = entry.name.endswith(".tar") and entry.is_file()
+            if not is_archive:
+                if not entry.is_dir():
+                    continue
+                
+                # manifest.json is written last, so it marks a completed backup
+                if not os.path.isfile(os.path.join(entry.path, "manifest.json")):
+                    continue
+            
+            try:
+                if is_archive:
+                    # Archives are only renamed into place once complete
+                    metadata = _read_archive_metadata(entry.path)
+                else:
+                    with open(os.path.join(entry.path, "metadata.json"), "rb") as f:
+                        metadata = _loads(f.read())
+                
+                summaries.append(_backup_summary(metadata, entry.name))
+            except Exception:
+                # Skip corrupted or incomplete backups
+                continue
+    
+    return summaries
+
+
+def _backup_timestamp_key(backup: Dict[str, Any]) -> str:
+    """Sort key for list_backups entries; metadata without a timestamp sorts oldest."""
+    return backup["timestamp"] or ""
+
+
+def list_backups(
+    backup_directory: str = "./backups",
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
     """
     List all available backups in the backup directory.
     
+    Backups are read from the directory's index.jsonl, which create_backup appends
+    to. Entries whose backup has since been deleted are skipped. Without an index
+    (backups made before it existed) every backup's metadata is scanned once and
+    the index is written from the result; delete index.jsonl to force a rescan.
+    
     Args:
         backup_directory: Directory containing backups (default: "./backups")
+        limit: Optional maximum number of backups to return (newest first).
+               Selected with heapq.nlargest, so only the top entries are ordered.
         
     Returns:
         Dictionary with list of backups and their metadata
@@ -634,38 +1506,33 @@ def list_backups(backup_directory: str = "./backups") -> Dict[str, Any]:
                 "message": "Backup directory does not exist"
             }
         
+        summaries = _read_backup_index(backup_dir)
+        if summaries is None:
+            summaries = _scan_backups(backup_dir)
+            try:
+                _append_backup_index(backup_dir, summaries)
+            except OSError:
+                # Listing still works from the scan on a read-only directory
+                pass
+        
         backups = []
+        for summary in summaries:
+            backup_path = os.path.join(backup_dir, summary.pop("name"))
+            if os.path.exists(backup_path):
+                backups.append({"backup_path": backup_path, **summary})
         
-        # Find all backup directories
-        for item in backup_dir.iterdir():
-            if item.is_dir() and item.name.startswith("backup_"):
-                manifest_file = item / "manifest.json"
-                metadata_file = item / "metadata.json"
-                
-                if manifest_file.exists() and metadata_file.exists():
-                    try:
-                        with open(metadata_file, "r", encoding="utf-8") as f:
-                            metadata = json.load(f)
-                        
-                        backups.append({
-                            "backup_id": metadata.get("backup_id", item.name),
-                            "backup_path": str(item),
-                            "collection_name": metadata.get("collection_name"),
-                            "timestamp": metadata.get("timestamp"),
-                            "document_count": metadata.get("document_count", 0),
-                            "include_embeddings": metadata.get("include_embeddings", False)
-                        })
-                    except Exception:
-                        # Skip corrupted backups
-                        continue
+        total_backups = len(backups)
         
         # Sort by timestamp (newest first)
-        backups.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+        if limit:
+            backups = heapq.nlargest(limit, backups, key=_backup_timestamp_key)
+        else:
+            backups.sort(key=_backup_timestamp_key, reverse=True)
         
         return {
             "status": "success",
             "backups": backups,
-            "total_backups": len(backups)
+            "total_backups": total_backups
         }
     
     except Exception as e:
@@ -676,31 +1543,92 @@ def list_backups(backup_directory: str = "./backups") -> Dict[str, Any]:
         }
 
 
+# Read buffer used for checksums when hashlib.file_digest is unavailable (< 3.11)
+CHECKSUM_BUFFER_SIZE = 1 << 20
+
+# Files at least this large are memory-mapped and hashed in a single update call
+MMAP_CHECKSUM_THRESHOLD = 64 << 20
+
+
 def _calculate_file_checksum(file_path: Path) -> str:
-    """Calculate SHA256 checksum of a file."""
-    sha256_hash = hashlib.sha256()
+    """
+    Calculate SHA256 checksum of a file.
+    
+    Large files are memory-mapped and hashed in one C-level update without copying
+    through read buffers; smaller ones use hashlib.file_digest (Python 3.11+). Both
+    release the GIL, so several files can be checksummed concurrently from threads.
+    """
     with open(file_path, "rb") as f:
-        for byte_block in iter(lambda: f.read(4096), b""):
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
+        if os.fstat(f.fileno()).st_size >= MMAP_CHECKSUM_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if hasattr(mapped, "madvise"):
+                    # Whole file is read once front to back: aggressive readahead
+                    mapped.madvise(mmap.MADV_SEQUENTIAL)
+                return hashlib.sha256(mapped).hexdigest()
+        
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        
+        sha256_hash = hashlib.sha256()
+        buffer = memoryview(bytearray(CHECKSUM_BUFFER_SIZE))
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            sha256_hash.update(buffer[:n])
+        return sha256_hash.hexdigest()
 
 
 def _verify_backup_integrity(backup_dir: Path, manifest: Dict) -> Dict[str, Any]:
-    """Verify backup file integrity using checksums."""
+    """
+    Verify backup file integrity using checksums.
+    
+    Missing files and size mismatches are caught from a stat before anything is
+    hashed. Files are then hashed concurrently (hashlib releases the GIL), and the
+    check stops at the first checksum mismatch - restore is aborted anyway, so
+    hashing the remaining files would be wasted work.
+    """
     errors = []
+    files = manifest.get("files", [])
     
-    for file_info in manifest.get("files", []):
+    for file_info in files:
         filename = file_info["filename"]
-        expected_checksum = file_info["checksum"]
-        file_path = backup_dir / filename
-        
-        if not file_path.exists():
+        try:
+            size = (backup_dir / filename).stat().st_size
+        except FileNotFoundError:
             errors.append(f"File not found: {filename}")
             continue
         
-        actual_checksum = _calculate_file_checksum(file_path)
-        if actual_checksum != expected_checksum:
-            errors.append(f"Checksum mismatch for {filename}: expected {expected_checksum[:16]}..., got {actual_checksum[:16]}...")
+        # Manifests from before 2.1 don't record sizes
+        expected_size = file_info.get("size")
+        if expected_size is not None and size != expected_size:
+            errors.append(f"Size mismatch for {filename}: expected {expected_size} bytes, got {size}")
+    
+    if errors:
+        return {
+            "valid": False,
+            "errors": errors
+        }
+    
+    executor = ThreadPoolExecutor(max_workers=max(1, min(len(files), os.cpu_count() or 1)))
+    try:
+        futures = {
+            executor.submit(_calculate_file_checksum, backup_dir / file_info["filename"]): file_info
+            for file_info in files
+        }
+        for future in as_completed(futures):
+            file_info = futures[future]
+            actual_checksum = future.result()
+            expected_checksum = file_info["checksum"]
+            if actual_checksum != expected_checksum:
+                errors.append(f"Checksum mismatch for {file_info['filename']}: expected {expected_checksum[:16]}..., got {actual_checksum[:16]}...")
+                break
+    finally:
+        # Drop the files not yet being hashed after an early exit
+        executor.shutdown(cancel_futures=True)
     
     return {
         "valid": len(errors) == 0,
@@ -708,14 +1636,30 @@ def _verify_backup_integrity(backup_dir: Path, manifest: Dict) -> Dict[str, Any]
     }
 
 
+def _fails_basic_quality_checks(content: str, meta: Dict[str, Any]) -> bool:
+    """
+    Cheap subset of verify_content_quality's checks on raw payload values.
+    
+    True means the document is certain to fail verify_content_quality (missing or
+    short content, missing required metadata or status), so the full check - Document
+    construction, placeholder regexes, content hashing - can be skipped when its
+    details would not be reported anyway.
+    """
+    if len(content) < MIN_CONTENT_LENGTH or "status" not in meta:
+        return True
+    return any(not meta.get(field) for field in REQUIRED_METADATA_FIELDS)
+
+
 def _verify_restored_documents(
     document_store: QdrantDocumentStore,
     collection_name: str,
-    sample_size: int = 100
+    sample_size: int = 100,
+    client: Optional[QdrantClient] = None
 ) -> Dict[str, Any]:
     """Verify a sample of restored documents."""
     try:
-        client = _get_qdrant_client()
+        if client is None:
+            client = _get_qdrant_client()
         
         # Get sample of documents
         scroll_result = client.scroll(
@@ -729,14 +1673,22 @@ def _verify_restored_documents(
         
         verified_count = 0
         failed_count = 0
+        # Only the first MAX_REPORTED_ISSUES are kept; later failures are just counted
         issues = []
         
         for point in points:
             try:
+                content = point.payload.get("content") or ""
+                meta = point.payload.get("meta") or {}
+                if len(issues) >= MAX_REPORTED_ISSUES and _fails_basic_quality_checks(content, meta):
+                    # Certain failure whose details would not be reported anyway
+                    failed_count += 1
+                    continue
+                
                 # Reconstruct document
                 doc = Document(
-                    content=point.payload.get("content", ""),
-                    meta=point.payload.get("meta", {}) or {},
+                    content=content,
+                    meta=meta,
                     id=str(point.id)
                 )
                 
@@ -747,23 +1699,26 @@ def _verify_restored_documents(
                     verified_count += 1
                 else:
                     failed_count += 1
+                    if len(issues) < MAX_REPORTED_ISSUES:
+                        issues.append({
+                            "document_id": str(point.id),
+                            "issues": quality_result.get("issues", [])
+                        })
+            except Exception as e:
+                failed_count += 1
+                if len(issues) < MAX_REPORTED_ISSUES:
                     issues.append({
                         "document_id": str(point.id),
-                        "issues": quality_result.get("issues", [])
+                        "error": str(e)
                     })
-            except Exception as e:
-                failed_count += 1
-                issues.append({
-                    "document_id": str(point.id),
-                    "error": str(e)
-                })
         
+        sample_count = len(points)
         return {
-            "sample_size": len(points),
+            "sample_size": sample_count,
             "verified_count": verified_count,
             "failed_count": failed_count,
-            "verification_rate": verified_count / len(points) if points else 0,
-            "issues": issues[:10]  # Limit to first 10 issues
+            "verification_rate": verified_count / sample_count if sample_count else 0,
+            "issues": issues
         }
     
     except Exception as e:
@@ -6,24 +6,111 @@ directly for operations not supported by Haystack's DocumentStore interface.
 """
 import json
 import os
-from typing import Dict, List, Optional, Any
+import uuid
+from contextlib import ExitStack, contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterator, List, Optional, Any, Union
 from pathlib import Path
 
+import numpy as np
+
 from haystack.dataclasses.document import Document
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
 from haystack.document_stores.types import DuplicatePolicy
 from qdrant_client import QdrantClient
-from qdrant_client.models import Filter, FieldCondition, MatchValue, MatchAny, Range, PointStruct
+from qdrant_client.models import (
+    Filter,
+    FieldCondition,
+    FilterSelector,
+    MatchValue,
+    MatchAny,
+    OptimizersConfigDiff,
+    Range,
+)
+from haystack_integrations.document_stores.qdrant.converters import (
+    convert_haystack_documents_to_qdrant_points,
+)
 
-from metadata_service import query_by_doc_id
-from deduplication_service import generate_content_fingerprint
+from deduplication_service import generate_content_fingerprints_batch
 from metadata_service import build_metadata_schema
+from index_management_service import ensure_payload_indexes
+
+# orjson is an optional speedup for exports and filter cache keys; fall back to
+# stdlib json when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_ORJSON_OPTION = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+
+# Collections whose required payload indexes were already ensured in this process
+_INDEXED_COLLECTIONS: set = set()
+
+# Maximum number of point ID ranges the delete_by_filter fallback processes at once
+MAX_DELETE_SLICES = 8
+
+# Points fetched per scroll request when streaming an export to disk
+EXPORT_SCROLL_PAGE_SIZE = 1000
+
+# Documents per import batch (one duplicate lookup, embed call and write each)
+IMPORT_BATCH_SIZE = 512
+
+# Imports of at least this many documents pause HNSW indexing on the collection
+# while loading and let the optimizer build the index once afterwards
+BULK_LOAD_MIN_DOCUMENTS = 10_000
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serialize an object to one compact JSON line (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTION | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, default=str, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _canonical_json(obj: Any) -> Union[bytes, str]:
+    """
+    Serialize an object to canonical (sorted-key) JSON for use as a cache key.
+    
+    Raises TypeError/ValueError for objects that are not plain JSON.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True)
+
+
+def _loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=4)
+def _cached_client(url: str, api_key: str, prefer_grpc: bool = False) -> QdrantClient:
+    """
+    Build a QdrantClient once per (url, api_key, prefer_grpc) and reuse it.
+    
+    Keyed on the connection settings so a changed environment gets a fresh client,
+    while repeated bulk calls share one connection pool instead of paying a new
+    connection/TLS handshake per operation.
+    """
+    return QdrantClient(url=url, api_key=api_key, prefer_grpc=prefer_grpc, timeout=60)
 
 
 def _get_qdrant_client() -> QdrantClient:
     """
     Get QdrantClient instance using environment variables.
     
+    The client is cached per connection settings (see _cached_client).
+    
+    Bulk scroll/upsert traffic uses REST by default. Setting QDRANT_PREFER_GRPC to
+    "true" switches it to gRPC (protobuf framing, packed float vectors), which needs
+    the gRPC port (6334) to be reachable.
+    
     Returns:
         QdrantClient instance
     """
@@ -35,10 +122,63 @@ def _get_qdrant_client() -> QdrantClient:
             "QDRANT_URL and QDRANT_API_KEY environment variables must be set"
         )
     
-    return QdrantClient(url=qdrant_url, api_key=qdrant_api_key)
+    prefer_grpc = os.getenv("QDRANT_PREFER_GRPC", "false").lower() in ("1", "true", "yes")
+    
+    return _cached_client(qdrant_url, qdrant_api_key, prefer_grpc)
 
 
 def _convert_haystack_filter_to_qdrant(haystack_filter: Dict) -> Optional[Filter]:
+    """
+    Convert Haystack filter format to Qdrant Filter format, memoized per filter.
+    
+    The filter is keyed by its canonical JSON form, so the same filter shape recurring
+    across calls is converted once. Filters that are not JSON-serializable are
+    converted directly. The returned Filter may be shared between callers and must
+    not be mutated.
+    
+    Args:
+        haystack_filter: Haystack filter dictionary
+        
+    Returns:
+        Qdrant Filter object or None
+    """
+    if not haystack_filter:
+        return None
+    
+    try:
+        filter_key = _canonical_json(haystack_filter)
+    except (TypeError, ValueError):
+        return _build_qdrant_filter(haystack_filter)
+    
+    return _convert_cached(filter_key)
+
+
+@lru_cache(maxsize=512)
+def _convert_cached(filter_key: Union[bytes, str]) -> Optional[Filter]:
+    """Convert a JSON-encoded Haystack filter (cache entry for _convert_haystack_filter_to_qdrant)."""
+    return _build_qdrant_filter(_loads(filter_key))
+
+
+def _as_list(value: Any) -> List:
+    """Wrap a scalar in a list; lists pass through unchanged."""
+    return value if isinstance(value, list) else [value]
+
+
+# Haystack comparison operator -> (Filter clause, FieldCondition constructor)
+_SIMPLE_OPS = {
+    "==": ("must", lambda key, value: FieldCondition(key=key, match=MatchValue(value=value))),
+    "!=": ("must_not", lambda key, value: FieldCondition(key=key, match=MatchValue(value=value))),
+    ">": ("must", lambda key, value: FieldCondition(key=key, range=Range(gt=value))),
+    ">=": ("must", lambda key, value: FieldCondition(key=key, range=Range(gte=value))),
+    "<": ("must", lambda key, value: FieldCondition(key=key, range=Range(lt=value))),
+    "<=": ("must", lambda key, value: FieldCondition(key=key, range=Range(lte=value))),
+    # Qdrant supports "in" via MatchAny
+    "in": ("must", lambda key, value: FieldCondition(key=key, match=MatchAny(any=_as_list(value)))),
+    "not in": ("must_not", lambda key, value: FieldCondition(key=key, match=MatchAny(any=_as_list(value)))),
+}
+
+
+def _build_qdrant_filter(haystack_filter: Dict) -> Optional[Filter]:
     """
     Convert Haystack filter format to Qdrant Filter format.
     
@@ -49,6 +189,8 @@ def _convert_haystack_filter_to_qdrant(haystack_filter: Dict) -> Optional[Filter
     as "meta.category" in Qdrant, not just "category". However, Haystack's filter_documents
     already handles this, so when using QdrantClient directly, we need to use the full path.
     
+    Comparison operators are dispatched through _SIMPLE_OPS.
+    
     Args:
         haystack_filter: Haystack filter dictionary
         
@@ -60,142 +202,46 @@ def _convert_haystack_filter_to_qdrant(haystack_filter: Dict) -> Optional[Filter
     
     # Handle simple comparison filter
     if "field" in haystack_filter:
-        field = haystack_filter["field"]
-        operator = haystack_filter.get("operator", "==")
-        value = haystack_filter.get("value")
-        
-        # Haystack stores metadata nested in payload["meta"], so when using QdrantClient
-        # directly (not through Haystack's filter_documents), we need to use the full
-        # nested path like "meta.category" not just "category".
-        # 
-        # However, when using QdrantClient.scroll() or .delete() with filters, Qdrant
-        # requires payload indexes to be created on the fields first. Without indexes,
-        # filtering operations will fail with "Index required but not found" error.
-        #
-        # IMPORTANT: Keep the "meta." prefix - don't remove it! Haystack stores metadata
-        # nested under "meta" in the Qdrant payload structure.
-        if field.startswith("meta."):
-            # Keep the full nested path for Qdrant payload structure
-            key = field  # e.g., "meta.category", "meta.status"
-        else:
-            # Direct payload field (e.g., "content", "id") - rare, usually Haystack uses "meta."
-            key = field
-        
-        # Convert operator to Qdrant format
-        if operator == "==":
-            return Filter(
-                must=[
-                    FieldCondition(
-                        key=key,
-                        match=MatchValue(value=value)
-                    )
-                ]
-            )
-        elif operator == "!=":
-            return Filter(
-                must_not=[
-                    FieldCondition(
-                        key=key,
-                        match=MatchValue(value=value)
-                    )
-                ]
-            )
-        elif operator == ">":
-            return Filter(
-                must=[
-                    FieldCondition(
-                        key=key,
-                        range=Range(gt=value)
-                    )
-                ]
-            )
-        elif operator == ">=":
-            return Filter(
-                must=[
-                    FieldCondition(
-                        key=key,
-                        range=Range(gte=value)
-                    )
-                ]
-            )
-        elif operator == "<":
-            return Filter(
-                must=[
-                    FieldCondition(
-                        key=key,
-                        range=Range(lt=value)
-                    )
-                ]
-            )
-        elif operator == "<=":
-            return Filter(
-                must=[
-                    FieldCondition(
-                        key=key,
-                        range=Range(lte=value)
-                    )
-                ]
-            )
-        elif operator == "in":
-            # Qdrant supports "in" via MatchAny
-            if not isinstance(value, list):
-                value = [value]
-            return Filter(
-                must=[
-                    FieldCondition(
-                        key=key,
-                        match=MatchAny(any=value)
-                    )
-                ]
-            )
-        elif operator == "not in":
-            if not isinstance(value, list):
-                value = [value]
-            return Filter(
-                must_not=[
-                    FieldCondition(
-                        key=key,
-                        match=MatchAny(any=value)
-                    )
-                ]
-            )
+        entry = _SIMPLE_OPS.get(haystack_filter.get("operator", "=="))
+        if entry is not None:
+            # Haystack stores metadata nested in payload["meta"], so when using QdrantClient
+            # directly (not through Haystack's filter_documents), we need to use the full
+            # nested path like "meta.category" not just "category".
+            #
+            # However, when using QdrantClient.scroll() or .delete() with filters, Qdrant
+            # requires payload indexes to be created on the fields first. Without indexes,
+            # filtering operations will fail with "Index required but not found" error.
+            #
+            # IMPORTANT: Keep the "meta." prefix - don't remove it! Haystack stores metadata
+            # nested under "meta" in the Qdrant payload structure. Direct payload fields
+            # (e.g., "content", "id") are passed through unchanged as well.
+            clause, make_condition = entry
+            condition = make_condition(haystack_filter["field"], haystack_filter.get("value"))
+            return Filter(**{clause: [condition]})
     
     # Handle logic filter (AND, OR, NOT)
     if "operator" in haystack_filter and "conditions" in haystack_filter:
         operator = haystack_filter["operator"]
-        conditions = haystack_filter["conditions"]
         
         # Convert each condition recursively
-        qdrant_conditions = []
-        for condition in conditions:
-            qdrant_condition = _convert_haystack_filter_to_qdrant(condition)
-            if qdrant_condition:
-                qdrant_conditions.append(qdrant_condition)
+        qdrant_conditions = [
+            qdrant_condition
+            for qdrant_condition in map(_build_qdrant_filter, haystack_filter["conditions"])
+            if qdrant_condition
+        ]
         
         if not qdrant_conditions:
             return None
         
         if operator == "AND":
-            # Combine all conditions into must array
-            must_conditions = []
-            must_not_conditions = []
-            should_conditions = []
-            
-            for cond in qdrant_conditions:
-                if hasattr(cond, 'must') and cond.must:
-                    must_conditions.extend(cond.must)
-                if hasattr(cond, 'must_not') and cond.must_not:
-                    must_not_conditions.extend(cond.must_not)
-                if hasattr(cond, 'should') and cond.should:
-                    should_conditions.extend(cond.should)
-            
+            # Splice every sub-filter's clauses into one flat filter
             filter_dict = {}
-            if must_conditions:
-                filter_dict['must'] = must_conditions
-            if must_not_conditions:
-                filter_dict['must_not'] = must_not_conditions
-            if should_conditions:
-                filter_dict['should'] = should_conditions
+            for clause in ("must", "must_not", "should"):
+                merged = list(chain.from_iterable(
+                    getattr(cond, clause) or () for cond in qdrant_conditions
+                ))
+                if merged:
+                    filter_dict[clause] = merged
             
             return Filter(**filter_dict) if filter_dict else None
         
@@ -211,9 +257,9 @@ def _convert_haystack_filter_to_qdrant(haystack_filter: Dict) -> Optional[Filter
             if len(qdrant_conditions) == 1:
                 # Single condition - extract its must/must_not/should
                 not_cond = qdrant_conditions[0]
-                if hasattr(not_cond, 'must') and not_cond.must:
+                if not_cond.must:
                     return Filter(must_not=not_cond.must)
-                elif hasattr(not_cond, 'must_not') and not_cond.must_not:
+                elif not_cond.must_not:
                     # Double negation - convert must_not to must
                     return Filter(must=not_cond.must_not)
             # Multiple conditions in NOT - wrap all in must_not
@@ -222,22 +268,251 @@ def _convert_haystack_filter_to_qdrant(haystack_filter: Dict) -> Optional[Filter
     return None
 
 
+def _ensure_payload_indexes(
+    collection_name: str,
+    client: Optional[QdrantClient] = None
+) -> None:
+    """
+    Make sure the required meta.* payload indexes exist before filtering a collection.
+    
+    Filtered scroll/delete/set_payload calls on unindexed fields make Qdrant fall back
+    to a full scan. The server creates indexes for its own collections at startup; this
+    covers any other collection a bulk operation is pointed at. Runs at most once per
+    collection per process and never raises - a failure just leaves filtering unindexed.
+    
+    Args:
+        collection_name: Name of the Qdrant collection
+        client: Optional QdrantClient instance. If None, uses the shared client.
+    """
+    if collection_name in _INDEXED_COLLECTIONS:
+        return
+    
+    try:
+        if client is None:
+            client = _get_qdrant_client()
+        result = ensure_payload_indexes(collection_name, client)
+    except Exception:
+        return
+    
+    if result.get("status") == "success":
+        _INDEXED_COLLECTIONS.add(collection_name)
+
+
+def _filter_keys(qdrant_filter: Optional[Filter]) -> set:
+    """
+    Collect every payload key referenced by a Qdrant filter, including nested filters.
+    
+    Args:
+        qdrant_filter: Qdrant Filter object (or None)
+        
+    Returns:
+        Set of payload keys (e.g., {"meta.category", "meta.status"})
+    """
+    keys = set()
+    if qdrant_filter is None:
+        return keys
+    
+    for clause in (qdrant_filter.must, qdrant_filter.must_not, qdrant_filter.should):
+        if not clause:
+            continue
+        if not isinstance(clause, list):
+            clause = [clause]
+        for condition in clause:
+            if isinstance(condition, Filter):
+                keys |= _filter_keys(condition)
+            elif getattr(condition, "key", None):
+                keys.add(condition.key)
+    
+    return keys
+
+
+def _filter_is_indexed(
+    client: QdrantClient,
+    collection_name: str,
+    qdrant_filter: Optional[Filter]
+) -> bool:
+    """
+    Check whether every field used by a filter has a payload index on the collection.
+    
+    Server-side filtered deletes on unindexed fields force a full scan inside Qdrant,
+    so callers use this to decide between a native delete and the paged fallback.
+    If the collection schema cannot be read, the filter is treated as unindexed.
+    
+    Args:
+        client: QdrantClient instance
+        collection_name: Name of the Qdrant collection
+        qdrant_filter: Qdrant Filter object (or None)
+        
+    Returns:
+        True if all filtered fields are indexed, False otherwise
+    """
+    keys = _filter_keys(qdrant_filter)
+    if not keys:
+        return True
+    
+    try:
+        payload_schema = client.get_collection(collection_name).payload_schema or {}
+    except Exception:
+        return False
+    
+    return all(key in payload_schema for key in keys)
+
+
+def _point_id_sort_key(point_id) -> tuple:
+    """
+    Sort key matching Qdrant's point ID order: numeric IDs first, then UUIDs by value.
+    """
+    if isinstance(point_id, int):
+        return (0, point_id)
+    return (1, uuid.UUID(str(point_id)).int)
+
+
+def _uuid_slice_bounds(parallel_slices: int) -> List[tuple]:
+    """
+    Split the point ID space into ``parallel_slices`` contiguous ranges.
+    
+    Haystack stores documents under UUID point IDs, so the 128-bit UUID space is cut
+    into equal ranges. Returns ``(offset, stop_before)`` pairs for ``_delete_by_scroll``
+    and backup's ``_scroll_pages``; the first slice starts at the beginning and
+    therefore also covers numeric IDs.
+    """
+    starts = [i * (1 << 128) // parallel_slices for i in range(parallel_slices)]
+    bounds = []
+    for i, start in enumerate(starts):
+        offset = str(uuid.UUID(int=start)) if i > 0 else None
+        stop_before = (1, starts[i + 1]) if i + 1 < parallel_slices else None
+        bounds.append((offset, stop_before))
+    return bounds
+
+
+def _delete_by_scroll(
+    client: QdrantClient,
+    collection_name: str,
+    qdrant_filter: Optional[Filter],
+    batch_size: int = 100,
+    offset=None,
+    stop_before: Optional[tuple] = None
+) -> int:
+    """
+    Delete matching points by scrolling their IDs and deleting them page by page.
+    
+    Fallback for filters on fields without a payload index. ``offset`` and
+    ``stop_before`` (a ``_point_id_sort_key``) restrict it to a half-open range of
+    point IDs so several ranges can be processed concurrently.
+    
+    Returns:
+        Number of points deleted
+    """
+    deleted_count = 0
+    # IDs of the last page deleted without waiting, if no waited delete followed it
+    unwaited_ids = None
+    
+    while True:
+        points, next_offset = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=qdrant_filter,
+            limit=batch_size,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False
+        )
+        
+        if stop_before is not None and points and _point_id_sort_key(points[-1].id) >= stop_before:
+            # Reached the next range - keep only the points in ours
+            points = [point for point in points if _point_id_sort_key(point.id) < stop_before]
+            next_offset = None
+        
+        if points:
+            # Pages are deleted as they are scrolled; only the last delete waits,
+            # and since updates apply in order that confirms the earlier ones too
+            point_ids = [point.id for point in points]
+            client.delete(
+                collection_name=collection_name,
+                points_selector=point_ids,
+                wait=next_offset is None
+            )
+            unwaited_ids = point_ids if next_offset is not None else None
+            deleted_count += len(points)
+        
+        if not points or next_offset is None:
+            break
+        
+        offset = next_offset
+    
+    if unwaited_ids:
+        # The scroll ended on an empty page, so no delete waited: repeat the last
+        # (idempotent) delete with wait=True as a barrier for all earlier ones
+        client.delete(
+            collection_name=collection_name,
+            points_selector=unwaited_ids,
+            wait=True
+        )
+    
+    return deleted_count
+
+
+def _delete_by_scroll_parallel(
+    client: QdrantClient,
+    collection_name: str,
+    qdrant_filter: Optional[Filter]
+) -> int:
+    """
+    Run the scroll-and-delete fallback over one point ID range per shard concurrently.
+    
+    Each scroll page depends on the previous page's offset, so a single loop is
+    strictly sequential. On a multi-shard collection the ID space is cut into
+    shard_number ranges (capped at MAX_DELETE_SLICES) that are scrolled and deleted
+    in parallel. Single-shard collections use the serial loop.
+    
+    Returns:
+        Number of points deleted
+    """
+    try:
+        shard_number = int(client.get_collection(collection_name).config.params.shard_number or 1)
+    except Exception:
+        shard_number = 1
+    
+    slices = min(shard_number, MAX_DELETE_SLICES)
+    if slices <= 1:
+        return _delete_by_scroll(client, collection_name, qdrant_filter)
+    
+    with ThreadPoolExecutor(max_workers=slices) as executor:
+        futures = [
+            executor.submit(
+                _delete_by_scroll, client, collection_name, qdrant_filter,
+                offset=offset, stop_before=stop_before
+            )
+            for offset, stop_before in _uuid_slice_bounds(slices)
+        ]
+        return sum(future.result() for future in futures)
+
+
 def delete_by_filter(
     document_store: QdrantDocumentStore,
     filters: Dict[str, Any],
-    collection_name: Optional[str] = None
+    collection_name: Optional[str] = None,
+    server_side: bool = True,
+    delete_all: bool = False
 ) -> Dict[str, Any]:
     """
-    Delete documents matching metadata filters using QdrantClient.scroll() + delete() pattern.
+    Delete documents matching metadata filters with a single server-side delete.
     
     Process:
-    1. Use scroll() with filter to get all matching point IDs
-    2. Delete points by IDs
+    1. Count matching points (reported as deleted_count)
+    2. Delete them with one FilterSelector request, so no IDs round-trip through Python
+    
+    If a filtered field has no payload index (or server_side is False), falls back to
+    scrolling matching IDs page by page and deleting each page.
+    
+    A missing filter, or one that converts to no conditions, is rejected before any
+    request is made; emptying the whole collection requires delete_all=True.
     
     Args:
         document_store: QdrantDocumentStore instance
         filters: Haystack filter dictionary (e.g., {"field": "meta.category", "operator": "==", "value": "user_rule"})
         collection_name: Optional collection name (defaults to document_store's collection)
+        server_side: Use Qdrant's native delete-by-filter when the filter is indexed
+        delete_all: Allow deleting every document when filters is empty
         
     Returns:
         Dictionary with deletion results:
@@ -246,54 +521,41 @@ def delete_by_filter(
         - error: Error message if failed
     """
     try:
+        # Convert Haystack filter to Qdrant filter
+        qdrant_filter = _convert_haystack_filter_to_qdrant(filters)
+        
+        if qdrant_filter is None and (filters or not delete_all):
+            return {
+                "status": "error",
+                "deleted_count": 0,
+                "error": (
+                    "Unparseable filter" if filters
+                    else "No filter provided; pass delete_all=True to delete every document"
+                )
+            }
+        
         client = _get_qdrant_client()
         
         # Get collection name
         if not collection_name:
             collection_name = document_store.index
         
-        # Convert Haystack filter to Qdrant filter
-        qdrant_filter = _convert_haystack_filter_to_qdrant(filters)
-        
-        # Scroll through all matching points and collect IDs
-        offset = None
-        all_point_ids = []
-        batch_size = 100
+        _ensure_payload_indexes(collection_name, client)
         
-        while True:
-            scroll_result = client.scroll(
+        if server_side and _filter_is_indexed(client, collection_name, qdrant_filter):
+            deleted_count = client.count(
                 collection_name=collection_name,
-                scroll_filter=qdrant_filter,
-                limit=batch_size,
-                offset=offset,
-                with_payload=False,
-                with_vectors=False
-            )
-            
-            points, next_offset = scroll_result
+                count_filter=qdrant_filter,
+                exact=True
+            ).count
             
-            if not points:
-                break
-            
-            all_point_ids.extend([point.id for point in points])
-            
-            if next_offset is None:
-                break
-            
-            offset = next_offset
-        
-        # Delete all collected point IDs
-        deleted_count = 0
-        if all_point_ids:
-            # Delete in batches to avoid overwhelming the server
-            batch_size = 100
-            for i in range(0, len(all_point_ids), batch_size):
-                batch_ids = all_point_ids[i:i + batch_size]
+            if deleted_count:
                 client.delete(
                     collection_name=collection_name,
-                    points_selector=batch_ids
+                    points_selector=FilterSelector(filter=qdrant_filter or Filter())
                 )
-                deleted_count += len(batch_ids)
+        else:
+            deleted_count = _delete_by_scroll_parallel(client, collection_name, qdrant_filter)
         
         return {
             "status": "success",
@@ -361,7 +623,8 @@ def update_metadata_by_filter(
     """
     Update metadata for multiple documents matching a filter using QdrantClient.set_payload().
     
-    Uses set_payload() with Filter parameter for efficient bulk updates.
+    Uses a single set_payload() call with a FilterSelector, merging the updates into
+    each matching point's payload["meta"] server-side (no scroll, no vector transfer).
     
     Args:
         document_store: QdrantDocumentStore instance
@@ -371,16 +634,10 @@ def update_metadata_by_filter(
         
     Returns:
         Dictionary with update results:
-        - updated_count: Number of documents updated (estimated)
+        - updated_count: Number of documents matched by the filter
         - status: "success" or "error"
     """
     try:
-        client = _get_qdrant_client()
-        
-        # Get collection name
-        if not collection_name:
-            collection_name = document_store.index
-        
         # Convert Haystack filter to Qdrant filter
         qdrant_filter = _convert_haystack_filter_to_qdrant(filters)
         
@@ -388,90 +645,34 @@ def update_metadata_by_filter(
             return {
                 "status": "error",
                 "updated_count": 0,
-                "error": "Invalid filter provided"
+                "error": "Unparseable filter" if filters else "Invalid filter provided"
             }
         
-        # Use set_payload to update metadata for all matching points
-        # Haystack stores metadata in payload["meta"] as a nested dictionary
-        # We need to update each field in the meta dictionary
+        client = _get_qdrant_client()
         
-        # For each metadata field, we need to update payload["meta"][key]
-        # Qdrant's set_payload supports nested updates, but we need to structure it correctly
-        # Since set_payload merges with existing payload, we can update meta fields directly
+        # Get collection name
+        if not collection_name:
+            collection_name = document_store.index
         
-        # Use scroll to get points, update payload, then upsert
-        # This ensures we preserve the existing payload structure
-        # Note: We scroll once, update, and count during the update process
-        offset = None
-        updated_count = 0
-        batch_size = 100
+        _ensure_payload_indexes(collection_name, client)
         
-        while True:
-            scroll_result = client.scroll(
+        updated_count = client.count(
+            collection_name=collection_name,
+            count_filter=qdrant_filter,
+            exact=True
+        ).count
+        
+        # Haystack stores metadata in payload["meta"]; set_payload with key="meta"
+        # merges the updates into that nested dict server-side, so neither the
+        # existing payload nor the vectors have to travel over the wire.
+        if updated_count:
+            client.set_payload(
                 collection_name=collection_name,
-                scroll_filter=qdrant_filter,
-                limit=batch_size,
-                offset=offset,
-                with_payload=True,
-                with_vectors=True
+                payload=metadata_updates,
+                points=FilterSelector(filter=qdrant_filter),
+                key="meta",
+                wait=True
             )
-            
-            points, next_offset = scroll_result
-            
-            if not points:
-                break
-            
-            # Update each point's payload
-            points_to_upsert = []
-            for point in points:
-                # Get existing payload
-                payload = dict(point.payload or {})
-                
-                # Handle both nested and flattened metadata structures
-                # Haystack may store metadata nested under "meta" or flattened at top level
-                if "meta" in payload and isinstance(payload["meta"], dict):
-                    # Nested structure: payload["meta"] = {...}
-                    meta = dict(payload["meta"])
-                    meta.update(metadata_updates)
-                    payload["meta"] = meta
-                else:
-                    # Flattened structure: metadata fields at top level
-                    # Update metadata fields directly in payload
-                    for key, value in metadata_updates.items():
-                        payload[key] = value
-                
-                # Create PointStruct for upsert
-                # Get vector from point - Qdrant returns vectors in different formats
-                vector = None
-                if hasattr(point, 'vector'):
-                    if point.vector is not None:
-                        # Handle both named vector and default vector
-                        if isinstance(point.vector, dict):
-                            # Named vectors: {"default": [0.1, 0.2, ...]}
-                            vector = point.vector.get("default") or list(point.vector.values())[0] if point.vector else None
-                        elif isinstance(point.vector, list):
-                            vector = point.vector
-                
-                points_to_upsert.append(
-                    PointStruct(
-                        id=point.id,
-                        vector=vector,
-                        payload=payload
-                    )
-                )
-            
-            # Upsert updated points
-            if points_to_upsert:
-                client.upsert(
-                    collection_name=collection_name,
-                    points=points_to_upsert
-                )
-                updated_count += len(points_to_upsert)
-            
-            if next_offset is None:
-                break
-            
-            offset = next_offset
         
         return {
             "status": "success",
@@ -488,43 +689,225 @@ def update_metadata_by_filter(
         }
 
 
+def _iter_export_pages(
+    client: QdrantClient,
+    collection_name: str,
+    qdrant_filter: Optional[Filter],
+    include_embeddings: bool
+):
+    """
+    Yield pages of (document dict, vector) pairs for matching points.
+    
+    Vectors are only requested from Qdrant when include_embeddings is set (the
+    vector is None otherwise), so exports without embeddings transfer payloads only.
+    """
+    offset = None
+    
+    while True:
+        points, next_offset = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=qdrant_filter,
+            limit=EXPORT_SCROLL_PAGE_SIZE,
+            offset=offset,
+            with_payload=True,
+            with_vectors=include_embeddings
+        )
+        
+        page = []
+        for point in points:
+            payload = point.payload or {}
+            doc_dict = {
+                "id": payload.get("id", str(point.id)),
+                "content": payload.get("content"),
+                "meta": payload.get("meta") or {}
+            }
+            
+            vector = point.vector if include_embeddings else None
+            if isinstance(vector, dict):
+                vector = vector.get("default") or next(iter(vector.values()), None)
+            page.append((doc_dict, vector))
+        
+        if page:
+            yield page
+        
+        if not points or next_offset is None:
+            break
+        
+        offset = next_offset
+
+
+def _export_to_file(
+    client: QdrantClient,
+    collection_name: str,
+    qdrant_filter: Optional[Filter],
+    include_embeddings: bool,
+    output_path: Path
+) -> Dict[str, Any]:
+    """
+    Stream matching points to a JSONL file, one document per line.
+    
+    Points are scrolled page by page and written as they arrive, so memory use is
+    bounded by one page regardless of collection size. Embeddings, if requested,
+    go to a raw little-endian float32 sidecar (<stem>.embeddings.bin) instead of
+    JSON text; each document line references its row via "embedding_row", and
+    the sidecar's dtype/dim/rows are written to <stem>.embeddings.json.
+    
+    Returns:
+        Dictionary with export results
+    """
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    embeddings_path = output_path.with_suffix(".embeddings.bin") if include_embeddings else None
+    
+    exported_count = 0
+    embedding_rows = 0
+    embedding_dim = None
+    
+    with ExitStack() as stack:
+        out = stack.enter_context(open(output_path, "wb"))
+        emb_out = stack.enter_context(open(embeddings_path, "wb")) if embeddings_path else None
+        
+        for page in _iter_export_pages(client, collection_name, qdrant_filter, include_embeddings):
+            lines = []
+            vectors = []
+            for doc_dict, vector in page:
+                if vector:
+                    doc_dict["embedding_row"] = embedding_rows + len(vectors)
+                    vectors.append(vector)
+                lines.append(_dumps_line(doc_dict))
+            
+            out.write(b"".join(lines))
+            exported_count += len(page)
+            
+            if vectors:
+                matrix = np.asarray(vectors, dtype="<f4")
+                embedding_dim = matrix.shape[1]
+                emb_out.write(matrix.tobytes())
+                embedding_rows += len(vectors)
+    
+    result = {
+        "status": "success",
+        "exported_count": exported_count,
+        "output_path": str(output_path)
+    }
+    if embeddings_path:
+        embeddings_info = {"dtype": "float32", "dim": embedding_dim, "rows": embedding_rows}
+        # The sidecar is headerless; its shape is recorded next to it for read_exported_documents
+        _embeddings_info_path(output_path).write_bytes(_dumps_line(embeddings_info))
+        result["embeddings_path"] = str(embeddings_path)
+        result["embeddings"] = embeddings_info
+    
+    return result
+
+
+def _embeddings_info_path(output_path: Path) -> Path:
+    """Path of the JSON file describing an export's embeddings sidecar."""
+    return output_path.with_suffix(".embeddings.json")
+
+
+def read_exported_documents(input_path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Read documents written by export_documents(output_path=...).
+    
+    Lines are parsed one at a time. If the export has an embeddings sidecar, it is
+    memory-mapped and each document's row is attached as "embedding", so the
+    result can be passed to import_documents without re-embedding.
+    
+    Args:
+        input_path: JSONL file produced by export_documents
+        
+    Yields:
+        Document dictionaries with id, content, meta and, if exported, embedding
+    """
+    input_path = Path(input_path)
+    embeddings = None
+    
+    info_path = _embeddings_info_path(input_path)
+    if info_path.exists():
+        info = _loads(info_path.read_bytes())
+        if info.get("rows"):
+            embeddings = np.memmap(
+                input_path.with_suffix(".embeddings.bin"),
+                dtype="<f4",
+                mode="r",
+                shape=(info["rows"], info["dim"])
+            )
+    
+    with open(input_path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            doc_data = _loads(line)
+            row = doc_data.pop("embedding_row", None)
+            if row is not None and embeddings is not None:
+                doc_data["embedding"] = embeddings[row].tolist()
+            yield doc_data
+
+
 def export_documents(
     document_store: QdrantDocumentStore,
     filters: Optional[Dict[str, Any]] = None,
     include_embeddings: bool = False,
-    collection_name: Optional[str] = None
-) -> List[Dict[str, Any]]:
+    collection_name: Optional[str] = None,
+    output_path: Optional[Union[str, Path]] = None
+) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Export documents with metadata to JSON-serializable format.
     
-    Uses filter_documents() to retrieve documents, then serializes them.
+    Documents are read with paginated QdrantClient.scroll() calls that only fetch
+    vectors when include_embeddings is set. Without output_path they are returned
+    as a list. With output_path they are streamed to a JSONL file instead, so the
+    corpus is never held in memory; see _export_to_file for the file layout.
     
     Args:
         document_store: QdrantDocumentStore instance
         filters: Optional Haystack filter dictionary
         include_embeddings: Whether to include embeddings in export
-        collection_name: Optional collection name (not used, kept for API consistency)
+        collection_name: Optional collection name, used to ensure payload indexes
+                         (defaults to document_store's collection)
+        output_path: Optional JSONL file to stream the export to
         
     Returns:
-        List of dictionaries representing documents
+        List of dictionaries representing documents, or, when output_path is given,
+        a dictionary with status, exported_count and output_path (plus
+        embeddings_path/embeddings when include_embeddings is set)
     """
+    if output_path is not None:
+        try:
+            client = _get_qdrant_client()
+            collection_name = collection_name or document_store.index
+            _ensure_payload_indexes(collection_name, client)
+            
+            return _export_to_file(
+                client,
+                collection_name,
+                _convert_haystack_filter_to_qdrant(filters),
+                include_embeddings,
+                Path(output_path)
+            )
+        except Exception as e:
+            return {
+                "status": "error",
+                "exported_count": 0,
+                "error": str(e),
+                "error_type": type(e).__name__
+            }
+    
     try:
-        # Use Haystack's filter_documents
-        documents = document_store.filter_documents(filters=filters)
+        client = _get_qdrant_client()
+        collection_name = collection_name or document_store.index
+        if filters:
+            _ensure_payload_indexes(collection_name, client)
         
         # Serialize documents
         exported = []
-        for doc in documents:
-            doc_dict = {
-                "id": doc.id,
-                "content": doc.content,
-                "meta": doc.meta or {}
-            }
-            
-            if include_embeddings and doc.embedding:
-                doc_dict["embedding"] = doc.embedding
-            
-            exported.append(doc_dict)
+        pages = _iter_export_pages(
+            client, collection_name, _convert_haystack_filter_to_qdrant(filters), include_embeddings
+        )
+        for page in pages:
+            for doc_dict, vector in page:
+                if vector:
+                    doc_dict["embedding"] = vector
+                exported.append(doc_dict)
         
         return exported
     
@@ -532,24 +915,216 @@ def export_documents(
         raise Exception(f"Failed to export documents: {str(e)}")
 
 
+def _scroll_meta(
+    client: QdrantClient,
+    collection_name: str,
+    scroll_filter: Filter,
+    fields: List[str],
+    page_size: int = 100
+):
+    """
+    Yield the "meta" payload of every point matching a filter, fetching only the given fields.
+    
+    Pages until the scroll is exhausted, since a key may span several points
+    (versions, chunks).
+    """
+    offset = None
+    
+    while True:
+        points, next_offset = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=scroll_filter,
+            limit=page_size,
+            offset=offset,
+            with_payload=fields,
+            with_vectors=False
+        )
+        
+        for point in points:
+            yield (point.payload or {}).get("meta") or {}
+        
+        if not points or next_offset is None:
+            break
+        
+        offset = next_offset
+
+
+def _existing_doc_keys(
+    client: QdrantClient,
+    collection_name: str,
+    doc_ids: List[str]
+) -> set:
+    """
+    Look up which doc_ids already exist in a collection with one filtered scroll.
+    
+    Replaces a query_by_doc_id() round trip per document with a MatchAny filter over
+    the whole batch, fetching only the two payload fields needed for the check.
+    
+    Args:
+        client: QdrantClient instance
+        collection_name: Name of the Qdrant collection
+        doc_ids: doc_ids to look up
+        
+    Returns:
+        Set of (doc_id, category) tuples present in the collection
+    """
+    if not doc_ids:
+        return set()
+    
+    scroll_filter = Filter(
+        must=[FieldCondition(key="meta.doc_id", match=MatchAny(any=list(doc_ids)))]
+    )
+    return {
+        (meta.get("doc_id"), meta.get("category"))
+        for meta in _scroll_meta(
+            client, collection_name, scroll_filter, ["meta.doc_id", "meta.category"],
+            page_size=max(len(doc_ids), 100)
+        )
+    }
+
+
+def _existing_content_keys(
+    client: QdrantClient,
+    collection_name: str,
+    content_hashes: List[str]
+) -> set:
+    """
+    Look up which (doc_id, content hash) pairs are already stored with one filtered scroll.
+    
+    Documents carry their hash as meta.hash_content (and meta.content_hash for
+    backward compatibility); both fields are indexed and both are checked. Chunk
+    points are excluded, since a chunk's text repeating a document is not a
+    stored copy of that document.
+    
+    Args:
+        client: QdrantClient instance
+        collection_name: Name of the Qdrant collection
+        content_hashes: Content hashes to look up
+        
+    Returns:
+        Set of (doc_id, content_hash) pairs present in the collection
+    """
+    if not content_hashes:
+        return set()
+    
+    match = MatchAny(any=list(content_hashes))
+    scroll_filter = Filter(
+        should=[
+            FieldCondition(key="meta.hash_content", match=match),
+            FieldCondition(key="meta.content_hash", match=match),
+        ],
+        must_not=[FieldCondition(key="meta.is_chunk", match=MatchValue(value=True))]
+    )
+    existing = set()
+    for meta in _scroll_meta(
+        client, collection_name, scroll_filter,
+        ["meta.doc_id", "meta.hash_content", "meta.content_hash"],
+        page_size=max(len(content_hashes), 100)
+    ):
+        doc_id = meta.get("doc_id")
+        for content_hash in (meta.get("hash_content"), meta.get("content_hash")):
+            if doc_id and content_hash:
+                existing.add((doc_id, content_hash))
+    
+    return existing
+
+
+def _ensure_collection(document_store: QdrantDocumentStore, client: QdrantClient) -> None:
+    """
+    Create the store's collection before it is read or written through the raw client.
+    
+    QdrantDocumentStore creates its collection lazily on first use, but scrolls and
+    upserts sent directly through ``client`` bypass the store, so against a collection
+    that does not exist yet they fail. A missing collection is set up with the store's
+    own configuration (embedding dimension, similarity, sparse vectors, payload indexes).
+    
+    Args:
+        document_store: QdrantDocumentStore whose collection (document_store.index) is used
+        client: QdrantClient the caller reads and writes the collection with
+    """
+    if client.collection_exists(document_store.index):
+        return
+    
+    document_store._set_up_collection(
+        document_store.index,
+        document_store.embedding_dim,
+        False,
+        document_store.similarity,
+        document_store.use_sparse_embeddings,
+        document_store.sparse_idf,
+        document_store.on_disk,
+        document_store.payload_fields_to_index
+    )
+
+
+@contextmanager
+def _paused_indexing(client: QdrantClient, collection_name: str):
+    """
+    Disable HNSW index building on a collection for the duration of a bulk load.
+    
+    Sets indexing_threshold to 0 and restores the previous value on exit, so the
+    optimizer indexes the loaded points once instead of continuously while they
+    arrive. If the collection config cannot be read or changed, loads normally.
+    Indexing is left alone when the threshold is unset (None: an empty diff could
+    not restore it) or already 0 (e.g. another bulk load is running and will
+    restore it).
+    """
+    try:
+        previous = client.get_collection(collection_name).config.optimizer_config.indexing_threshold
+        if previous:
+            client.update_collection(
+                collection_name=collection_name,
+                optimizers_config=OptimizersConfigDiff(indexing_threshold=0)
+            )
+    except Exception:
+        previous = None
+    
+    if not previous:
+        yield
+        return
+    
+    try:
+        yield
+    finally:
+        try:
+            client.update_collection(
+                collection_name=collection_name,
+                optimizers_config=OptimizersConfigDiff(indexing_threshold=previous)
+            )
+        except Exception:
+            pass
+
+
 def import_documents(
     document_store: QdrantDocumentStore,
     documents_data: List[Dict[str, Any]],
     duplicate_strategy: str = "skip",
-    batch_size: int = 100,
+    batch_size: int = IMPORT_BATCH_SIZE,
     embedder=None
 ) -> Dict[str, Any]:
     """
     Import documents with duplicate handling strategy.
     
     Strategies:
-    - "skip": Skip documents that already exist (by doc_id)
+    - "skip": Skip documents that already exist (by doc_id), whose doc_id already
+      stores the same content (by content hash), or that repeat a document earlier
+      in this import (same content and metadata), before they are embedded
     - "update": Update existing documents
     - "error": Raise error if duplicates found
     
+    Embedded batches for "skip"/"update" are upserted directly with wait=False,
+    one batch behind, and only the final upsert waits for the server, so the
+    write-ahead log is not synced per batch but all points are applied when this
+    returns. Those upserts run on a background thread, overlapping with embedding
+    of the next batch. Large imports (BULK_LOAD_MIN_DOCUMENTS) also pause HNSW
+    indexing while loading. Other batches go through document_store.write_documents().
+    The store's collection is created first if it does not exist yet.
+    
     Args:
         document_store: QdrantDocumentStore instance
         documents_data: List of document dictionaries with content, meta, etc.
+                        Documents that include an "embedding" (e.g. from
+                        read_exported_documents) are not re-embedded.
         duplicate_strategy: How to handle duplicates ("skip", "update", "error")
         batch_size: Number of documents to process per batch
         embedder: Optional embedder for generating embeddings (required for new documents)
@@ -566,71 +1141,150 @@ def import_documents(
     updated_count = 0
     errors = []
     
+    # Upsert held back one batch so only the last write waits for the server
+    pending_points = None
+    # Fingerprint composite keys (content + metadata) accepted so far in this import ("skip" strategy)
+    seen_keys = set()
+    # Upsert currently running on the writer thread
+    upsert_future = None
+    
     try:
-        for i in range(0, len(documents_data), batch_size):
-            batch = documents_data[i:i + batch_size]
-            batch_documents = []
+        client = _get_qdrant_client()
+        collection_name = document_store.index
+        direct_upsert = duplicate_strategy in ("skip", "update")
+        # Duplicate lookups and direct upserts below go through the raw client
+        _ensure_collection(document_store, client)
+        
+        def _upsert(points: List, wait: bool) -> int:
+            client.upsert(collection_name=collection_name, points=points, wait=wait)
+            return len(points)
+        
+        with ExitStack() as stack:
+            # A single writer thread keeps upserts in order while the caller embeds
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=1))
+            if direct_upsert and len(documents_data) >= BULK_LOAD_MIN_DOCUMENTS:
+                stack.enter_context(_paused_indexing(client, collection_name))
             
-            for doc_data in batch:
-                try:
-                    content = doc_data.get("content", "")
-                    meta = doc_data.get("meta", {})
+            for i in range(0, len(documents_data), batch_size):
+                batch = documents_data[i:i + batch_size]
+                batch_documents = []
+                
+                # One lookup for the whole batch instead of one query per document
+                batch_doc_ids = []
+                for doc_data in batch:
+                    meta = doc_data.get("meta") or {}
                     doc_id = meta.get("doc_id") or meta.get("id")
+                    if doc_id and doc_id not in batch_doc_ids:
+                        batch_doc_ids.append(doc_id)
+                existing_keys = _existing_doc_keys(client, collection_name, batch_doc_ids)
+                
+                # Duplicates are skipped before they cost an embedding: a document whose
+                # doc_id already stores the same content, or an exact repeat (same content
+                # and metadata) of a document earlier in this import
+                batch_fingerprints = {}
+                existing_content_keys = set()
+                if duplicate_strategy == "skip":
+                    batch_fingerprints = dict(enumerate(generate_content_fingerprints_batch(
+                        [(doc_data.get("content", ""), doc_data.get("meta") or {}) for doc_data in batch]
+                    )))
+                    existing_content_keys = _existing_content_keys(
+                        client, collection_name,
+                        list({fingerprint["content_hash"] for fingerprint in batch_fingerprints.values()})
+                    )
+                
+                for index, doc_data in enumerate(batch):
+                    try:
+                        content = doc_data.get("content", "")
+                        meta = doc_data.get("meta", {})
+                        doc_id = meta.get("doc_id") or meta.get("id")
+                        
+                        if not doc_id:
+                            errors.append({
+                                "document": doc_data,
+                                "error": "Missing doc_id in metadata"
+                            })
+                            continue
+                        
+                        # Check for existing document
+                        category = meta.get("category", "other")
+                        
+                        if (doc_id, category) in existing_keys:
+                            if duplicate_strategy == "skip":
+                                skipped_count += 1
+                                continue
+                            elif duplicate_strategy == "error":
+                                errors.append({
+                                    "document": doc_data,
+                                    "error": f"Duplicate document found: {doc_id}"
+                                })
+                                continue
+                            elif duplicate_strategy == "update":
+                                # For update, we'll create a new document (actual update in Phase 2 update_service)
+                                updated_count += 1
+                        
+                        fingerprint = batch_fingerprints.get(index)
+                        if fingerprint is not None:
+                            if ((doc_id, fingerprint["content_hash"]) in existing_content_keys
+                                    or fingerprint["composite_key"] in seen_keys):
+                                skipped_count += 1
+                                continue
+                            seen_keys.add(fingerprint["composite_key"])
+                        
+                        # Create Document object (keeping an embedding carried over from an export)
+                        doc = Document(content=content, meta=meta, embedding=doc_data.get("embedding"))
+                        batch_documents.append(doc)
                     
-                    if not doc_id:
+                    except Exception as e:
                         errors.append({
                             "document": doc_data,
-                            "error": "Missing doc_id in metadata"
+                            "error": str(e)
                         })
-                        continue
+                
+                # Write batch if we have documents
+                if batch_documents:
+                    # Embed only documents that don't already carry an embedding
+                    to_embed = [doc for doc in batch_documents if doc.embedding is None]
+                    if embedder and to_embed:
+                        embedded = iter(embedder.run(documents=to_embed)["documents"])
+                        documents_with_embeddings = [
+                            doc if doc.embedding is not None else next(embedded)
+                            for doc in batch_documents
+                        ]
+                    else:
+                        documents_with_embeddings = batch_documents
                     
-                    # Check for existing document
-                    category = meta.get("category", "other")
-                    existing_docs = query_by_doc_id(document_store, doc_id, category, status=None)
+                    if direct_upsert and all(doc.embedding is not None for doc in documents_with_embeddings):
+                        points = convert_haystack_documents_to_qdrant_points(
+                            documents_with_embeddings,
+                            use_sparse_embeddings=document_store.use_sparse_embeddings
+                        )
+                        if pending_points:
+                            if upsert_future is not None:
+                                imported_count += upsert_future.result()
+                                upsert_future = None
+                            upsert_future = executor.submit(_upsert, pending_points, False)
+                        pending_points = points
+                        continue
                     
-                    if existing_docs:
-                        if duplicate_strategy == "skip":
-                            skipped_count += 1
-                            continue
-                        elif duplicate_strategy == "error":
-                            errors.append({
-                                "document": doc_data,
-                                "error": f"Duplicate document found: {doc_id}"
-                            })
-                            continue
-                        elif duplicate_strategy == "update":
-                            # For update, we'll create a new document (actual update in Phase 2 update_service)
-                            updated_count += 1
+                    # Use appropriate DuplicatePolicy based on duplicate_strategy
+                    if duplicate_strategy == "skip":
+                        policy = DuplicatePolicy.SKIP
+                    elif duplicate_strategy == "update":
+                        policy = DuplicatePolicy.OVERWRITE
+                    else:  # "error" - already handled above, but use FAIL for safety
+                        policy = DuplicatePolicy.FAIL
                     
-                    # Create Document object
-                    doc = Document(content=content, meta=meta)
-                    batch_documents.append(doc)
-                
-                except Exception as e:
-                    errors.append({
-                        "document": doc_data,
-                        "error": str(e)
-                    })
+                    document_store.write_documents(documents_with_embeddings, policy=policy)
+                    imported_count += len(documents_with_embeddings)
             
-            # Write batch if we have documents
-            if batch_documents:
-                if embedder:
-                    # Embed documents
-                    result = embedder.run(documents=batch_documents)
-                    documents_with_embeddings = result["documents"]
-                else:
-                    documents_with_embeddings = batch_documents
-                
-                # Use appropriate DuplicatePolicy based on duplicate_strategy
-                if duplicate_strategy == "skip":
-                    policy = DuplicatePolicy.SKIP
-                elif duplicate_strategy == "update":
-                    policy = DuplicatePolicy.OVERWRITE
-                else:  # "error" - already handled above, but use FAIL for safety
-                    policy = DuplicatePolicy.FAIL
-                
-                document_store.write_documents(documents_with_embeddings, policy=policy)
-                imported_count += len(documents_with_embeddings)
+            if upsert_future is not None:
+                imported_count += upsert_future.result()
+                upsert_future = None
+            
+            # Updates are applied in order, so waiting on the last one confirms them all
+            if pending_points:
+                imported_count += _upsert(pending_points, True)
+                pending_points = None
         
         return {
             "status": "success",
@@ -642,6 +1296,12 @@ def import_documents(
         }
     
     except Exception as e:
+        if upsert_future is not None:
+            # Count an upsert that was still in flight if it went through
+            try:
+                imported_count += upsert_future.result()
+            except Exception:
+                pass
         return {
             "status": "error",
             "imported_count": imported_count,
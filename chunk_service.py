@@ -5,13 +5,25 @@ Implements document chunking and chunk management for incremental updates.
 Enables partial document updates by splitting documents into chunks and tracking changes at chunk level.
 """
 import hashlib
-from typing import Dict, List, Optional, Tuple
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import datetime
 
+import numpy as np
 from haystack.dataclasses.document import Document
 from haystack.components.preprocessors import RecursiveDocumentSplitter
+from haystack_integrations.document_stores.qdrant.converters import DENSE_VECTORS_NAME, convert_id
 
-from deduplication_service import normalize_content, generate_content_fingerprint
+from deduplication_service import (
+    normalize_content, generate_content_fingerprint, batched_sha256_hex, BLAKE3_DIGEST_SIZE
+)
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
 
 
 # Default chunking parameters
@@ -19,13 +31,42 @@ DEFAULT_CHUNK_SIZE = 512  # tokens (per RULE 2: 512-1024 tokens preferred)
 DEFAULT_CHUNK_OVERLAP = 50  # tokens
 DEFAULT_SEPARATORS = ["\n\n", "\n", ". ", " "]  # Natural boundaries: paragraphs, lines, sentences, words
 
+# Chunk change-detection hash: "sha256" (default, meta.hash_content) or "blake3"
+# (meta.hash_content_b3, needs the optional blake3 package; falls back to sha256
+# when it is not installed). Chunks stored before switching to blake3 have no
+# hash_content_b3 and keep comparing by SHA256 until they are rewritten.
+# hash_content_b3 is truncated to deduplication_service.BLAKE3_DIGEST_SIZE, the
+# same length as BLAKE3 fingerprints, so hash_hex_like recognizes it.
+CHUNK_HASH_ALGO = os.getenv("CHUNK_HASH_ALGO", "sha256")
+CHUNK_HASH_B3_FIELD = "hash_content_b3"
+
+# Chunk fields that parent_metadata must not override when copied onto chunks
+CHUNK_EXCLUDED_PARENT_FIELDS = frozenset({
+    'doc_id', 'chunk_id', 'chunk_index', 'parent_doc_id', 'is_chunk', 'total_chunks',
+    'hash_content', 'content_hash', CHUNK_HASH_B3_FIELD, 'chunker'
+})
+
+# Chunker used by chunk_document: "recursive" (token-based RecursiveDocumentSplitter)
+# or "cdc_v1" (content-defined chunking, see content_defined_chunk). Chunks are
+# stamped with meta.chunker so stored chunks can be told apart after switching.
+CHUNKER_RECURSIVE = "recursive"
+CHUNKER_CDC = "cdc_v1"
+DEFAULT_CHUNKER = os.getenv("CHUNKER", CHUNKER_RECURSIVE)
+CHARS_PER_TOKEN = 4  # Approximate, converts chunk_size (tokens) to a CDC target size (characters)
+CDC_WINDOW = 48  # Rolling hash window in characters
+CHUNK_BATCH_SIZE = 256  # Chunks hashed/built (and embedded/written by store_chunked_document) per batch
+_CDC_BASE = np.uint64(0x100000001B3)  # Odd multiplier, so it is invertible mod 2**64
 
+
+@lru_cache(maxsize=8192)
 def generate_chunk_id(doc_id: str, chunk_index: int) -> str:
     """
     Generate stable chunk ID for a document chunk.
     
     Format: {doc_id}_chunk_{chunk_index}
     This ensures chunks can be uniquely identified and tracked across updates.
+    IDs are cached, so re-chunking the same document reuses the same strings;
+    callers downstream of chunk_document read meta['chunk_id'] instead.
     
     Args:
         doc_id: Parent document ID
@@ -37,23 +78,263 @@ def generate_chunk_id(doc_id: str, chunk_index: int) -> str:
     return f"{doc_id}_chunk_{chunk_index}"
 
 
+def generate_parent_content_hash(content: str) -> str:
+    """
+    Generate the hash of a whole document's normalized content.
+    
+    Stored on every chunk as parent_content_hash so an update with identical
+    content can be detected without re-chunking.
+    
+    Args:
+        content: Full document content
+        
+    Returns:
+        SHA256 hex digest of the normalized content
+    """
+    return hashlib.sha256(normalize_content(content).encode('utf-8')).hexdigest()
+
+
+def _use_blake3() -> bool:
+    """Return True if chunk hashes should be computed with BLAKE3."""
+    return CHUNK_HASH_ALGO == "blake3" and blake3 is not None
+
+
+def chunk_content_sha256(chunk: Document) -> Optional[str]:
+    """
+    Get the SHA256 content hash of a chunk, computing it if it is not stored.
+    
+    The stored hash is read from meta['hash_content'], or from the legacy
+    meta['content_hash'] field of chunks written before it was renamed.
+    
+    Args:
+        chunk: Chunk document
+        
+    Returns:
+        SHA256 hex digest of the normalized chunk content, or None if the chunk has no content
+    """
+    stored = chunk.meta.get('hash_content') or chunk.meta.get('content_hash')
+    if stored or chunk.content is None:
+        return stored
+    return hashlib.sha256(normalize_content(chunk.content).encode('utf-8')).hexdigest()
+
+
+# Cached powers B**k and B**-k mod 2**64, grown on demand (replaced atomically)
+_cdc_power_tables = (np.ones(1, dtype=np.uint64), np.ones(1, dtype=np.uint64))
+
+
+def _cdc_powers(n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get tables of B**k and B**-k (mod 2**64) for k in range(n + 1).
+    
+    Tables are cached at module level and grown by doubling, so repeated
+    chunking does not recompute the cumulative products.
+    
+    Args:
+        n: Highest power needed
+        
+    Returns:
+        Tuple of (powers, inverse_powers) uint64 arrays of at least n + 1 entries
+    """
+    global _cdc_power_tables
+    powers, inverse_powers = _cdc_power_tables
+    if len(powers) > n:
+        return powers, inverse_powers
+    
+    size = max(n + 1, 2 * len(powers))
+    base_inverse = np.uint64(pow(int(_CDC_BASE), -1, 2 ** 64))
+    with np.errstate(over='ignore'):
+        powers = np.full(size, _CDC_BASE, dtype=np.uint64)
+        powers[0] = 1
+        powers = np.cumprod(powers)
+        inverse_powers = np.full(size, base_inverse, dtype=np.uint64)
+        inverse_powers[0] = 1
+        inverse_powers = np.cumprod(inverse_powers)
+    _cdc_power_tables = (powers, inverse_powers)
+    return powers, inverse_powers
+
+
+def _cdc_window_hashes(codes: np.ndarray, window: int, ends: np.ndarray) -> np.ndarray:
+    """
+    Compute Karp-Rabin hashes of the windows ending at the given positions, vectorized.
+    
+    The prefix hash P[k] = sum(c[j] * B**(k-1-j)) is computed with cumsum by
+    scaling each code by B**-j (B is odd, so it has an inverse mod 2**64), and
+    the hash of the window ending at e is P[e] - P[e - window] * B**window.
+    All arithmetic wraps mod 2**64 in uint64.
+    
+    Args:
+        codes: Character codes as uint64
+        window: Window length
+        ends: Window end positions (exclusive), each >= window
+        
+    Returns:
+        Array of window hashes, one per entry of ends
+    """
+    n = len(codes)
+    powers, inverse_powers = _cdc_powers(n)
+    with np.errstate(over='ignore'):
+        prefix = np.zeros(n + 1, dtype=np.uint64)
+        prefix[1:] = np.cumsum(codes * inverse_powers[:n]) * powers[:n]
+        return prefix[ends] - prefix[ends - window] * powers[window]
+
+
+def content_defined_chunk(
+    text: str,
+    target_size: int = DEFAULT_CHUNK_SIZE * CHARS_PER_TOKEN,
+    window: int = CDC_WINDOW
+) -> List[str]:
+    """
+    Split text at content-defined boundaries using a rolling Karp-Rabin hash.
+    
+    A boundary is declared after a whitespace character where the top bits of
+    the hash of the preceding window are zero, so boundaries depend only on
+    nearby content. An edit therefore changes only the chunks around it, and
+    chunks after it keep their exact content (and hash), unlike fixed-length
+    splitting where every later boundary shifts.
+    
+    Chunks are kept between target_size // 2 and target_size * 2 characters;
+    oversized spans are cut at the last space before the limit.
+    
+    Args:
+        text: Text to split
+        target_size: Approximate chunk size in characters
+        window: Rolling hash window in characters
+        
+    Returns:
+        List of chunk strings that concatenate back to text
+    """
+    if not text:
+        return []
+    
+    length = len(text)
+    min_size = max(1, target_size // 2)
+    max_size = max(min_size + 1, target_size * 2)
+    if length <= min_size:
+        return [text]
+    
+    window = min(window, length)
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+    
+    # Candidate ends: after whitespace, with top mask_bits of the window hash zero.
+    # Whitespace is roughly one character in five, hence the reduced mask width.
+    # Hashes are only evaluated at whitespace ends.
+    mask_bits = max(1, int(np.log2(max(2, max_size - min_size))) - 2)
+    tail = codes[window - 1:]
+    is_whitespace = (tail == 32) | (tail == 10) | (tail == 9) | (tail == 13)
+    ends = np.flatnonzero(is_whitespace) + window
+    hashes = _cdc_window_hashes(codes.astype(np.uint64), window, ends)
+    candidates = ends[(hashes >> np.uint64(64 - mask_bits)) == 0]
+    
+    chunks = []
+    start = 0
+    for end in candidates.tolist() + [length]:
+        # Force cuts in spans with no boundary before max_size
+        while end - start > max_size:
+            cut = text.rfind(' ', start + min_size, start + max_size)
+            cut = start + max_size if cut < 0 else cut + 1
+            chunks.append(text[start:cut])
+            start = cut
+        if end - start >= min_size or end == length:
+            chunks.append(text[start:end])
+            start = end
+    
+    return [chunk for chunk in chunks if chunk]
+
+
+# Serializes splitter construction/warm-up (warm-up loads the tiktoken encoder)
+_SPLITTER_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=16)
+def _get_splitter(
+    chunk_size: int,
+    chunk_overlap: int,
+    separators: Tuple[str, ...]
+) -> RecursiveDocumentSplitter:
+    """
+    Get a warmed-up RecursiveDocumentSplitter, cached per configuration.
+    
+    Warm-up loads the tokenizer, so building a splitter per chunk_document call
+    costs tens to hundreds of milliseconds; cached splitters are reused.
+    
+    Args:
+        chunk_size: Maximum chunk size in tokens
+        chunk_overlap: Overlap between chunks in tokens
+        separators: Tuple of separators to use for splitting
+        
+    Returns:
+        Warmed-up RecursiveDocumentSplitter instance
+    """
+    with _SPLITTER_LOCK:
+        splitter = RecursiveDocumentSplitter(
+            split_length=chunk_size,
+            split_overlap=chunk_overlap,
+            split_unit="token",  # Use tokens for accurate size control
+            separators=list(separators)
+        )
+        
+        # Warm up splitter (required for RecursiveDocumentSplitter)
+        splitter.warm_up()
+    
+    return splitter
+
+
+def _recursive_split(
+    content: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    separators: Optional[List[str]]
+) -> List[Document]:
+    """
+    Split content with Haystack's RecursiveDocumentSplitter.
+    
+    Args:
+        content: Document content to chunk
+        chunk_size: Maximum chunk size in tokens
+        chunk_overlap: Overlap between chunks in tokens
+        separators: List of separators to use for splitting (None for DEFAULT_SEPARATORS)
+        
+    Returns:
+        List of chunk Documents (content only)
+    """
+    # Use default separators if not provided
+    if separators is None:
+        separators = DEFAULT_SEPARATORS
+    
+    # Reuse a warmed-up splitter for this configuration
+    splitter = _get_splitter(chunk_size, chunk_overlap, tuple(separators))
+    
+    # Create temporary document for splitting
+    temp_doc = Document(content=content)
+    
+    # Split document into chunks
+    result = splitter.run([temp_doc])
+    return result["documents"]
+
+
 def chunk_document(
     content: str,
     doc_id: str,
     chunk_size: int = DEFAULT_CHUNK_SIZE,
     chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
     separators: Optional[List[str]] = None,
-    parent_metadata: Optional[Dict] = None
+    parent_metadata: Optional[Dict] = None,
+    chunker: Optional[str] = None
 ) -> List[Document]:
     """
     Split a document into chunks using Haystack's RecursiveDocumentSplitter.
     
+    With chunker="cdc_v1", splits with content_defined_chunk instead, using
+    chunk_size * CHARS_PER_TOKEN characters as the target size (chunk_overlap
+    and separators are not used).
+    
     Creates chunk documents with metadata including:
     - chunk_id: Unique identifier for the chunk
     - chunk_index: Position within the parent document
     - parent_doc_id: Reference to parent document
     - is_chunk: Flag indicating this is a chunk
     - total_chunks: Total number of chunks in the parent document
+    - chunker: Chunker that produced the chunk ("recursive" or "cdc_v1")
     
     Args:
         content: Document content to chunk
@@ -62,77 +343,101 @@ def chunk_document(
         chunk_overlap: Overlap between chunks in tokens (default: 50)
         separators: List of separators to use for splitting (default: ["\\n\\n", "\\n", ". ", " "])
         parent_metadata: Optional parent document metadata to copy to chunks
+        chunker: "recursive" or "cdc_v1" (default: CHUNKER environment variable, else "recursive")
         
     Returns:
         List of Document objects, each representing a chunk with chunk metadata
     """
+    return list(chunk_document_iter(
+        content=content,
+        doc_id=doc_id,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=separators,
+        parent_metadata=parent_metadata,
+        chunker=chunker
+    ))
+
+
+def chunk_document_iter(
+    content: str,
+    doc_id: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+    separators: Optional[List[str]] = None,
+    parent_metadata: Optional[Dict] = None,
+    chunker: Optional[str] = None
+) -> Iterator[Document]:
+    """
+    Lazily yield the chunk documents chunk_document would return.
+    
+    The document is split up front (total_chunks is needed for every chunk's
+    metadata), but hashing and Document construction happen CHUNK_BATCH_SIZE
+    chunks at a time, so callers that embed and write in batches never hold
+    every enriched chunk at once.
+    
+    Args:
+        Same as chunk_document
+        
+    Yields:
+        Chunk Documents with chunk metadata, in chunk_index order
+    """
     if not content:
-        return []
+        return
     
-    # Use default separators if not provided
-    if separators is None:
-        separators = DEFAULT_SEPARATORS.copy()
-    
-    # Initialize splitter
-    splitter = RecursiveDocumentSplitter(
-        split_length=chunk_size,
-        split_overlap=chunk_overlap,
-        split_unit="token",  # Use tokens for accurate size control
-        separators=separators
-    )
+    if chunker is None:
+        chunker = DEFAULT_CHUNKER
     
-    # Warm up splitter (required for RecursiveDocumentSplitter)
-    splitter.warm_up()
+    if chunker == CHUNKER_CDC:
+        chunk_texts = content_defined_chunk(content, target_size=chunk_size * CHARS_PER_TOKEN)
+    else:
+        chunker = CHUNKER_RECURSIVE
+        chunk_texts = [chunk_doc.content for chunk_doc in _recursive_split(content, chunk_size, chunk_overlap, separators)]
     
-    # Create temporary document for splitting
-    temp_doc = Document(content=content)
+    use_blake3 = _use_blake3()
     
-    # Split document into chunks
-    result = splitter.run([temp_doc])
-    chunk_docs = result["documents"]
+    # Filter parent metadata once (excluding conflicting fields), not per chunk
+    inherited_metadata = {
+        key: value for key, value in (parent_metadata or {}).items()
+        if key not in CHUNK_EXCLUDED_PARENT_FIELDS
+    }
     
-    # Enrich chunks with chunk metadata
-    enriched_chunks = []
-    total_chunks = len(chunk_docs)
+    total_chunks = len(chunk_texts)
     
-    for index, chunk_doc in enumerate(chunk_docs):
-        # Generate chunk ID
-        chunk_id = generate_chunk_id(doc_id, index)
-        
-        # Generate content hash for the chunk
-        chunk_content_hash = hashlib.sha256(
-            normalize_content(chunk_doc.content).encode('utf-8')
-        ).hexdigest()
-        
-        # Build chunk metadata
-        chunk_metadata = {
-            'doc_id': chunk_id,  # Chunk uses chunk_id as its doc_id for storage
-            'chunk_id': chunk_id,
-            'chunk_index': index,
-            'parent_doc_id': doc_id,
-            'is_chunk': True,
-            'total_chunks': total_chunks,
-            'hash_content': chunk_content_hash,
-            'content_hash': chunk_content_hash,  # Alias for backward compatibility
-        }
+    for batch_start in range(0, total_chunks, CHUNK_BATCH_SIZE):
+        batch_texts = chunk_texts[batch_start:batch_start + CHUNK_BATCH_SIZE]
         
-        # Copy parent metadata if provided (excluding conflicting fields)
-        if parent_metadata:
-            excluded_fields = {'doc_id', 'chunk_id', 'chunk_index', 'parent_doc_id', 
-                             'is_chunk', 'total_chunks', 'hash_content', 'content_hash'}
-            for key, value in parent_metadata.items():
-                if key not in excluded_fields and key not in chunk_metadata:
-                    chunk_metadata[key] = value
+        # Normalize and encode each chunk once; every hash of the batch reads the same
+        # buffers. SHA256 is always stamped because it is persisted as hash_content,
+        # so the write path never re-normalizes a chunk to compute it.
+        normalized_chunks = [normalize_content(text).encode('utf-8') for text in batch_texts]
+        chunk_content_hashes = batched_sha256_hex(normalized_chunks)
+        if use_blake3:
+            chunk_b3_hashes = [blake3(buffer).hexdigest(length=BLAKE3_DIGEST_SIZE) for buffer in normalized_chunks]
         
-        # Create enriched chunk document
-        enriched_chunk = Document(
-            content=chunk_doc.content,
-            meta=chunk_metadata
-        )
-        
-        enriched_chunks.append(enriched_chunk)
-    
-    return enriched_chunks
+        for offset, (text, chunk_content_hash) in enumerate(zip(batch_texts, chunk_content_hashes)):
+            index = batch_start + offset
+            # Generate chunk ID
+            chunk_id = generate_chunk_id(doc_id, index)
+            
+            # Build chunk metadata (inherited keys never collide with chunk fields)
+            chunk_metadata = {
+                'doc_id': chunk_id,  # Chunk uses chunk_id as its doc_id for storage
+                'chunk_id': chunk_id,
+                'chunk_index': index,
+                'parent_doc_id': doc_id,
+                'is_chunk': True,
+                'total_chunks': total_chunks,
+                'chunker': chunker,
+                **inherited_metadata,
+                'hash_content': chunk_content_hash,
+                'content_hash': chunk_content_hash  # Alias for backward compatibility
+            }
+            if use_blake3:
+                chunk_metadata[CHUNK_HASH_B3_FIELD] = chunk_b3_hashes[offset]
+            
+            # Create enriched chunk document
+            yield Document(content=text, meta=chunk_metadata)
 
 
 def compare_chunks(
@@ -148,6 +453,10 @@ def compare_chunks(
     - new: Chunks that don't exist in old_chunks
     - deleted: Old chunks that don't exist in new_chunks
     
+    Chunks are compared by hash_content_b3 when both sides carry it, otherwise
+    by the SHA256 hash_content (computed from content if the new chunk lacks it).
+    Old chunks without hash_content fall back to the legacy meta['content_hash'].
+    
     Args:
         old_chunks: List of existing chunk documents
         new_chunks: List of new chunk documents
@@ -159,42 +468,53 @@ def compare_chunks(
         - 'new': List of new chunks (from new_chunks)
         - 'deleted': List of deleted chunks (from old_chunks)
     """
-    # Create maps for efficient lookup
-    old_chunks_by_index = {chunk.meta.get('chunk_index'): chunk for chunk in old_chunks}
-    old_chunks_by_id = {chunk.meta.get('chunk_id'): chunk for chunk in old_chunks}
+    # Index old chunks once: chunk_index -> (BLAKE3 hash, SHA256 hash, chunk)
+    old_by_index = {}
+    for chunk in old_chunks:
+        meta = chunk.meta
+        old_by_index[meta.get('chunk_index')] = (
+            meta.get(CHUNK_HASH_B3_FIELD),
+            chunk_content_sha256(chunk),
+            chunk
+        )
     
     # Initialize result categories
     unchanged = []
     changed = []
     new = []
-    deleted_indices = set(old_chunks_by_index.keys())
+    matched_indices = set()
     
     # Process new chunks
     for new_chunk in new_chunks:
         chunk_index = new_chunk.meta.get('chunk_index')
-        chunk_id = new_chunk.meta.get('chunk_id')
-        new_hash = new_chunk.meta.get('hash_content') or new_chunk.meta.get('content_hash')
+        old_entry = old_by_index.get(chunk_index)
         
-        # Check if chunk exists in old chunks by index
-        if chunk_index in old_chunks_by_index:
-            old_chunk = old_chunks_by_index[chunk_index]
-            old_hash = old_chunk.meta.get('hash_content') or old_chunk.meta.get('content_hash')
-            
-            # Compare hashes
-            if new_hash == old_hash:
-                # Chunk unchanged - keep old chunk
-                unchanged.append(old_chunk)
-                deleted_indices.discard(chunk_index)
-            else:
-                # Chunk changed - use new chunk
-                changed.append(new_chunk)
-                deleted_indices.discard(chunk_index)
-        else:
+        if old_entry is None:
             # New chunk (no matching index)
             new.append(new_chunk)
+            continue
+        
+        matched_indices.add(chunk_index)
+        old_b3_hash, old_hash, old_chunk = old_entry
+        new_b3_hash = new_chunk.meta.get(CHUNK_HASH_B3_FIELD)
+        
+        # Compare hashes (BLAKE3 when both sides have it, otherwise SHA256)
+        if new_b3_hash and old_b3_hash:
+            # Chunks stored with a longer digest compare by its prefix: a shorter
+            # BLAKE3 output is a prefix of the longer one
+            is_unchanged = new_b3_hash == old_b3_hash[:len(new_b3_hash)]
+        else:
+            is_unchanged = chunk_content_sha256(new_chunk) == old_hash
+        
+        if is_unchanged:
+            # Chunk unchanged - keep old chunk
+            unchanged.append(old_chunk)
+        else:
+            # Chunk changed - use new chunk
+            changed.append(new_chunk)
     
     # Find deleted chunks (old chunks not found in new chunks)
-    deleted = [old_chunks_by_index[index] for index in deleted_indices]
+    deleted = [entry[2] for index, entry in old_by_index.items() if index not in matched_indices]
     
     return {
         'unchanged': unchanged,
@@ -204,6 +524,29 @@ def compare_chunks(
     }
 
 
+def chunks_merkle(chunks: List[Document]) -> bytes:
+    """
+    Compute a single digest over a chunk list's (chunk_index, content hash) pairs.
+    
+    Two chunk lists have the same root exactly when they hold the same content
+    hashes at the same indices, regardless of list order, so equal roots mean
+    nothing changed. A flat SHA256 over the sorted pairs is enough for an
+    equality check; a tree would only matter for locating differences.
+    
+    Args:
+        chunks: Chunk documents (hash_content is computed from content if missing)
+        
+    Returns:
+        SHA256 digest (32 bytes)
+    """
+    pairs = sorted(
+        (chunk.meta.get('chunk_index', 0), chunk_content_sha256(chunk) or '') for chunk in chunks
+    )
+    return hashlib.sha256(
+        "\n".join(f"{chunk_index}:{chunk_hash}" for chunk_index, chunk_hash in pairs).encode('utf-8')
+    ).digest()
+
+
 def identify_chunk_changes(
     old_chunks: List[Document],
     new_chunks: List[Document]
@@ -211,6 +554,9 @@ def identify_chunk_changes(
     """
     Identify changes between old and new chunks, returning summary statistics.
     
+    When both lists have the same chunks_merkle root, every chunk is reported
+    unchanged without running compare_chunks.
+    
     Args:
         old_chunks: List of existing chunk documents
         new_chunks: List of new chunk documents
@@ -225,7 +571,16 @@ def identify_chunk_changes(
         - deleted_count: Number of deleted chunks
         - changes: Detailed comparison result from compare_chunks()
     """
-    changes = compare_chunks(old_chunks, new_chunks)
+    # Identical chunk sets (the common no-op update) skip the per-index comparison
+    if len(old_chunks) == len(new_chunks) and chunks_merkle(old_chunks) == chunks_merkle(new_chunks):
+        changes = {
+            'unchanged': sorted(old_chunks, key=lambda doc: doc.meta.get('chunk_index', 0)),
+            'changed': [],
+            'new': [],
+            'deleted': []
+        }
+    else:
+        changes = compare_chunks(old_chunks, new_chunks)
     
     return {
         'total_old': len(old_chunks),
@@ -241,21 +596,30 @@ def identify_chunk_changes(
 def get_chunks_by_parent_doc_id(
     document_store,
     parent_doc_id: str,
-    status: Optional[str] = 'active'
+    status: Optional[str] = 'active',
+    include_content: bool = True,
+    include_embeddings: bool = True
 ) -> List[Document]:
     """
     Retrieve all chunks for a parent document.
     
+    With include_content/include_embeddings off, the chunks are scrolled straight
+    from Qdrant with only the requested payload fields and without vectors, so
+    callers that only compare hashes or check existence do not transfer every
+    chunk's text and embedding. Falls back to document_store.filter_documents if
+    the direct scroll fails.
+    
     Args:
         document_store: QdrantDocumentStore instance
         parent_doc_id: Parent document ID
         status: Optional status filter (default: 'active')
+        include_content: Whether to fetch chunk content (default: True)
+        include_embeddings: Whether to fetch chunk embeddings (default: True)
         
     Returns:
-        List of chunk documents, sorted by chunk_index
+        List of chunk documents, sorted by chunk_index, with meta['hash_content'] set
+        from the content_hash alias when only the alias is stored
     """
-    from metadata_service import query_by_doc_id
-    
     # Query chunks by parent_doc_id
     filters = {
         "field": "meta.parent_doc_id",
@@ -273,7 +637,19 @@ def get_chunks_by_parent_doc_id(
         }
     
     try:
-        chunks = document_store.filter_documents(filters=filters)
+        chunks = None
+        if not (include_content and include_embeddings):
+            try:
+                chunks = _scroll_chunks(document_store, filters, include_content, include_embeddings)
+            except Exception:
+                chunks = None
+        if chunks is None:
+            chunks = document_store.filter_documents(filters=filters)
+        # Canonicalize the content hash once so comparisons read only meta['hash_content']
+        # (older rows may carry just the content_hash alias)
+        for chunk in chunks:
+            if not chunk.meta.get('hash_content') and chunk.meta.get('content_hash'):
+                chunk.meta['hash_content'] = chunk.meta['content_hash']
         # Sort by chunk_index
         chunks.sort(key=lambda doc: doc.meta.get('chunk_index', 0))
         return chunks
@@ -281,6 +657,104 @@ def get_chunks_by_parent_doc_id(
         return []
 
 
+def _scroll_chunks(
+    document_store,
+    filters: Dict,
+    include_content: bool,
+    include_embeddings: bool
+) -> List[Document]:
+    """
+    Scroll chunk documents from Qdrant fetching only the requested payload fields.
+    
+    Args:
+        document_store: QdrantDocumentStore instance (its index is the collection)
+        filters: Haystack filter selecting the chunks
+        include_content: Whether to fetch chunk content
+        include_embeddings: Whether to fetch chunk vectors
+        
+    Returns:
+        List of chunk documents (unsorted)
+    """
+    from bulk_operations_service import _get_qdrant_client, _convert_haystack_filter_to_qdrant
+    
+    client = _get_qdrant_client()
+    scroll_filter = _convert_haystack_filter_to_qdrant(filters)
+    payload_fields = ["id", "meta", "content"] if include_content else ["id", "meta"]
+    
+    chunks = []
+    offset = None
+    while True:
+        points, next_offset = client.scroll(
+            collection_name=document_store.index,
+            scroll_filter=scroll_filter,
+            limit=CHUNK_BATCH_SIZE,
+            offset=offset,
+            with_payload=payload_fields,
+            with_vectors=include_embeddings
+        )
+        
+        for point in points:
+            payload = point.payload or {}
+            chunks.append(Document(
+                id=payload.get("id"),
+                content=payload.get("content"),
+                meta=payload.get("meta") or {},
+                embedding=_dense_vector(point.vector) if include_embeddings else None
+            ))
+        
+        if not points or next_offset is None:
+            break
+        offset = next_offset
+    
+    return chunks
+
+
+def _dense_vector(vector) -> Optional[List[float]]:
+    """Return the dense part of a Qdrant point vector (named when sparse embeddings are on)."""
+    if isinstance(vector, dict):
+        return vector.get(DENSE_VECTORS_NAME)
+    return vector or None
+
+
+def get_chunk_embeddings(document_store, chunk_ids: List[str]) -> Dict[str, List[float]]:
+    """
+    Fetch stored embeddings for specific chunks by their document IDs.
+    
+    Used together with get_chunks_by_parent_doc_id(include_embeddings=False) so only
+    the vectors that are actually needed are transferred.
+    
+    Args:
+        document_store: QdrantDocumentStore instance
+        chunk_ids: Haystack document IDs of the chunks
+        
+    Returns:
+        Dictionary of chunk document ID -> embedding (chunks without one are omitted)
+    """
+    if not chunk_ids:
+        return {}
+    
+    from bulk_operations_service import _get_qdrant_client
+    
+    ids_by_point = {convert_id(chunk_id): chunk_id for chunk_id in chunk_ids}
+    try:
+        points = _get_qdrant_client().retrieve(
+            collection_name=document_store.index,
+            ids=list(ids_by_point),
+            with_payload=False,
+            with_vectors=True
+        )
+    except Exception:
+        return {}
+    
+    embeddings = {}
+    for point in points:
+        embedding = _dense_vector(point.vector)
+        chunk_id = ids_by_point.get(str(point.id).replace("-", ""))
+        if embedding is not None and chunk_id is not None:
+            embeddings[chunk_id] = embedding
+    return embeddings
+
+
 def reconstruct_document_from_chunks(chunks: List[Document]) -> str:
     """
     Reconstruct full document content from chunks.
@@ -291,11 +765,14 @@ def reconstruct_document_from_chunks(chunks: List[Document]) -> str:
     Returns:
         Reconstructed document content
     """
-    # Sort chunks by index to ensure correct order
-    sorted_chunks = sorted(chunks, key=lambda doc: doc.meta.get('chunk_index', 0))
+    # Read each chunk_index once; chunks are usually already sorted
+    # (get_chunks_by_parent_doc_id sorts them), so only sort when needed
+    indices = [chunk.meta.get('chunk_index', 0) for chunk in chunks]
+    if all(indices[i] <= indices[i + 1] for i in range(len(indices) - 1)):
+        order = range(len(chunks))
+    else:
+        order = sorted(range(len(chunks)), key=indices.__getitem__)
     
     # Join chunk contents
-    contents = [chunk.content for chunk in sorted_chunks]
-    
-    return "".join(contents)
+    return "".join([chunks[i].content for i in order])
 
@@ -6,6 +6,7 @@ Handles partial document updates by updating only changed chunks and preserving
 """
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
+from itertools import islice
 
 from haystack.dataclasses.document import Document
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
@@ -13,21 +14,185 @@ from haystack.document_stores.types import DuplicatePolicy
 
 from chunk_service import (
     chunk_document,
+    chunk_document_iter,
     compare_chunks,
     identify_chunk_changes,
     get_chunks_by_parent_doc_id,
-    generate_chunk_id
+    get_chunk_embeddings,
+    generate_parent_content_hash,
+    chunk_content_sha256,
+    CHUNK_HASH_B3_FIELD,
+    CHUNK_BATCH_SIZE
 )
 from deduplication_service import (
     check_duplicate_level,
     decide_storage_action,
-    generate_content_fingerprint,
     ACTION_SKIP,
     ACTION_UPDATE,
     ACTION_STORE
 )
 from metadata_service import build_chunk_metadata
-from update_service import deprecate_version
+from bulk_operations_service import update_metadata_by_filter
+from update_service import deprecate_versions
+
+
+def _build_chunk_doc(
+    chunk: Document,
+    doc_id: str,
+    total_chunks: int,
+    category: str,
+    version: Optional[str],
+    file_path: Optional[str],
+    source: str,
+    tags: Optional[List[str]],
+    parent_metadata: Optional[Dict],
+    parent_content_hash: Optional[str] = None
+) -> Document:
+    """
+    Build the storable Document for a chunk produced by chunk_document.
+    
+    Args:
+        chunk: Chunk Document (meta carries chunk_id and chunk_index)
+        doc_id: Parent document ID
+        total_chunks: Total number of chunks in the parent document
+        category, version, file_path, source, tags, parent_metadata, parent_content_hash:
+            Passed through to build_chunk_metadata
+        
+    Returns:
+        Document with full chunk metadata (not yet embedded)
+    """
+    chunk_id = chunk.meta.get('chunk_id')
+    
+    # Reuse the content hash chunk_document already computed (metadata_hash is
+    # computed by build_chunk_metadata, so a full fingerprint is not needed)
+    hash_content = chunk_content_sha256(chunk)
+    
+    # Build full metadata for chunk
+    chunk_metadata = build_chunk_metadata(
+        content=chunk.content,
+        doc_id=chunk_id,
+        chunk_id=chunk_id,
+        chunk_index=chunk.meta.get('chunk_index'),
+        parent_doc_id=doc_id,
+        total_chunks=total_chunks,
+        category=category,
+        hash_content=hash_content,
+        version=version,
+        file_path=file_path,
+        source=source,
+        tags=tags,
+        status='active',
+        parent_metadata=parent_metadata,
+        parent_content_hash=parent_content_hash
+    )
+    
+    # Keep the BLAKE3 change-detection hash so the next update can compare by it,
+    # and the chunker stamp so chunks from different chunkers can be told apart
+    for field in (CHUNK_HASH_B3_FIELD, 'chunker'):
+        if chunk.meta.get(field):
+            chunk_metadata[field] = chunk.meta[field]
+    
+    return Document(content=chunk.content, meta=chunk_metadata)
+
+
+def _reuse_embeddings(
+    chunk_docs: List[Document],
+    existing_chunks: List[Document],
+    document_store=None
+) -> List[Document]:
+    """
+    Copy stored embeddings onto chunk documents whose content is already stored.
+    
+    Chunks are matched by hash_content regardless of chunk_index, so content that
+    only moved (e.g. after an insertion upstream, which content-defined chunking
+    keeps byte-identical) is not re-embedded. Existing chunks fetched without
+    embeddings have the vectors of matching chunks retrieved from document_store.
+    
+    Args:
+        chunk_docs: Chunk documents built by _build_chunk_doc
+        existing_chunks: Stored chunks of the same parent document
+        document_store: Optional QdrantDocumentStore to fetch missing embeddings from
+        
+    Returns:
+        The chunk documents that still need embedding, in their original order
+    """
+    old_by_hash = {}
+    for old_chunk in existing_chunks:
+        old_hash = old_chunk.meta.get('hash_content')
+        if old_hash:
+            old_by_hash.setdefault(old_hash, old_chunk)
+    
+    wanted = {chunk_doc.meta['hash_content'] for chunk_doc in chunk_docs} & old_by_hash.keys()
+    missing_ids = [
+        old_by_hash[old_hash].id for old_hash in wanted
+        if old_by_hash[old_hash].embedding is None and old_by_hash[old_hash].id
+    ]
+    fetched = get_chunk_embeddings(document_store, missing_ids) if document_store is not None else {}
+    
+    embeddings_by_hash = {}
+    for old_hash in wanted:
+        old_chunk = old_by_hash[old_hash]
+        embedding = old_chunk.embedding if old_chunk.embedding is not None else fetched.get(old_chunk.id)
+        if embedding is not None:
+            embeddings_by_hash[old_hash] = embedding
+    
+    to_embed = []
+    for chunk_doc in chunk_docs:
+        embedding = embeddings_by_hash.get(chunk_doc.meta['hash_content'])
+        if embedding is not None:
+            chunk_doc.embedding = embedding
+        else:
+            to_embed.append(chunk_doc)
+    return to_embed
+
+
+def _embed_chunks(chunk_docs: List[Document], embedder=None) -> List[Document]:
+    """
+    Embed chunk documents with a single embedder.run call.
+    
+    Embedders are throughput-bound, so one batched call amortizes tokenizer and
+    model launch overhead that a per-chunk call would pay for every chunk.
+    
+    Args:
+        chunk_docs: Chunk documents to embed
+        embedder: Optional embedder; if None, documents are returned unchanged
+        
+    Returns:
+        Embedded documents in the same order as chunk_docs
+    """
+    if not embedder or not chunk_docs:
+        return chunk_docs
+    return embedder.run(documents=chunk_docs)["documents"]
+
+
+def _write_chunks(
+    document_store: QdrantDocumentStore,
+    chunk_docs: List[Document],
+    policy: DuplicatePolicy
+) -> List[str]:
+    """
+    Write chunk documents in one batch, falling back to per-chunk writes on failure.
+    
+    Args:
+        document_store: QdrantDocumentStore instance
+        chunk_docs: Chunk documents to write
+        policy: Duplicate policy for write_documents
+        
+    Returns:
+        chunk_ids of chunks that could not be written (empty if the batch write succeeded)
+    """
+    try:
+        document_store.write_documents(chunk_docs, policy=policy)
+        return []
+    except Exception:
+        # Isolate the failing chunks so the rest still get written
+        failed_chunk_ids = []
+        for chunk_doc in chunk_docs:
+            try:
+                document_store.write_documents([chunk_doc], policy=policy)
+            except Exception:
+                failed_chunk_ids.append(chunk_doc.meta.get('chunk_id'))
+        return failed_chunk_ids
 
 
 def update_chunked_document(
@@ -56,6 +221,13 @@ def update_chunked_document(
     6. Add new chunks (embed and add)
     7. Deprecate deleted chunks
     
+    If every stored chunk carries the same parent_content_hash as the new content,
+    the document is unchanged and returns immediately without re-chunking (chunking
+    parameters are not compared).
+    
+    Changed and new chunks whose content is already stored at another index
+    (e.g. shifted by an insertion) reuse the stored embedding instead of being re-embedded.
+    
     Args:
         document_store: QdrantDocumentStore instance
         content: New document content
@@ -72,18 +244,49 @@ def update_chunked_document(
         
     Returns:
         Dictionary with update results:
-        - status: "success" | "error"
+        - status: "success" | "partial_success" (some chunks failed to write, or old
+          versions could not be deprecated) | "error"
         - total_chunks: Total number of chunks
         - unchanged_count: Number of unchanged chunks (preserved)
         - changed_count: Number of changed chunks (updated)
         - new_count: Number of new chunks (added)
-        - deleted_count: Number of deleted chunks (deprecated)
+        - deleted_count: Number of deleted chunks (deprecated; 0 if deprecation failed)
+        - reused_embedding_count: Changed/new chunks whose stored embedding was reused
         - chunk_ids: List of all chunk IDs (new and updated)
+        - failed_chunk_ids: Chunk IDs that could not be written (their old versions stay active)
+        - error: Deprecation error, if old versions could not be deprecated
         - message: Summary message
     """
     try:
         # Step 1: Retrieve existing chunks
-        existing_chunks = get_chunks_by_parent_doc_id(document_store, doc_id, status='active')
+        # Only hashes, ids and chunk metadata are compared, so skip content and vectors;
+        # embeddings of reusable chunks are fetched on demand by _reuse_embeddings
+        existing_chunks = get_chunks_by_parent_doc_id(
+            document_store, doc_id, status='active',
+            include_content=False, include_embeddings=False
+        )
+        
+        # Short-circuit: whole document unchanged since the stored chunks were written
+        parent_content_hash = generate_parent_content_hash(content)
+        if existing_chunks and all(
+            chunk.meta.get('parent_content_hash') == parent_content_hash for chunk in existing_chunks
+        ) and len(existing_chunks) == existing_chunks[0].meta.get('total_chunks'):
+            unchanged_count = len(existing_chunks)
+            return {
+                "status": "success",
+                "total_chunks": unchanged_count,
+                "unchanged_count": unchanged_count,
+                "changed_count": 0,
+                "new_count": 0,
+                "deleted_count": 0,
+                "reused_embedding_count": 0,
+                "chunk_ids": [],
+                "failed_chunk_ids": [],
+                "message": (
+                    f"Document content unchanged. "
+                    f"Total chunks: {unchanged_count}, Unchanged: {unchanged_count} (preserved)"
+                )
+            }
         
         # Step 2: Chunk the new document version
         new_chunks = chunk_document(
@@ -112,139 +315,96 @@ def update_chunked_document(
         # Step 4: Process unchanged chunks (preserve - no action needed)
         unchanged_count = len(unchanged_chunks)
         
-        # Step 5: Process changed chunks (update - re-embed and update)
-        changed_count = 0
-        updated_chunk_ids = []
+        # Step 5: Process changed chunks (collect old version to deprecate, rebuild for re-embedding)
+        to_embed = []
+        replaced = []  # (point ID of the old version, chunk_id of its replacement)
+        
+        # Index existing chunks by chunk_index once (first chunk wins, as in a linear search)
+        existing_by_index = {}
+        for old in existing_chunks:
+            existing_by_index.setdefault(old.meta.get('chunk_index'), old)
         
         for new_chunk in changed_chunks:
-            chunk_id = new_chunk.meta.get('chunk_id')
             chunk_index = new_chunk.meta.get('chunk_index')
             
-            # Find matching old chunk to deprecate
-            old_chunk = None
-            for old in existing_chunks:
-                if old.meta.get('chunk_index') == chunk_index:
-                    old_chunk = old
-                    break
-            
-            # Deprecate old chunk version
+            # Find matching old chunk to deprecate once its replacement is written
+            old_chunk = existing_by_index.get(chunk_index)
             if old_chunk and old_chunk.id:
-                try:
-                    # Extract content_hash from old_chunk.meta to avoid ID format validation
-                    content_hash = None
-                    if old_chunk.meta:
-                        content_hash = old_chunk.meta.get('hash_content') or old_chunk.meta.get('content_hash')
-                    
-                    deprecate_version(document_store, old_chunk.id, content_hash=content_hash)
-                except Exception as e:
-                    # Log error but continue
-                    pass
-            
-            # Generate fingerprint for new chunk
-            chunk_fingerprint = generate_content_fingerprint(
-                new_chunk.content,
-                new_chunk.meta
-            )
-            chunk_fingerprint['metadata_hash'] = new_chunk.meta.get('metadata_hash', chunk_fingerprint['metadata_hash'])
-            chunk_fingerprint['composite_key'] = f"{chunk_fingerprint['content_hash']}:{chunk_fingerprint['metadata_hash']}"
-            
-            # Build full metadata for chunk
-            chunk_metadata = build_chunk_metadata(
-                content=new_chunk.content,
-                doc_id=chunk_id,
-                chunk_id=chunk_id,
-                chunk_index=chunk_index,
-                parent_doc_id=doc_id,
-                total_chunks=len(new_chunks),
-                category=category,
-                hash_content=chunk_fingerprint['content_hash'],
-                version=version,
-                file_path=file_path,
-                source=source,
-                tags=tags,
-                status='active',
-                parent_metadata=parent_metadata
-            )
-            
-            # Create chunk document
-            chunk_doc = Document(content=new_chunk.content, meta=chunk_metadata)
-            
-            # Embed and store new chunk version
-            if embedder:
-                result = embedder.run(documents=[chunk_doc])
-                embedded_chunk = result["documents"][0]
-            else:
-                embedded_chunk = chunk_doc
+                replaced.append((old_chunk.id, new_chunk.meta.get('chunk_id')))
             
-            # Use OVERWRITE policy for chunk updates (chunks may already exist)
-            document_store.write_documents([embedded_chunk], policy=DuplicatePolicy.OVERWRITE)
-            changed_count += 1
-            updated_chunk_ids.append(chunk_id)
+            to_embed.append(_build_chunk_doc(
+                new_chunk, doc_id, len(new_chunks), category, version,
+                file_path, source, tags, parent_metadata, parent_content_hash
+            ))
         
-        # Step 6: Process new chunks (add - embed and add)
-        new_count = 0
+        changed_count = len(changed_chunks)
         
+        # Step 6: Process new chunks (build for embedding)
         for new_chunk in new_chunks_list:
-            chunk_id = new_chunk.meta.get('chunk_id')
-            chunk_index = new_chunk.meta.get('chunk_index')
-            
-            # Generate fingerprint for new chunk
-            chunk_fingerprint = generate_content_fingerprint(
-                new_chunk.content,
-                new_chunk.meta
-            )
-            chunk_fingerprint['metadata_hash'] = new_chunk.meta.get('metadata_hash', chunk_fingerprint['metadata_hash'])
-            chunk_fingerprint['composite_key'] = f"{chunk_fingerprint['content_hash']}:{chunk_fingerprint['metadata_hash']}"
-            
-            # Build full metadata for chunk
-            chunk_metadata = build_chunk_metadata(
-                content=new_chunk.content,
-                doc_id=chunk_id,
-                chunk_id=chunk_id,
-                chunk_index=chunk_index,
-                parent_doc_id=doc_id,
-                total_chunks=len(new_chunks),
-                category=category,
-                hash_content=chunk_fingerprint['content_hash'],
-                version=version,
-                file_path=file_path,
-                source=source,
-                tags=tags,
-                status='active',
-                parent_metadata=parent_metadata
-            )
-            
-            # Create chunk document
-            chunk_doc = Document(content=new_chunk.content, meta=chunk_metadata)
-            
-            # Embed and store new chunk
-            if embedder:
-                result = embedder.run(documents=[chunk_doc])
-                embedded_chunk = result["documents"][0]
-            else:
-                embedded_chunk = chunk_doc
-            
+            to_embed.append(_build_chunk_doc(
+                new_chunk, doc_id, len(new_chunks), category, version,
+                file_path, source, tags, parent_metadata, parent_content_hash
+            ))
+        
+        new_count = len(new_chunks_list)
+        
+        # Embed changed + new chunks in one embedder call and write them in one batch.
+        # Changed chunks come first, so chunk_ids keeps the changed-then-new ordering.
+        # Chunks whose content is already stored (at any index) reuse the stored embedding.
+        updated_chunk_ids = [chunk_doc.meta['chunk_id'] for chunk_doc in to_embed]
+        reused_embedding_count = 0
+        failed_chunk_ids = []
+        failed = set()
+        written_ids = set()
+        if to_embed:
+            needs_embedding = _reuse_embeddings(to_embed, existing_chunks, document_store) if embedder else to_embed
+            reused_embedding_count = len(to_embed) - len(needs_embedding)
+            embedded_by_position = dict(zip(
+                (id(chunk_doc) for chunk_doc in needs_embedding),
+                _embed_chunks(needs_embedding, embedder)
+            ))
+            embedded_chunks = [embedded_by_position.get(id(chunk_doc), chunk_doc) for chunk_doc in to_embed]
             # Use OVERWRITE policy for chunk updates (chunks may already exist)
-            document_store.write_documents([embedded_chunk], policy=DuplicatePolicy.OVERWRITE)
-            new_count += 1
-            updated_chunk_ids.append(chunk_id)
+            failed_chunk_ids = _write_chunks(document_store, embedded_chunks, DuplicatePolicy.OVERWRITE)
+            if len(failed_chunk_ids) == len(embedded_chunks):
+                raise RuntimeError(f"Failed to write all {len(embedded_chunks)} chunks")
+            failed = set(failed_chunk_ids)
+            if failed:
+                updated_chunk_ids = [chunk_id for chunk_id in updated_chunk_ids if chunk_id not in failed]
+            written_ids = {
+                chunk_doc.id for chunk_doc in embedded_chunks if chunk_doc.meta.get('chunk_id') not in failed
+            }
         
-        # Step 7: Process deleted chunks (deprecate)
-        deleted_count = 0
+        # Step 7: Deprecate, only after the writes, the old versions of changed chunks whose
+        # replacement was written, and deleted chunks, in one set_payload call. Old versions
+        # of chunks that failed to write stay active. Matched by point ID, so identical
+        # content stored elsewhere is not deprecated with them, and a point that was just
+        # written (same ID as an old version) is never deprecated.
+        deleted_ids = [deleted_chunk.id for deleted_chunk in deleted_chunks if deleted_chunk.id]
+        deprecate_ids = [old_id for old_id, chunk_id in replaced if chunk_id not in failed] + deleted_ids
+        deprecation = deprecate_versions(
+            document_store,
+            document_ids=[point_id for point_id in deprecate_ids if point_id not in written_ids]
+        )
+        deprecation_error = None
+        if deprecation.get('status') != 'success':
+            deprecation_error = deprecation.get('error') or "Failed to deprecate old chunk versions"
+        deleted_count = len(deleted_ids) if deprecation_error is None else 0
         
-        for deleted_chunk in deleted_chunks:
-            if deleted_chunk.id:
-                try:
-                    # Extract content_hash from deleted_chunk.meta to avoid ID format validation
-                    content_hash = None
-                    if deleted_chunk.meta:
-                        content_hash = deleted_chunk.meta.get('hash_content') or deleted_chunk.meta.get('content_hash')
-                    
-                    deprecate_version(document_store, deleted_chunk.id, content_hash=content_hash)
-                    deleted_count += 1
-                except Exception as e:
-                    # Log error but continue
-                    pass
+        # Stamp preserved chunks with the new parent_content_hash so the next update
+        # with identical content can short-circuit (written chunks already carry it)
+        if any(chunk.meta.get('parent_content_hash') != parent_content_hash for chunk in unchanged_chunks):
+            update_metadata_by_filter(
+                document_store,
+                filters={
+                    "operator": "AND",
+                    "conditions": [
+                        {"field": "meta.parent_doc_id", "operator": "==", "value": doc_id},
+                        {"field": "meta.status", "operator": "==", "value": "active"}
+                    ]
+                },
+                metadata_updates={'parent_content_hash': parent_content_hash}
+            )
         
         # Generate summary message
         total_chunks = len(new_chunks)
@@ -256,17 +416,26 @@ def update_chunked_document(
             f"New: {new_count} (added), "
             f"Deleted: {deleted_count} (deprecated)"
         )
+        if failed_chunk_ids:
+            message += f", Failed to write: {len(failed_chunk_ids)}"
+        if deprecation_error:
+            message += f", Failed to deprecate old versions: {deprecation_error}"
         
-        return {
-            "status": "success",
+        result = {
+            "status": "partial_success" if failed_chunk_ids or deprecation_error else "success",
             "total_chunks": total_chunks,
             "unchanged_count": unchanged_count,
             "changed_count": changed_count,
             "new_count": new_count,
             "deleted_count": deleted_count,
+            "reused_embedding_count": reused_embedding_count,
             "chunk_ids": updated_chunk_ids,
+            "failed_chunk_ids": failed_chunk_ids,
             "message": message
         }
+        if deprecation_error:
+            result["error"] = deprecation_error
+        return result
     
     except Exception as e:
         return {
@@ -293,6 +462,9 @@ def store_chunked_document(
     """
     Store a new chunked document (all chunks are new).
     
+    Chunks are built, embedded and written CHUNK_BATCH_SIZE at a time, bounding
+    memory for large documents.
+    
     Args:
         document_store: QdrantDocumentStore instance
         content: Document content
@@ -309,83 +481,76 @@ def store_chunked_document(
         
     Returns:
         Dictionary with storage results:
-        - status: "success" | "error"
+        - status: "success" | "partial_success" (some chunks failed to write) | "error"
         - total_chunks: Total number of chunks stored
         - chunk_ids: List of chunk IDs
+        - failed_chunk_ids: Chunk IDs that could not be written
         - message: Summary message
     """
     try:
-        # Chunk the document
-        chunks = chunk_document(
+        parent_content_hash = generate_parent_content_hash(content)
+        
+        # Chunk lazily and build/embed/write CHUNK_BATCH_SIZE chunks at a time, so only
+        # one batch of enriched and embedded chunks is held in memory
+        chunks = iter(chunk_document_iter(
             content=content,
             doc_id=doc_id,
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
             parent_metadata=parent_metadata
-        )
+        ))
+        
+        total_chunks = 0
+        chunk_ids = []
+        failed_chunk_ids = []
+        
+        while True:
+            batch = list(islice(chunks, CHUNK_BATCH_SIZE))
+            if not batch:
+                break
+            total_chunks = batch[0].meta['total_chunks']
+            
+            # Build the batch's chunk documents, then embed them in a single embedder call
+            stored_chunks = [
+                _build_chunk_doc(
+                    chunk, doc_id, total_chunks, category, version,
+                    file_path, source, tags, parent_metadata, parent_content_hash
+                )
+                for chunk in batch
+            ]
+            chunk_ids.extend(chunk_doc.meta['chunk_id'] for chunk_doc in stored_chunks)
+            stored_chunks = _embed_chunks(stored_chunks, embedder)
+            
+            # Batch write the chunks (new chunks, use SKIP to prevent overwrites)
+            failed_chunk_ids.extend(_write_chunks(document_store, stored_chunks, DuplicatePolicy.SKIP))
         
-        if not chunks:
+        if not total_chunks:
             return {
                 "status": "error",
                 "error": "Failed to chunk document",
                 "error_type": "ChunkingError"
             }
         
-        # Store all chunks
-        chunk_ids = []
-        stored_chunks = []
-        
-        for chunk in chunks:
-            chunk_id = chunk.meta.get('chunk_id')
-            chunk_index = chunk.meta.get('chunk_index')
-            
-            # Generate fingerprint
-            chunk_fingerprint = generate_content_fingerprint(
-                chunk.content,
-                chunk.meta
-            )
-            chunk_fingerprint['metadata_hash'] = chunk.meta.get('metadata_hash', chunk_fingerprint['metadata_hash'])
-            chunk_fingerprint['composite_key'] = f"{chunk_fingerprint['content_hash']}:{chunk_fingerprint['metadata_hash']}"
-            
-            # Build full metadata
-            chunk_metadata = build_chunk_metadata(
-                content=chunk.content,
-                doc_id=chunk_id,
-                chunk_id=chunk_id,
-                chunk_index=chunk_index,
-                parent_doc_id=doc_id,
-                total_chunks=len(chunks),
-                category=category,
-                hash_content=chunk_fingerprint['content_hash'],
-                version=version,
-                file_path=file_path,
-                source=source,
-                tags=tags,
-                status='active',
-                parent_metadata=parent_metadata
-            )
-            
-            # Create chunk document
-            chunk_doc = Document(content=chunk.content, meta=chunk_metadata)
-            
-            # Embed and store
-            if embedder:
-                result = embedder.run(documents=[chunk_doc])
-                embedded_chunk = result["documents"][0]
-            else:
-                embedded_chunk = chunk_doc
-            
-            stored_chunks.append(embedded_chunk)
-            chunk_ids.append(chunk_id)
+        if len(failed_chunk_ids) == total_chunks:
+            raise RuntimeError(f"Failed to write all {total_chunks} chunks")
         
-        # Batch write all chunks (new chunks, use SKIP to prevent overwrites)
-        document_store.write_documents(stored_chunks, policy=DuplicatePolicy.SKIP)
+        if failed_chunk_ids:
+            failed = set(failed_chunk_ids)
+            chunk_ids = [chunk_id for chunk_id in chunk_ids if chunk_id not in failed]
+            return {
+                "status": "partial_success",
+                "total_chunks": total_chunks,
+                "chunk_ids": chunk_ids,
+                "failed_chunk_ids": failed_chunk_ids,
+                "message": f"Chunked document stored with {len(chunk_ids)} of {total_chunks} chunks"
+            }
         
         return {
             "status": "success",
-            "total_chunks": len(chunks),
+            "total_chunks": total_chunks,
             "chunk_ids": chunk_ids,
-            "message": f"Chunked document stored successfully with {len(chunks)} chunks"
+            "failed_chunk_ids": [],
+            "message": f"Chunked document stored successfully with {total_chunks} chunks"
         }
     
     except Exception as e:
@@ -9,12 +9,28 @@ Implements multi-factor duplicate detection with 4 levels:
 """
 import hashlib
 import json
+import os
 import re
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 from haystack.dataclasses.document import Document
 
+# blake3 is an optional, faster fingerprint hash (see HASH_ALGO)
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+# lmdb is optional: it persists the file fingerprint cache across runs (see
+# FINGERPRINT_CACHE_DIR); without it the cache only lives for the process
+try:
+    import lmdb
+except ImportError:
+    lmdb = None
+
 
 # Duplicate detection levels
 DUPLICATE_LEVEL_EXACT = 1  # Exact duplicate - skip
@@ -28,9 +44,56 @@ ACTION_UPDATE = "update"
 ACTION_WARN = "warn"
 ACTION_STORE = "store"
 
+# Placeholder markers removed by normalize_content, compiled once. Applied one after
+# another (not as one alternation): removing one marker can expose another, and the
+# resulting hashes are persisted, so the order of removal must not change.
+_PLACEHOLDER_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'\[Full content from file\.\.\.\]',
+        r'\[\.\.\.\]',
+        r'\[TODO:.*?\]',
+        r'\[TBD:.*?\]',
+    )
+]
+
 # Semantic similarity threshold for Level 3 detection
 SEMANTIC_SIMILARITY_THRESHOLD = 0.85
 
+# Fingerprint hash: "sha256" (default) or "blake3" (needs the optional blake3
+# package; falls back to sha256 when it is not installed). Hashes are persisted, so
+# stored documents keep their old hashes until they are re-fingerprinted
+# (migrate_existing_documents.py); hash_hex_like verifies either kind.
+HASH_ALGO = os.getenv("HASH_ALGO", "sha256")
+HASH_ALGO_SHA256 = "sha256"
+HASH_ALGO_BLAKE3 = "blake3"
+
+# Encoder for metadata hashing, built once: same output as
+# json.dumps(metadata, sort_keys=True, default=str), which builds a new encoder per call
+_METADATA_JSON_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+
+# Content hashes of files, keyed by path and validated against (mtime_ns, size), so
+# re-ingesting an unchanged file skips normalizing and hashing it. Two tiers: an
+# in-process LRU of FINGERPRINT_MEMORY_CACHE_SIZE entries, then an LMDB database in
+# FINGERPRINT_CACHE_DIR (empty disables it). The directory defaults to
+# .fingerprint_cache next to this module and is made absolute at import, so the
+# cache does not depend on the working directory the server is started from.
+FINGERPRINT_CACHE_DIR = os.getenv(
+    "FINGERPRINT_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".fingerprint_cache")
+)
+if FINGERPRINT_CACHE_DIR:
+    FINGERPRINT_CACHE_DIR = os.path.abspath(os.path.expanduser(FINGERPRINT_CACHE_DIR))
+FINGERPRINT_CACHE_MAP_SIZE = 1 << 30  # 1 GiB LMDB map (address space, not disk)
+FINGERPRINT_MEMORY_CACHE_SIZE = 65536  # In-process entries (least recently used evicted first)
+_fingerprint_memory_cache: "OrderedDict[str, Tuple[int, int, str]]" = OrderedDict()
+_fingerprint_cache_env = None
+_fingerprint_cache_lock = threading.Lock()
+
+# BLAKE3 fingerprints are truncated to 128 bits (32 hex chars), which keeps them
+# distinguishable from 64-char SHA256 hashes and is ample for duplicate keying
+BLAKE3_DIGEST_SIZE = 16
+
 
 def normalize_content(content: str) -> str:
     """
@@ -51,23 +114,24 @@ def normalize_content(content: str) -> str:
     if not content:
         return ""
     
+    # Scan the input once for the markers that need work (single C-level memchr each);
+    # steps with nothing to change are skipped, and rstrip() returns the input itself
+    # when there is no trailing whitespace, so clean text is copied only by lower()
+    has_carriage_return = '\r' in content
+    # Every placeholder starts with '[', so text without one skips the regex passes
+    has_placeholder = '[' in content
+    
     # Strip trailing spaces
     normalized = content.rstrip()
     
     # Normalize newlines (Windows \r\n -> \n, Mac \r -> \n)
-    normalized = normalized.replace('\r\n', '\n').replace('\r', '\n')
+    if has_carriage_return:
+        normalized = normalized.replace('\r\n', '\n').replace('\r', '\n')
     
     # Remove obvious placeholder markers that aren't meaningful
-    # These are common placeholders that should be normalized
-    placeholder_patterns = [
-        r'\[Full content from file\.\.\.\]',
-        r'\[\.\.\.\]',
-        r'\[TODO:.*?\]',
-        r'\[TBD:.*?\]',
-    ]
-    
-    for pattern in placeholder_patterns:
-        normalized = re.sub(pattern, '', normalized, flags=re.IGNORECASE)
+    if has_placeholder:
+        for pattern in _PLACEHOLDER_PATTERNS:
+            normalized = pattern.sub('', normalized)
     
     # Lowercase for hash consistency (ensures case-insensitive duplicate detection)
     normalized = normalized.lower()
@@ -75,7 +139,207 @@ def normalize_content(content: str) -> str:
     return normalized
 
 
-def generate_content_fingerprint(content: str, metadata: Dict) -> Dict[str, str]:
+def fingerprint_hash_algo() -> str:
+    """Return the hash algorithm fingerprints are computed with (HASH_ALGO, if available)."""
+    if HASH_ALGO == HASH_ALGO_BLAKE3 and blake3 is not None:
+        return HASH_ALGO_BLAKE3
+    return HASH_ALGO_SHA256
+
+
+def hash_hex(data: bytes, algo: Optional[str] = None) -> str:
+    """
+    Hash bytes with the fingerprint hash algorithm.
+    
+    Args:
+        data: Bytes to hash
+        algo: Optional algorithm ("sha256" or "blake3"); defaults to fingerprint_hash_algo()
+        
+    Returns:
+        Hex digest (64 chars for SHA256, 32 chars for BLAKE3)
+    """
+    if algo is None:
+        algo = fingerprint_hash_algo()
+    if algo == HASH_ALGO_BLAKE3 and blake3 is not None:
+        return blake3(data).hexdigest(length=BLAKE3_DIGEST_SIZE)
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_hex_like(data: bytes, reference_hash: Optional[str]) -> str:
+    """
+    Hash bytes with the algorithm a stored hash was computed with.
+    
+    The algorithm is told apart by digest length, so documents fingerprinted
+    before and after a HASH_ALGO switch both verify.
+    
+    Args:
+        data: Bytes to hash
+        reference_hash: Stored hex digest to match the algorithm of
+        
+    Returns:
+        Hex digest comparable with reference_hash
+    """
+    if reference_hash and len(reference_hash) == 2 * BLAKE3_DIGEST_SIZE:
+        return hash_hex(data, HASH_ALGO_BLAKE3)
+    return hash_hex(data, HASH_ALGO_SHA256)
+
+
+def file_fingerprint_cache_key(path) -> Optional[Tuple[str, int, int]]:
+    """
+    Build the fingerprint cache key of a file: (absolute path, mtime_ns, size).
+    
+    Args:
+        path: File path (str or Path)
+        
+    Returns:
+        Cache key tuple, or None if the file cannot be stat'ed
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+def _get_fingerprint_cache_env():
+    """Open the LMDB fingerprint cache once; None when lmdb or the cache dir is unavailable."""
+    global _fingerprint_cache_env
+    
+    if lmdb is None or not FINGERPRINT_CACHE_DIR:
+        return None
+    if _fingerprint_cache_env is None:
+        with _fingerprint_cache_lock:
+            if _fingerprint_cache_env is None:
+                try:
+                    _fingerprint_cache_env = lmdb.open(FINGERPRINT_CACHE_DIR, map_size=FINGERPRINT_CACHE_MAP_SIZE)
+                except Exception:
+                    # Unwritable location etc.: keep the in-process tier only
+                    _fingerprint_cache_env = False
+    return _fingerprint_cache_env or None
+
+
+def _memory_cache_get(entry_key: str) -> Optional[Tuple[int, int, str]]:
+    """Look up an in-process cache entry, marking it most recently used."""
+    with _fingerprint_cache_lock:
+        entry = _fingerprint_memory_cache.get(entry_key)
+        if entry is not None:
+            _fingerprint_memory_cache.move_to_end(entry_key)
+        return entry
+
+
+def _memory_cache_set(entry_key: str, entry: Tuple[int, int, str]) -> None:
+    """Store an in-process cache entry, evicting the least recently used beyond the limit."""
+    with _fingerprint_cache_lock:
+        _fingerprint_memory_cache[entry_key] = entry
+        _fingerprint_memory_cache.move_to_end(entry_key)
+        while len(_fingerprint_memory_cache) > FINGERPRINT_MEMORY_CACHE_SIZE:
+            _fingerprint_memory_cache.popitem(last=False)
+
+
+def _cache_get(cache_key: Tuple[str, int, int], kind: str) -> Optional[str]:
+    """
+    Look up a cached hash of a file, memory tier first, then LMDB.
+    
+    Entries are keyed by kind (the hash algorithm for content hashes) and path;
+    an entry recorded for another mtime_ns or size is stale and treated as a miss
+    (it is overwritten on store), as is an LMDB value that cannot be parsed.
+    """
+    path, mtime_ns, size = cache_key
+    entry_key = f"{kind}:{path}"
+    
+    entry = _memory_cache_get(entry_key)
+    if entry is None:
+        env = _get_fingerprint_cache_env()
+        if env is None:
+            return None
+        try:
+            with env.begin() as txn:
+                raw = txn.get(entry_key.encode('utf-8'))
+        except Exception:
+            return None
+        if raw is None:
+            return None
+        try:
+            cached_mtime_ns, cached_size, cached_hash = raw.decode('ascii').split(':', 2)
+            entry = (int(cached_mtime_ns), int(cached_size), cached_hash)
+        except ValueError:
+            # Corrupt or foreign value (UnicodeDecodeError is a ValueError)
+            return None
+        _memory_cache_set(entry_key, entry)
+    
+    if entry[0] != mtime_ns or entry[1] != size:
+        return None
+    return entry[2]
+
+
+def _cache_put(cache_key: Tuple[str, int, int], kind: str, value: str) -> None:
+    """Record a hash of a file in both cache tiers (LMDB errors are ignored)."""
+    path, mtime_ns, size = cache_key
+    entry_key = f"{kind}:{path}"
+    _memory_cache_set(entry_key, (mtime_ns, size, value))
+    
+    env = _get_fingerprint_cache_env()
+    if env is None:
+        return
+    try:
+        with env.begin(write=True) as txn:
+            txn.put(entry_key.encode('utf-8'), f"{mtime_ns}:{size}:{value}".encode('ascii'))
+    except Exception:
+        pass
+
+
+def cached_file_hash(path, cache_key: Optional[Tuple[str, int, int]]) -> Optional[str]:
+    """
+    Get the SHA256 of a file's raw bytes (metadata hash_file) through the fingerprint cache.
+    
+    An unchanged file is neither re-read nor re-hashed. Pass the result as
+    build_metadata_schema(hash_file=...), which otherwise reads and hashes the file.
+    
+    Args:
+        path: File path (str or Path)
+        cache_key: file_fingerprint_cache_key() of the file, taken before it was read
+        
+    Returns:
+        SHA256 hex digest of the file, or None without a cache key or if the file cannot be read
+    """
+    if cache_key is None:
+        return None
+    
+    file_hash = _cache_get(cache_key, "file_sha256")
+    if file_hash is None:
+        try:
+            with open(path, 'rb') as file:
+                file_hash = hashlib.sha256(file.read()).hexdigest()
+        except OSError:
+            return None
+        _cache_put(cache_key, "file_sha256", file_hash)
+    return file_hash
+
+
+def batched_sha256_hex(buffers: List[bytes]) -> List[str]:
+    """
+    Compute SHA256 hex digests for a batch of buffers.
+    
+    Hashes the whole batch in one pass with a bound constructor, avoiding
+    per-item attribute lookups when fingerprinting many chunks at once.
+    hashlib is backed by OpenSSL, which uses SHA-NI instructions when the CPU
+    supports them.
+    
+    Args:
+        buffers: List of byte strings to hash
+        
+    Returns:
+        List of SHA256 hex digests, in the same order as buffers
+    """
+    sha256 = hashlib.sha256
+    return [sha256(buffer).hexdigest() for buffer in buffers]
+
+
+def generate_content_fingerprint(
+    content: str,
+    metadata: Dict,
+    precomputed_content_hash: Optional[str] = None,
+    cache_key: Optional[Tuple[str, int, int]] = None
+) -> Dict[str, str]:
     """
     Generate unique fingerprint based on content and metadata.
     
@@ -84,30 +348,41 @@ def generate_content_fingerprint(content: str, metadata: Dict) -> Dict[str, str]
     2. Metadata hash (SHA256 of sorted metadata JSON)
     3. Composite key (content_hash:metadata_hash)
     
+    With HASH_ALGO=blake3 both hashes are 128-bit BLAKE3 digests instead.
+    
     Args:
         content: Document content
         metadata: Document metadata dictionary
+        precomputed_content_hash: Optional content hash already computed for this content
+            (e.g. by an earlier fingerprint); skips normalizing and re-hashing the content
+        cache_key: Optional file_fingerprint_cache_key() of the file the content was read
+            from; the content hash is then served from / recorded in the fingerprint cache
         
     Returns:
         Dictionary with:
-        - content_hash: SHA256 hash of normalized content
-        - metadata_hash: SHA256 hash of normalized metadata
+        - content_hash: Hash of normalized content
+        - metadata_hash: Hash of normalized metadata
         - composite_key: Combined key for exact duplicate detection
     """
-    # Normalize content
-    normalized_content = normalize_content(content)
-    
-    # Generate content hash
-    content_hash = hashlib.sha256(normalized_content.encode('utf-8')).hexdigest()
-    
-    # Normalize metadata for hashing (sort keys for consistency)
-    # Create a copy to avoid modifying original
-    metadata_copy = dict(metadata)
+    if not precomputed_content_hash and cache_key is not None:
+        precomputed_content_hash = _cache_get(cache_key, fingerprint_hash_algo())
+    
+    if precomputed_content_hash:
+        content_hash = precomputed_content_hash
+    else:
+        # Normalize content
+        normalized_content = normalize_content(content)
+        
+        # Generate content hash
+        content_hash = hash_hex(normalized_content.encode('utf-8'))
+        
+        if cache_key is not None:
+            _cache_put(cache_key, fingerprint_hash_algo(), content_hash)
     
-    # Sort keys and create JSON string
-    # Use sort_keys=True for consistent ordering
-    metadata_json = json.dumps(metadata_copy, sort_keys=True, default=str)
-    metadata_hash = hashlib.sha256(metadata_json.encode('utf-8')).hexdigest()
+    # Normalize metadata for hashing (sorted keys for consistent ordering); dict()
+    # turns other mappings into a plain dict the encoder serializes as an object
+    metadata_json = _METADATA_JSON_ENCODER.encode(dict(metadata))
+    metadata_hash = hash_hex(metadata_json.encode('utf-8'))
     
     # Create composite key
     composite_key = f"{content_hash}:{metadata_hash}"
@@ -119,11 +394,121 @@ def generate_content_fingerprint(content: str, metadata: Dict) -> Dict[str, str]
     }
 
 
+def _hash_hex_batch(buffers: List[bytes]) -> List[str]:
+    """Hash a batch of buffers with the fingerprint hash algorithm, resolving it once."""
+    if fingerprint_hash_algo() == HASH_ALGO_BLAKE3:
+        return [blake3(buffer).hexdigest(length=BLAKE3_DIGEST_SIZE) for buffer in buffers]
+    return batched_sha256_hex(buffers)
+
+
+def content_hashes_batch(contents: List[str]) -> List[str]:
+    """
+    Compute fingerprint content hashes for many documents at once.
+    
+    Equivalent to generate_content_fingerprint(content, ...)['content_hash'] for
+    each content, for callers that need only the content hash.
+    
+    Args:
+        contents: Document contents
+        
+    Returns:
+        Content hashes, in the same order as contents
+    """
+    return _hash_hex_batch([normalize_content(content).encode('utf-8') for content in contents])
+
+
+def generate_content_fingerprints_batch(pairs: List[Tuple[str, Dict]]) -> List[Dict[str, str]]:
+    """
+    Generate fingerprints for a batch of documents.
+    
+    Same result as calling generate_content_fingerprint per document, but all
+    contents and all metadata JSONs are serialized first and then hashed in two
+    tight loops, with the hash algorithm resolved once per batch.
+    
+    Args:
+        pairs: List of (content, metadata) tuples
+        
+    Returns:
+        List of fingerprint dictionaries (content_hash, metadata_hash, composite_key),
+        in the same order as pairs
+    """
+    content_hashes = content_hashes_batch([content for content, _ in pairs])
+    metadata_hashes = _hash_hex_batch([
+        _METADATA_JSON_ENCODER.encode(dict(metadata)).encode('utf-8') for _, metadata in pairs
+    ])
+    
+    return [
+        {
+            'content_hash': content_hash,
+            'metadata_hash': metadata_hash,
+            'composite_key': f"{content_hash}:{metadata_hash}"
+        }
+        for content_hash, metadata_hash in zip(content_hashes, metadata_hashes)
+    ]
+
+
+def build_duplicate_index(existing_docs: List[Document]) -> Dict[str, Dict]:
+    """
+    Index existing documents by the keys check_duplicate_level looks up.
+    
+    Built once per set of existing documents, so checking many fingerprints
+    against the same documents (e.g. an ingestion batch) costs one dict lookup per
+    key instead of a scan over every document. Each entry keeps the document's
+    position so lookups return the same document a linear scan would.
+    
+    Args:
+        existing_docs: List of existing Document objects
+        
+    Returns:
+        Dictionary with:
+        - by_composite: (content_hash, metadata_hash) -> (position, doc), first occurrence
+        - by_metadata_hash: metadata_hash -> list of (position, content_hash, doc)
+        - by_doc_id: doc_id -> list of (position, content_hash, doc)
+        - by_chunk_id: chunk_id -> list of (position, content_hash, doc)
+    """
+    by_composite = {}
+    by_metadata_hash = {}
+    by_doc_id = {}
+    by_chunk_id = {}
+    
+    for position, doc in enumerate(existing_docs):
+        doc_meta = doc.meta or {}
+        doc_content_hash = doc_meta.get('hash_content') or doc_meta.get('content_hash')
+        doc_metadata_hash = doc_meta.get('metadata_hash')
+        doc_doc_id = doc_meta.get('doc_id')
+        doc_chunk_id = doc_meta.get('chunk_id')
+        entry = (position, doc_content_hash, doc)
+        
+        by_composite.setdefault((doc_content_hash, doc_metadata_hash), (position, doc))
+        if doc_metadata_hash is not None:
+            by_metadata_hash.setdefault(doc_metadata_hash, []).append(entry)
+        if doc_doc_id:
+            by_doc_id.setdefault(doc_doc_id, []).append(entry)
+        if doc_chunk_id:
+            by_chunk_id.setdefault(doc_chunk_id, []).append(entry)
+    
+    return {
+        'by_composite': by_composite,
+        'by_metadata_hash': by_metadata_hash,
+        'by_doc_id': by_doc_id,
+        'by_chunk_id': by_chunk_id
+    }
+
+
+def _first_with_other_content(entries: List[Tuple], content_hash: str) -> Optional[Tuple[int, Document]]:
+    """Return (position, doc) of the first indexed entry whose content hash differs, if any."""
+    for position, doc_content_hash, doc in entries:
+        if doc_content_hash != content_hash:
+            return (position, doc)
+    return None
+
+
 def check_duplicate_level(
     fingerprint: Dict[str, str],
     existing_docs: List[Document],
     doc_id: Optional[str] = None,
-    is_chunk: bool = False
+    is_chunk: bool = False,
+    duplicate_index: Optional[Dict[str, Dict]] = None
 ) -> Tuple[int, Optional[Document], Optional[str]]:
     """
     Check duplicate level by comparing fingerprint with existing documents.
@@ -136,11 +521,16 @@ def check_duplicate_level(
     3. Semantic Similarity: High similarity (>0.85) BUT different hashes
     4. New Content: Low similarity OR different metadata
     
+    Lookups go through build_duplicate_index; when several existing documents
+    qualify, the first one in existing_docs wins.
+    
     Args:
         fingerprint: Fingerprint dict with content_hash, metadata_hash, composite_key
         existing_docs: List of existing Document objects to compare against
         doc_id: Optional document ID (or chunk_id) to check for same-document updates
         is_chunk: Whether this is a chunk-level comparison (default: False)
+        duplicate_index: Optional index of existing_docs from build_duplicate_index,
+            to reuse across many checks against the same documents
         
     Returns:
         Tuple of:
@@ -151,70 +541,49 @@ def check_duplicate_level(
     if not existing_docs:
         return (DUPLICATE_LEVEL_NEW, None, "No existing documents found")
     
+    if duplicate_index is None:
+        duplicate_index = build_duplicate_index(existing_docs)
+    
     content_hash = fingerprint['content_hash']
     metadata_hash = fingerprint['metadata_hash']
-    composite_key = fingerprint['composite_key']
+    entity_type = "chunk" if is_chunk else "document"
     
     # Level 1: Check for exact duplicate (same content_hash AND metadata_hash)
     # Works for both documents and chunks
-    for doc in existing_docs:
-        doc_meta = doc.meta or {}
-        doc_content_hash = doc_meta.get('hash_content') or doc_meta.get('content_hash')
-        doc_metadata_hash = doc_meta.get('metadata_hash')
-        
-        if doc_content_hash == content_hash and doc_metadata_hash == metadata_hash:
-            entity_type = "chunk" if is_chunk else "document"
-            return (
-                DUPLICATE_LEVEL_EXACT,
-                doc,
-                f"Exact duplicate {entity_type}: same content_hash ({content_hash[:8]}...) and metadata_hash"
-            )
+    exact = duplicate_index['by_composite'].get((content_hash, metadata_hash))
+    if exact is not None:
+        return (
+            DUPLICATE_LEVEL_EXACT,
+            exact[1],
+            f"Exact duplicate {entity_type}: same content_hash ({content_hash[:8]}...) and metadata_hash"
+        )
     
     # Level 2: Check for content update
-    # For chunks: Check by chunk_id (or chunk_index + parent_doc_id)
-    # For documents: Check by doc_id (or metadata_hash)
-    for doc in existing_docs:
-        doc_meta = doc.meta or {}
-        doc_metadata_hash = doc_meta.get('metadata_hash')
-        doc_content_hash = doc_meta.get('hash_content') or doc_meta.get('content_hash')
-        doc_doc_id = doc_meta.get('doc_id')
-        doc_chunk_id = doc_meta.get('chunk_id')
-        doc_chunk_index = doc_meta.get('chunk_index')
-        doc_parent_doc_id = doc_meta.get('parent_doc_id')
-        
-        if is_chunk:
-            # Chunk-level duplicate detection
-            # Case 1: Same chunk_id + different content_hash → Level 2 (update)
-            if doc_id and doc_chunk_id and doc_chunk_id == doc_id and doc_content_hash != content_hash:
-                return (
-                    DUPLICATE_LEVEL_UPDATE,
-                    doc,
-                    f"Chunk update: same chunk_id ({doc_id}) but different content_hash"
-                )
-            
-            # Case 2: Same parent_doc_id + same chunk_index + different content_hash → Level 2 (update)
-            # This handles cases where chunk_id might not be set but index is available
-            if doc_parent_doc_id and doc_chunk_index is not None:
-                # Need to check if we have parent_doc_id and chunk_index from new chunk
-                # This will be handled by the caller providing proper doc_id or additional context
-                pass
-        
-        # Document-level duplicate detection (original logic)
-        # Case 1: Same doc_id + different content_hash → Level 2 (update)
-        if doc_id and doc_doc_id and doc_doc_id == doc_id and doc_content_hash != content_hash:
-            return (
-                DUPLICATE_LEVEL_UPDATE,
-                doc,
-                f"Content update: same doc_id ({doc_id}) but different content_hash"
-            )
-        
-        # Case 2: Same metadata_hash + different content_hash → Level 2 (update)
-        if doc_metadata_hash == metadata_hash and doc_content_hash != content_hash:
-            return (
-                DUPLICATE_LEVEL_UPDATE,
-                doc,
-                f"Content update: same metadata_hash ({metadata_hash[:8]}...) but different content_hash"
-            )
+    # For chunks: same chunk_id; for documents: same doc_id, or same metadata_hash.
+    # Candidates are (position, rank, doc, reason): the earliest document wins, and for
+    # the same document the chunk_id check precedes doc_id, which precedes metadata_hash.
+    candidates = []
+    
+    if is_chunk and doc_id:
+        match = _first_with_other_content(duplicate_index['by_chunk_id'].get(doc_id, ()), content_hash)
+        if match is not None:
+            candidates.append((match[0], 0, match[1], f"Chunk update: same chunk_id ({doc_id}) but different content_hash"))
+    
+    if doc_id:
+        match = _first_with_other_content(duplicate_index['by_doc_id'].get(doc_id, ()), content_hash)
+        if match is not None:
+            candidates.append((match[0], 1, match[1], f"Content update: same doc_id ({doc_id}) but different content_hash"))
+    
+    match = _first_with_other_content(duplicate_index['by_metadata_hash'].get(metadata_hash, ()), content_hash)
+    if match is not None:
+        candidates.append((
+            match[0], 2, match[1],
+            f"Content update: same metadata_hash ({metadata_hash[:8]}...) but different content_hash"
+        ))
+    
+    if candidates:
+        _, _, matching_doc, reason = min(candidates, key=lambda candidate: candidate[:2])
+        return (DUPLICATE_LEVEL_UPDATE, matching_doc, reason)
     
     # Level 3: Semantic similarity check
     # For now, we'll skip semantic similarity (requires embedding comparison)
@@ -222,7 +591,6 @@ def check_duplicate_level(
     # For Phase 1, we'll treat this as Level 4 (new content)
     
     # Level 4: New content (default)
-    entity_type = "chunk" if is_chunk else "document"
     return (
         DUPLICATE_LEVEL_NEW,
         None,
@@ -19,6 +19,8 @@ from haystack.document_stores.types import DuplicatePolicy
 # Import deduplication and metadata services
 from deduplication_service import (
     generate_content_fingerprint,
+    file_fingerprint_cache_key,
+    cached_file_hash,
     check_duplicate_level,
     decide_storage_action,
     ACTION_SKIP,
@@ -43,7 +45,9 @@ from bulk_operations_service import (
     delete_by_ids,
     update_metadata_by_filter,
     export_documents,
-    import_documents
+    import_documents,
+    read_exported_documents,
+    IMPORT_BATCH_SIZE
 )
 from query_service import (
     get_document_by_path,
@@ -516,6 +520,10 @@ async def list_tools() -> list[Tool]:
                         "type": "boolean",
                         "description": "Whether to include embeddings in export (default: false)",
                         "default": False
+                    },
+                    "output_path": {
+                        "type": "string",
+                        "description": "Optional JSONL file to stream the export to instead of returning documents inline. Embeddings go to a <name>.embeddings.bin float32 sidecar."
                     }
                 }
             }
@@ -531,6 +539,10 @@ async def list_tools() -> list[Tool]:
                         "description": "Array of document dictionaries with content, meta, etc.",
                         "items": {"type": "object"}
                     },
+                    "input_path": {
+                        "type": "string",
+                        "description": "JSONL file written by export_documents (output_path) to import instead of documents_data. Exported embeddings are reused instead of re-embedding."
+                    },
                     "duplicate_strategy": {
                         "type": "string",
                         "description": "How to handle duplicates: 'skip', 'update', or 'error'",
@@ -539,12 +551,11 @@ async def list_tools() -> list[Tool]:
                     },
                     "batch_size": {
                         "type": "integer",
-                        "description": "Number of documents to process per batch (default: 100)",
-                        "default": 100,
+                        "description": "Number of documents to process per batch (default: 512)",
+                        "default": 512,
                         "minimum": 1
                     }
-                },
-                "required": ["documents_data"]
+                }
             }
         ),
         Tool(
@@ -671,6 +682,22 @@ async def list_tools() -> list[Tool]:
                         "type": "object",
                         "description": "Optional Haystack filter dictionary to filter documents for backup",
                         "additionalProperties": True
+                    },
+                    "resume": {
+                        "type": "boolean",
+                        "description": "Continue the most recent interrupted backup from its checkpoints instead of starting over (default: false)",
+                        "default": False
+                    },
+                    "embedding_dtype": {
+                        "type": "string",
+                        "description": "Storage precision of embeddings when include_embeddings is true: 'float32' (lossless) or 'float16' (half the size)",
+                        "enum": ["float32", "float16"],
+                        "default": "float32"
+                    },
+                    "archive": {
+                        "type": "boolean",
+                        "description": "Pack the finished backup into a single .tar file instead of a directory (default: false)",
+                        "default": False
                     }
                 }
             }
@@ -683,7 +710,7 @@ async def list_tools() -> list[Tool]:
                 "properties": {
                     "backup_path": {
                         "type": "string",
-                        "description": "Path to backup directory"
+                        "description": "Path to backup directory or .tar backup archive"
                     },
                     "verify_after_restore": {
                         "type": "boolean",
@@ -710,6 +737,10 @@ async def list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "Directory containing backups (default: './backups')",
                         "default": "./backups"
+                    },
+                    "limit": {
+                        "type": "integer",
+                        "description": "Optional maximum number of backups to return, newest first"
                     }
                 }
             }
@@ -793,7 +824,10 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                 # Step 2: Check if chunking is enabled and handle chunked document update
                 if enable_chunking:
                     # Check if document already has chunks
-                    existing_chunks = get_chunks_by_parent_doc_id(document_store, doc_id, status='active')
+                    existing_chunks = get_chunks_by_parent_doc_id(
+                        document_store, doc_id, status='active',
+                        include_content=False, include_embeddings=False
+                    )
                     
                     if existing_chunks:
                         # Incremental update: Update only changed chunks
@@ -824,7 +858,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                         return [TextContent(
                             type="text",
                             text=json.dumps({
-                                "status": "success",
+                                "status": update_result.get("status"),
                                 "message": update_result.get("message"),
                                 "doc_id": doc_id,
                                 "version": version,
@@ -835,7 +869,8 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                                 "changed_count": update_result.get("changed_count"),
                                 "new_count": update_result.get("new_count"),
                                 "deleted_count": update_result.get("deleted_count"),
-                                "chunk_ids": update_result.get("chunk_ids")
+                                "chunk_ids": update_result.get("chunk_ids"),
+                                "failed_chunk_ids": update_result.get("failed_chunk_ids", [])
                             }, indent=2)
                         )]
                     else:
@@ -867,14 +902,15 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                         return [TextContent(
                             type="text",
                             text=json.dumps({
-                                "status": "success",
+                                "status": store_result.get("status"),
                                 "message": store_result.get("message"),
                                 "doc_id": doc_id,
                                 "version": version,
                                 "category": category,
                                 "chunking_enabled": True,
                                 "total_chunks": store_result.get("total_chunks"),
-                                "chunk_ids": store_result.get("chunk_ids")
+                                "chunk_ids": store_result.get("chunk_ids"),
+                                "failed_chunk_ids": store_result.get("failed_chunk_ids", [])
                             }, indent=2)
                         )]
                 
@@ -905,7 +941,9 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                 
                 # Step 4: Generate fingerprint from full metadata (for accurate comparison)
                 # This ensures metadata_hash matches what will be stored
-                fingerprint = generate_content_fingerprint(content, full_metadata)
+                fingerprint = generate_content_fingerprint(
+                    content, full_metadata, precomputed_content_hash=initial_fingerprint['content_hash']
+                )
                 # Update fingerprint with the metadata_hash from full_metadata (which excludes timestamps/status)
                 fingerprint['metadata_hash'] = full_metadata.get('metadata_hash', fingerprint['metadata_hash'])
                 fingerprint['composite_key'] = f"{fingerprint['content_hash']}:{fingerprint['metadata_hash']}"
@@ -1022,8 +1060,9 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                     text=json.dumps({"error": f"File not found: {file_path}"}, indent=2)
                 )]
             
-            # Read file content
+            # Read file content (cache key taken first, so a later write invalidates it)
             try:
+                fingerprint_cache_key = file_fingerprint_cache_key(path)
                 content = path.read_text(encoding="utf-8")
             except Exception as e:
                 return [TextContent(
@@ -1042,7 +1081,9 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                 
                 # Step 2: Generate initial content hash for duplicate checking
                 file_metadata_for_fingerprint = {**metadata, "file_path": str(path), "file_name": path.name}
-                initial_fingerprint = generate_content_fingerprint(content, file_metadata_for_fingerprint)
+                initial_fingerprint = generate_content_fingerprint(
+                    content, file_metadata_for_fingerprint, cache_key=fingerprint_cache_key
+                )
                 
                 # Step 3: Build RULE 3 compliant metadata with file-specific fields
                 try:
@@ -1055,6 +1096,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                         file_path=str(path),
                         source=source,
                         tags=tags if isinstance(tags, list) else [],
+                        hash_file=cached_file_hash(path, fingerprint_cache_key),
                         additional_metadata={**metadata, "file_name": path.name}
                     )
                 except ValueError as e:
@@ -1066,7 +1108,9 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                     )]
                 
                 # Step 4: Generate fingerprint from full metadata (for accurate comparison)
-                fingerprint = generate_content_fingerprint(content, full_metadata)
+                fingerprint = generate_content_fingerprint(
+                    content, full_metadata, precomputed_content_hash=initial_fingerprint['content_hash']
+                )
                 fingerprint['metadata_hash'] = full_metadata.get('metadata_hash', fingerprint['metadata_hash'])
                 fingerprint['composite_key'] = f"{fingerprint['content_hash']}:{fingerprint['metadata_hash']}"
                 
@@ -1239,8 +1283,9 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                 }
                 language = ext_to_lang.get(path.suffix.lower(), "unknown")
             
-            # Read file content
+            # Read file content (cache key taken first, so a later write invalidates it)
             try:
+                fingerprint_cache_key = file_fingerprint_cache_key(path)
                 content = path.read_text(encoding="utf-8")
             except Exception as e:
                 return [TextContent(
@@ -1260,7 +1305,10 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                 # Step 2: Check if chunking is enabled and handle chunked code file update
                 if enable_chunking:
                     # Check if code file already has chunks
-                    existing_chunks = get_chunks_by_parent_doc_id(code_document_store, doc_id, status='active')
+                    existing_chunks = get_chunks_by_parent_doc_id(
+                        code_document_store, doc_id, status='active',
+                        include_content=False, include_embeddings=False
+                    )
                     
                     # Build parent metadata with code-specific fields
                     code_metadata = {
@@ -1303,7 +1351,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                         return [TextContent(
                             type="text",
                             text=json.dumps({
-                                "status": "success",
+                                "status": update_result.get("status"),
                                 "message": update_result.get("message"),
                                 "doc_id": doc_id,
                                 "file_path": str(path),
@@ -1318,7 +1366,8 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                                 "changed_count": update_result.get("changed_count"),
                                 "new_count": update_result.get("new_count"),
                                 "deleted_count": update_result.get("deleted_count"),
-                                "chunk_ids": update_result.get("chunk_ids")
+                                "chunk_ids": update_result.get("chunk_ids"),
+                                "failed_chunk_ids": update_result.get("failed_chunk_ids", [])
                             }, indent=2)
                         )]
                     else:
@@ -1351,7 +1400,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                         return [TextContent(
                             type="text",
                             text=json.dumps({
-                                "status": "success",
+                                "status": store_result.get("status"),
                                 "message": store_result.get("message"),
                                 "doc_id": doc_id,
                                 "file_path": str(path),
@@ -1362,7 +1411,8 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                                 "collection": "code",
                                 "chunking_enabled": True,
                                 "total_chunks": store_result.get("total_chunks"),
-                                "chunk_ids": store_result.get("chunk_ids")
+                                "chunk_ids": store_result.get("chunk_ids"),
+                                "failed_chunk_ids": store_result.get("failed_chunk_ids", [])
                             }, indent=2)
                         )]
                 
@@ -1375,7 +1425,9 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                     "language": language,
                     "content_type": "code"
                 }
-                initial_fingerprint = generate_content_fingerprint(content, code_metadata_for_fingerprint)
+                initial_fingerprint = generate_content_fingerprint(
+                    content, code_metadata_for_fingerprint, cache_key=fingerprint_cache_key
+                )
                 
                 # Step 3: Build RULE 3 compliant metadata with code-specific fields
                 try:
@@ -1388,6 +1440,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                         file_path=str(path),
                         source=source,
                         tags=tags if isinstance(tags, list) else [],
+                        hash_file=cached_file_hash(path, fingerprint_cache_key),
                         additional_metadata={
                             **metadata,
                             "file_name": path.name,
@@ -1406,7 +1459,9 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                     )]
                 
                 # Step 4: Generate fingerprint from full metadata (for accurate comparison)
-                fingerprint = generate_content_fingerprint(content, full_metadata)
+                fingerprint = generate_content_fingerprint(
+                    content, full_metadata, precomputed_content_hash=initial_fingerprint['content_hash']
+                )
                 fingerprint['metadata_hash'] = full_metadata.get('metadata_hash', fingerprint['metadata_hash'])
                 fingerprint['composite_key'] = f"{fingerprint['content_hash']}:{fingerprint['metadata_hash']}"
                 
@@ -2068,8 +2123,18 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
         elif name == "export_documents":
             filters = arguments.get("filters")
             include_embeddings = arguments.get("include_embeddings", False)
+            output_path = arguments.get("output_path")
             
             try:
+                if output_path:
+                    result = export_documents(
+                        document_store, filters, include_embeddings, output_path=output_path
+                    )
+                    return [TextContent(
+                        type="text",
+                        text=json.dumps(result, indent=2)
+                    )]
+                
                 exported = export_documents(document_store, filters, include_embeddings)
                 return [TextContent(
                     type="text",
@@ -2090,16 +2155,20 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
         
         elif name == "import_documents":
             documents_data = arguments.get("documents_data", [])
+            input_path = arguments.get("input_path")
             duplicate_strategy = arguments.get("duplicate_strategy", "skip")
-            batch_size = arguments.get("batch_size", 100)
+            batch_size = arguments.get("batch_size", IMPORT_BATCH_SIZE)
             
-            if not documents_data:
+            if not documents_data and not input_path:
                 return [TextContent(
                     type="text",
-                    text=json.dumps({"error": "documents_data is required"}, indent=2)
+                    text=json.dumps({"error": "documents_data or input_path is required"}, indent=2)
                 )]
             
             try:
+                if not documents_data:
+                    documents_data = list(read_exported_documents(input_path))
+                
                 result = import_documents(
                     document_store,
                     documents_data,
@@ -2287,6 +2356,9 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
             backup_directory = arguments.get("backup_directory", "./backups")
             include_embeddings = arguments.get("include_embeddings", False)
             filters = arguments.get("filters")
+            resume = arguments.get("resume", False)
+            embedding_dtype = arguments.get("embedding_dtype", "float32")
+            archive = arguments.get("archive", False)
             
             try:
                 result = create_backup(
@@ -2294,7 +2366,10 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
                     backup_directory=backup_directory,
                     include_embeddings=include_embeddings,
                     filters=filters,
-                    code_document_store=code_document_store  # Include code collection in backup
+                    code_document_store=code_document_store,  # Include code collection in backup
+                    resume=resume,
+                    embedding_dtype=embedding_dtype,
+                    archive=archive
                 )
                 return [TextContent(
                     type="text",
@@ -2345,9 +2420,10 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> Sequence[TextConten
         
         elif name == "list_backups":
             backup_directory = arguments.get("backup_directory", "./backups")
+            limit = arguments.get("limit")
             
             try:
-                result = list_backups(backup_directory=backup_directory)
+                result = list_backups(backup_directory=backup_directory, limit=limit)
                 return [TextContent(
                     type="text",
                     text=json.dumps(result, indent=2, default=str)
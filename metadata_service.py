@@ -176,7 +176,8 @@ def build_chunk_metadata(
     repo: str = 'qdrant_haystack',
     tags: Optional[List[str]] = None,
     status: str = 'active',
-    parent_metadata: Optional[Dict] = None
+    parent_metadata: Optional[Dict] = None,
+    parent_content_hash: Optional[str] = None
 ) -> Dict:
     """
     Build RULE 3 compliant metadata schema for a document chunk.
@@ -206,6 +207,8 @@ def build_chunk_metadata(
         tags: List of tags (inherited from parent, default: empty list)
         status: Document status (default: 'active')
         parent_metadata: Optional parent document metadata to copy
+        parent_content_hash: Optional hash of the whole normalized parent content,
+            used to skip re-chunking unchanged documents (not part of metadata_hash)
         
     Returns:
         Dictionary with RULE 3 compliant chunk metadata
@@ -256,11 +259,14 @@ def build_chunk_metadata(
     if file_path:
         metadata['file_path'] = file_path
         metadata['path'] = file_path
+    if parent_content_hash:
+        metadata['parent_content_hash'] = parent_content_hash
     
     # Copy parent metadata fields if provided (excluding conflicting ones)
     if parent_metadata:
         excluded_fields = {'doc_id', 'chunk_id', 'chunk_index', 'parent_doc_id', 
-                          'is_chunk', 'total_chunks', 'hash_content', 'content_hash'}
+                          'is_chunk', 'total_chunks', 'hash_content', 'content_hash',
+                          'parent_content_hash'}
         for key, value in parent_metadata.items():
             if key not in excluded_fields and key not in metadata:
                 metadata[key] = value
@@ -268,7 +274,7 @@ def build_chunk_metadata(
     # Add metadata_hash for deduplication (exclude chunk-specific fields from hash)
     metadata_for_hash = {k: v for k, v in metadata.items() 
                         if k not in ['created_at', 'updated_at', 'status', 'version',
-                                    'chunk_index', 'total_chunks']}
+                                    'chunk_index', 'total_chunks', 'parent_content_hash']}
     import json
     metadata_json = json.dumps(metadata_for_hash, sort_keys=True, default=str)
     metadata['metadata_hash'] = hashlib.sha256(metadata_json.encode('utf-8')).hexdigest()
@@ -25,7 +25,7 @@ from haystack.dataclasses.document import Document
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
 from haystack.components.embedders import SentenceTransformersDocumentEmbedder
 
-from deduplication_service import normalize_content, generate_content_fingerprint
+from deduplication_service import normalize_content, generate_content_fingerprint, hash_hex
 from metadata_service import build_metadata_schema, VALID_CATEGORIES
 from verification_service import verify_content_quality, bulk_verify_category
 from bulk_operations_service import export_documents, update_metadata_by_filter
@@ -77,7 +77,7 @@ def generate_migration_metadata(
     
     # Generate content hash
     normalized_content = normalize_content(content)
-    hash_content = hashlib.sha256(normalized_content.encode('utf-8')).hexdigest()
+    hash_content = hash_hex(normalized_content.encode('utf-8'))
     
     # Extract or generate doc_id
     doc_id = (
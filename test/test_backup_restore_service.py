@@ -0,0 +1,547 @@
+"""
+Unit tests for backup_restore_service module.
+
+Backups are round-tripped through an in-memory Qdrant (QdrantClient(":memory:"))
+patched in as the bulk client: create_backup, then restore_backup into a second
+collection, then compare the points.
+"""
+import gzip
+import json
+import random
+import tarfile
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.models import Distance, PointStruct, VectorParams
+
+from backup_restore_service import (
+    create_backup,
+    restore_backup,
+    list_backups,
+    _iter_documents_files,
+    BACKUP_INDEX_FILE,
+)
+
+
+SOURCE_COLLECTION = "source_docs"
+TARGET_COLLECTION = "restored_docs"
+VECTOR_SIZE = 4
+POINT_COUNT = 50
+
+
+def _source_points() -> list:
+    """Points with IDs spread over the UUID space, so every backup slice gets some."""
+    points = []
+    for i in range(POINT_COUNT):
+        points.append(PointStruct(
+            id=str(uuid.UUID(int=random.Random(i).getrandbits(128))),
+            # Small integers are exact in float16 as well as float32
+            vector=[float(i), 1.0, 2.0, -3.0],
+            payload={
+                "content": f"Document number {i}",
+                "meta": {"doc_id": f"doc_{i}", "category": "user_rule", "status": "active"}
+            }
+        ))
+    return points
+
+
+@pytest.fixture
+def qdrant_client():
+    """In-memory Qdrant with a populated source and an empty target collection."""
+    client = QdrantClient(":memory:")
+    for name in (SOURCE_COLLECTION, TARGET_COLLECTION):
+        # DOT keeps vectors as written (COSINE would normalize them)
+        client.create_collection(name, vectors_config=VectorParams(size=VECTOR_SIZE, distance=Distance.DOT))
+    client.upsert(SOURCE_COLLECTION, points=_source_points())
+    with patch('backup_restore_service._get_qdrant_client', return_value=client):
+        yield client
+
+
+def _store(index: str) -> Mock:
+    """Mock QdrantDocumentStore for a collection."""
+    document_store = Mock()
+    document_store.index = index
+    return document_store
+
+
+def _points(client: QdrantClient, collection_name: str) -> dict:
+    """Map point ID -> (payload, vector) for every point of a collection."""
+    points, _ = client.scroll(collection_name, limit=POINT_COUNT * 2, with_payload=True, with_vectors=True)
+    return {str(point.id): (point.payload, point.vector) for point in points}
+
+
+def _restore(backup_path: str) -> dict:
+    """Restore a backup into the target collection and check it succeeded."""
+    result = restore_backup(backup_path, _store(TARGET_COLLECTION), verify_after_restore=False)
+    assert result["status"] == "success", result
+    assert result["errors"] is None
+    return result
+
+
+def _assert_round_trip(client: QdrantClient, backup_path: str) -> None:
+    """Restore a backup with embeddings and check the target matches the source."""
+    result = _restore(backup_path)
+    
+    assert result["restored_count"] == POINT_COUNT
+    assert _points(client, TARGET_COLLECTION) == _points(client, SOURCE_COLLECTION)
+
+
+class TestParallelSliceBackup:
+    """Test backups scrolled in parallel UUID-range slices."""
+    
+    def test_sliced_backup_round_trip(self, qdrant_client, tmp_path):
+        """Test that a sliced backup writes one file per slice and restores every point."""
+        result = create_backup(
+            _store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True,
+            parallel_slices=4, scroll_page_size=7
+        )
+        
+        assert result["status"] == "success", result
+        assert result["document_count"] == POINT_COUNT
+        files = result["backup_metadata"]["collections"]["documentation"]["files"]
+        assert files == [f"documents.part{i}.ndjson.gz" for i in range(4)]
+        _assert_round_trip(qdrant_client, result["backup_path"])
+    
+    def test_single_slice_round_trip(self, qdrant_client, tmp_path):
+        """Test that parallel_slices=1 writes a single documents file."""
+        result = create_backup(
+            _store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True, parallel_slices=1
+        )
+        
+        assert result["status"] == "success", result
+        assert result["backup_metadata"]["collections"]["documentation"]["files"] == ["documents.ndjson.gz"]
+        _assert_round_trip(qdrant_client, result["backup_path"])
+    
+    def test_empty_slices_are_removed(self, qdrant_client, tmp_path):
+        """Test that slices without points leave no files behind."""
+        qdrant_client.delete_collection(SOURCE_COLLECTION)
+        qdrant_client.create_collection(
+            SOURCE_COLLECTION, vectors_config=VectorParams(size=VECTOR_SIZE, distance=Distance.DOT)
+        )
+        # Both points fall into the first of 16 slices
+        qdrant_client.upsert(SOURCE_COLLECTION, points=[
+            PointStruct(id=str(uuid.UUID(int=i + 1)), vector=[1.0] * VECTOR_SIZE,
+                        payload={"content": f"doc {i}", "meta": {}})
+            for i in range(2)
+        ])
+        
+        result = create_backup(
+            _store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True, parallel_slices=16
+        )
+        
+        assert result["status"] == "success", result
+        assert result["backup_metadata"]["collections"]["documentation"]["files"] == ["documents.part0.ndjson.gz"]
+        backup_files = sorted(path.name for path in Path(result["backup_path"]).iterdir())
+        assert backup_files == [
+            "documents.part0.embeddings.bin", "documents.part0.ndjson.gz", "manifest.json", "metadata.json"
+        ]
+    
+    def test_backup_without_embeddings_restores_through_document_store(self, qdrant_client, tmp_path):
+        """Test that a backup without embeddings is restored via write_documents."""
+        result = create_backup(_store(SOURCE_COLLECTION), str(tmp_path), parallel_slices=4)
+        assert result["status"] == "success", result
+        assert "embeddings" not in result["backup_metadata"]["collections"]["documentation"]
+        target_store = _store(TARGET_COLLECTION)
+        
+        restore_result = restore_backup(result["backup_path"], target_store, verify_after_restore=False)
+        
+        assert restore_result["restored_count"] == POINT_COUNT
+        written = [
+            document for call in target_store.write_documents.call_args_list for document in call.args[0]
+        ]
+        assert sorted(document.content for document in written) == sorted(
+            payload["content"] for payload, _ in _points(qdrant_client, SOURCE_COLLECTION).values()
+        )
+
+
+def _documents_files(backup_path: str) -> list:
+    """Documents files of the documentation collection, in restore order."""
+    metadata = json.loads((Path(backup_path) / "metadata.json").read_bytes())
+    return [Path(backup_path) / name for name in metadata["collections"]["documentation"]["files"]]
+
+
+class TestBackupCompression:
+    """Test compressed and uncompressed backup documents files."""
+    
+    def test_gzip_round_trip(self, qdrant_client, tmp_path):
+        """Test that gzip files hold one JSON document per line and restore every point."""
+        result = create_backup(
+            _store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True, scroll_page_size=7
+        )
+        
+        assert result["status"] == "success", result
+        assert result["backup_metadata"]["compression"] == "gzip"
+        lines = [
+            line for path in _documents_files(result["backup_path"])
+            for line in gzip.decompress(path.read_bytes()).splitlines()
+        ]
+        assert len(lines) == POINT_COUNT
+        assert all(json.loads(line)["content"].startswith("Document number") for line in lines)
+        _assert_round_trip(qdrant_client, result["backup_path"])
+    
+    def test_uncompressed_round_trip(self, qdrant_client, tmp_path):
+        """Test that compress=False writes plain NDJSON files."""
+        result = create_backup(
+            _store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True, compress=False
+        )
+        
+        assert result["status"] == "success", result
+        assert result["backup_metadata"]["compression"] is None
+        documents_files = _documents_files(result["backup_path"])
+        assert all(path.name.endswith(".ndjson") for path in documents_files)
+        assert sum(len(path.read_bytes().splitlines()) for path in documents_files) == POINT_COUNT
+        _assert_round_trip(qdrant_client, result["backup_path"])
+    
+    def test_invalid_compress(self, qdrant_client, tmp_path):
+        """Test that an unknown compression is rejected before anything is written."""
+        result = create_backup(_store(SOURCE_COLLECTION), str(tmp_path), compress="lz4")
+        
+        assert result["status"] == "error"
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_corrupted_file_fails_integrity_check(self, qdrant_client, tmp_path):
+        """Test that the streamed checksums catch a modified documents file."""
+        result = create_backup(_store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True)
+        documents_file = _documents_files(result["backup_path"])[0]
+        documents_file.write_bytes(documents_file.read_bytes() + b"x")
+        
+        restore_result = restore_backup(result["backup_path"], _store(TARGET_COLLECTION))
+        
+        assert restore_result["status"] == "error"
+        assert restore_result["error"] == "Backup integrity check failed"
+
+
+def _fail_scroll_call(client: QdrantClient, failing_call: int):
+    """Patch client.scroll so that its failing_call-th call (1-based) raises."""
+    original_scroll = client.scroll
+    lock = threading.Lock()
+    calls = []
+    
+    def scroll(*args, **kwargs):
+        with lock:
+            calls.append(kwargs.get("offset"))
+            call_number = len(calls)
+        if call_number == failing_call:
+            raise ConnectionError("connection lost")
+        return original_scroll(*args, **kwargs)
+    
+    return patch.object(client, "scroll", side_effect=scroll)
+
+
+class TestBackupResume:
+    """Test resuming an interrupted backup from its checkpoints."""
+    
+    def test_resume_partly_written_slice(self, qdrant_client, tmp_path):
+        """Test that a resumed slice drops bytes past the checkpoint and continues after the last ID."""
+        with _fail_scroll_call(qdrant_client, failing_call=3):
+            interrupted = create_backup(
+                _store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True,
+                parallel_slices=1, scroll_page_size=10
+            )
+        assert interrupted["status"] == "error"
+        [backup_path] = tmp_path.iterdir()
+        assert not (backup_path / "manifest.json").exists()
+        
+        progress = json.loads((backup_path / "documents.ndjson.gz.progress.json").read_bytes())
+        assert progress["count"] == 20
+        # Simulate a page that was being written when the process died
+        with open(backup_path / "documents.ndjson.gz", "ab") as f:
+            f.write(b"torn page")
+        with open(backup_path / "documents.embeddings.bin", "ab") as f:
+            f.write(b"\0" * 7)
+        
+        with _fail_scroll_call(qdrant_client, failing_call=0) as resumed_scroll:
+            result = create_backup(_store(SOURCE_COLLECTION), str(tmp_path), resume=True)
+        
+        assert result["status"] == "success", result
+        assert result["resumed"] is True
+        assert result["backup_path"] == str(backup_path)
+        assert result["document_count"] == POINT_COUNT
+        # Scrolling continued at the last checkpointed point instead of the start
+        assert resumed_scroll.call_args_list[0].kwargs["offset"] == progress["last_id"]
+        assert list(backup_path.glob("*progress.json")) == []
+        _assert_round_trip(qdrant_client, str(backup_path))
+    
+    def test_resume_sliced_backup(self, qdrant_client, tmp_path):
+        """Test that finished slices are kept and interrupted ones continue."""
+        with _fail_scroll_call(qdrant_client, failing_call=6):
+            interrupted = create_backup(
+                _store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True,
+                parallel_slices=4, scroll_page_size=5
+            )
+        assert interrupted["status"] == "error"
+        
+        result = create_backup(_store(SOURCE_COLLECTION), str(tmp_path), resume=True)
+        
+        assert result["status"] == "success", result
+        assert result["resumed"] is True
+        assert result["document_count"] == POINT_COUNT
+        _assert_round_trip(qdrant_client, result["backup_path"])
+    
+    def test_resume_reuses_interrupted_settings(self, qdrant_client, tmp_path):
+        """Test that a resumed backup keeps the settings it was started with."""
+        with _fail_scroll_call(qdrant_client, failing_call=2):
+            create_backup(
+                _store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True,
+                parallel_slices=1, scroll_page_size=10, compress=False
+            )
+        
+        result = create_backup(_store(SOURCE_COLLECTION), str(tmp_path), resume=True, compress="gzip")
+        
+        assert result["status"] == "success", result
+        assert result["backup_metadata"]["compression"] is None
+        assert result["backup_metadata"]["include_embeddings"] is True
+        assert result["backup_metadata"]["collections"]["documentation"]["files"] == ["documents.ndjson"]
+    
+    def test_resume_without_interrupted_backup_starts_new(self, qdrant_client, tmp_path):
+        """Test that resume=True starts a new backup when there is nothing to resume."""
+        result = create_backup(_store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True, resume=True)
+        
+        assert result["status"] == "success", result
+        assert result["resumed"] is False
+        _assert_round_trip(qdrant_client, result["backup_path"])
+
+
+class TestEmbeddingSidecars:
+    """Test embeddings stored in binary sidecars next to the documents files."""
+    
+    def test_sidecar_rows_match_points(self, qdrant_client, tmp_path):
+        """Test that documents reference their vector by row and the sidecar holds float32 rows."""
+        result = create_backup(
+            _store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True,
+            parallel_slices=4, scroll_page_size=7
+        )
+        assert result["status"] == "success", result
+        embeddings = result["backup_metadata"]["collections"]["documentation"]["embeddings"]
+        assert embeddings["dtype"] == "<f4"
+        assert embeddings["dim"] == VECTOR_SIZE
+        
+        source = _points(qdrant_client, SOURCE_COLLECTION)
+        rows = 0
+        for documents_file in _documents_files(result["backup_path"]):
+            sidecar = documents_file.with_name(embeddings["files"][documents_file.name])
+            matrix = np.fromfile(sidecar, dtype="<f4").reshape(-1, VECTOR_SIZE)
+            for line in gzip.decompress(documents_file.read_bytes()).splitlines():
+                document = json.loads(line)
+                assert "embedding" not in document
+                assert matrix[document["embedding_row"]].tolist() == source[document["id"]][1]
+            rows += len(matrix)
+        assert rows == POINT_COUNT
+    
+    def test_sidecars_in_manifest(self, qdrant_client, tmp_path):
+        """Test that every sidecar is covered by the manifest checksums."""
+        result = create_backup(_store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True)
+        embeddings = result["backup_metadata"]["collections"]["documentation"]["embeddings"]
+        manifest_files = {entry["filename"] for entry in result["manifest"]["files"]}
+        
+        assert set(embeddings["files"].values()) <= manifest_files
+        
+        sidecar = Path(result["backup_path"]) / next(iter(embeddings["files"].values()))
+        sidecar.write_bytes(sidecar.read_bytes()[:-1] + b"\1")
+        assert restore_backup(result["backup_path"], _store(TARGET_COLLECTION))["status"] == "error"
+    
+    def test_inline_embeddings_still_read(self, tmp_path):
+        """Test that documents files written before sidecars keep their inline embeddings."""
+        documents_file = tmp_path / "documents.ndjson"
+        documents_file.write_text(json.dumps({"id": "1", "content": "a", "meta": {}, "embedding": [0.5, 1.5]}) + "\n")
+        
+        [document] = list(_iter_documents_files([documents_file], None))
+        
+        assert document["embedding"] == [0.5, 1.5]
+
+
+def _sidecar_size(backup: dict) -> int:
+    """Total size of a backup's embeddings sidecars, from its manifest."""
+    return sum(
+        entry["size"] for entry in backup["manifest"]["files"] if entry["filename"].endswith(".embeddings.bin")
+    )
+
+
+class TestFloat16Embeddings:
+    """Test embeddings stored at half precision."""
+    
+    def test_float16_round_trip(self, qdrant_client, tmp_path):
+        """Test that float16 sidecars are half the size and restore as float32 vectors."""
+        float32_backup = create_backup(
+            _store(SOURCE_COLLECTION), str(tmp_path / "float32"), include_embeddings=True, parallel_slices=1
+        )
+        float16_backup = create_backup(
+            _store(SOURCE_COLLECTION), str(tmp_path / "float16"), include_embeddings=True,
+            parallel_slices=1, embedding_dtype="float16"
+        )
+        
+        assert float16_backup["status"] == "success", float16_backup
+        embeddings = float16_backup["backup_metadata"]["collections"]["documentation"]["embeddings"]
+        assert embeddings["dtype"] == "<f2"
+        assert _sidecar_size(float16_backup) == POINT_COUNT * VECTOR_SIZE * 2
+        assert _sidecar_size(float16_backup) * 2 == _sidecar_size(float32_backup)
+        # The test vectors are exactly representable in float16
+        _assert_round_trip(qdrant_client, float16_backup["backup_path"])
+    
+    def test_float16_rounds_vectors(self, qdrant_client, tmp_path):
+        """Test that vectors not representable in float16 are restored rounded."""
+        qdrant_client.upsert(SOURCE_COLLECTION, points=[
+            PointStruct(id=str(uuid.UUID(int=1)), vector=[0.1, 0.2, 0.3, 0.4], payload={"content": "x", "meta": {}})
+        ])
+        result = create_backup(
+            _store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True, embedding_dtype="float16"
+        )
+        
+        _restore(result["backup_path"])
+        
+        _, vector = _points(qdrant_client, TARGET_COLLECTION)[str(uuid.UUID(int=1))]
+        assert vector == np.asarray([0.1, 0.2, 0.3, 0.4], dtype=np.float16).astype(np.float32).tolist()
+    
+    def test_invalid_embedding_dtype(self, qdrant_client, tmp_path):
+        """Test that an unknown embedding_dtype is rejected."""
+        result = create_backup(_store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True, embedding_dtype="int8")
+        
+        assert result["status"] == "error"
+        assert "embedding_dtype" in result["error"]
+
+
+class TestZstdBackup:
+    """Test zstd-compressed backup documents files."""
+    
+    def test_zstd_round_trip(self, qdrant_client, tmp_path):
+        """Test that zstd files (one frame per page) restore every point."""
+        zstandard = pytest.importorskip("zstandard")
+        result = create_backup(
+            _store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True,
+            compress="zstd", scroll_page_size=7
+        )
+        
+        assert result["status"] == "success", result
+        assert result["backup_metadata"]["compression"] == "zstd"
+        documents_files = _documents_files(result["backup_path"])
+        assert all(path.name.endswith(".ndjson.zst") for path in documents_files)
+        lines = []
+        for path in documents_files:
+            with zstandard.ZstdDecompressor().stream_reader(path.read_bytes(), read_across_frames=True) as reader:
+                lines.extend(reader.read().splitlines())
+        assert len(lines) == POINT_COUNT
+        _assert_round_trip(qdrant_client, result["backup_path"])
+    
+    def test_zstd_without_package(self, qdrant_client, tmp_path):
+        """Test that compress="zstd" is rejected when zstandard is not installed."""
+        with patch('backup_restore_service.zstandard', None):
+            result = create_backup(_store(SOURCE_COLLECTION), str(tmp_path), compress="zstd")
+        
+        assert result["status"] == "error"
+        assert "zstandard" in result["error"]
+
+
+class TestBackupArchive:
+    """Test backups packed into a single tar archive."""
+    
+    def test_archive_round_trip(self, qdrant_client, tmp_path):
+        """Test that archive=True leaves only a .tar, with metadata.json first, that restores."""
+        result = create_backup(
+            _store(SOURCE_COLLECTION), str(tmp_path), include_embeddings=True, archive=True
+        )
+        
+        assert result["status"] == "success", result
+        archive_path = Path(result["backup_path"])
+        assert archive_path.name == f"{result['backup_id']}.tar"
+        assert sorted(path.name for path in tmp_path.iterdir() if path.name.startswith("backup_")) == [archive_path.name]
+        with tarfile.open(archive_path) as archive:
+            names = archive.getnames()
+        assert names[0] == "metadata.json"
+        assert names[1] == "manifest.json"
+        _assert_round_trip(qdrant_client, str(archive_path))
+        # The archive is unpacked into a temporary directory that is removed again
+        assert sorted(path.name for path in tmp_path.iterdir() if path.name.startswith(".restore_")) == []
+    
+    def test_list_backups_reads_archives(self, qdrant_client, tmp_path):
+        """Test that list_backups lists archived and directory backups alike."""
+        with patch('backup_restore_service.datetime') as mock_datetime:
+            for second, archive in ((1, True), (2, False)):
+                mock_datetime.now.return_value = datetime(2026, 1, 1, 0, 0, second, tzinfo=timezone.utc)
+                create_backup(_store(SOURCE_COLLECTION), str(tmp_path), archive=archive)
+        
+        result = list_backups(str(tmp_path))
+        
+        assert result["status"] == "success"
+        assert [Path(backup["backup_path"]).name for backup in result["backups"]] == [
+            f"backup_{SOURCE_COLLECTION}_20260101_000002",
+            f"backup_{SOURCE_COLLECTION}_20260101_000001.tar",
+        ]
+        assert all(backup["document_count"] == POINT_COUNT for backup in result["backups"])
+
+
+def _backup_at(tmp_path: Path, second: int, **kwargs) -> dict:
+    """Create a backup with a fixed timestamp (one per second keeps names unique)."""
+    with patch('backup_restore_service.datetime') as mock_datetime:
+        mock_datetime.now.return_value = datetime(2026, 1, 1, 0, 0, second, tzinfo=timezone.utc)
+        result = create_backup(_store(SOURCE_COLLECTION), str(tmp_path), **kwargs)
+    assert result["status"] == "success", result
+    return result
+
+
+def _listed_names(tmp_path: Path) -> list:
+    """Backup file names returned by list_backups, newest first."""
+    result = list_backups(str(tmp_path))
+    assert result["status"] == "success"
+    return [Path(backup["backup_path"]).name for backup in result["backups"]]
+
+
+class TestBackupIndex:
+    """Test the index.jsonl of completed backups used by list_backups."""
+    
+    def test_first_backup_indexes_existing_backups(self, qdrant_client, tmp_path):
+        """Test that the first indexed backup does not hide backups made before the index."""
+        older = _backup_at(tmp_path, 1)
+        (tmp_path / BACKUP_INDEX_FILE).unlink()
+        
+        newer = _backup_at(tmp_path, 2)
+        
+        assert (tmp_path / BACKUP_INDEX_FILE).exists()
+        assert _listed_names(tmp_path) == [Path(newer["backup_path"]).name, Path(older["backup_path"]).name]
+    
+    def test_concurrent_listing_does_not_drop_backup(self, qdrant_client, tmp_path):
+        """Test that an index written from a scan that missed a new backup still lists it."""
+        older = _backup_at(tmp_path, 1)
+        index_path = tmp_path / BACKUP_INDEX_FILE
+        stale_scan = index_path.read_bytes()
+        index_path.unlink()
+        
+        newer = _backup_at(tmp_path, 2)
+        # A list_backups that scanned before the new backup finished writes its index last
+        with open(index_path, "ab") as f:
+            f.write(stale_scan)
+        
+        assert _listed_names(tmp_path) == [Path(newer["backup_path"]).name, Path(older["backup_path"]).name]
+    
+    def test_backup_after_listing_is_appended(self, qdrant_client, tmp_path):
+        """Test that a backup created after the index was written is listed."""
+        first = _backup_at(tmp_path, 1)
+        assert _listed_names(tmp_path) == [Path(first["backup_path"]).name]
+        
+        second = _backup_at(tmp_path, 2)
+        
+        assert _listed_names(tmp_path) == [Path(second["backup_path"]).name, Path(first["backup_path"]).name]
+    
+    def test_duplicate_index_entries_listed_once(self, qdrant_client, tmp_path):
+        """Test that a backup recorded by both a scan and an append is listed once."""
+        result = _backup_at(tmp_path, 1)
+        index_path = tmp_path / BACKUP_INDEX_FILE
+        index_path.write_bytes(index_path.read_bytes() * 2)
+        
+        listing = list_backups(str(tmp_path))
+        
+        assert [Path(backup["backup_path"]).name for backup in listing["backups"]] == [Path(result["backup_path"]).name]
+        assert listing["total_backups"] == 1
+    
+    def test_index_write_failure_does_not_fail_backup(self, qdrant_client, tmp_path):
+        """Test that a backup still succeeds when the index cannot be written."""
+        with patch('backup_restore_service._append_backup_index', side_effect=OSError("read-only")):
+            result = create_backup(_store(SOURCE_COLLECTION), str(tmp_path))
+        
+        assert result["status"] == "success", result
+        assert _listed_names(tmp_path) == [Path(result["backup_path"]).name]
@@ -11,15 +11,45 @@ from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
 from qdrant_client.models import Filter, FieldCondition, MatchValue, MatchAny, Range
 
 from bulk_operations_service import (
+    _get_qdrant_client,
     _convert_haystack_filter_to_qdrant,
+    _ensure_collection,
+    _ensure_payload_indexes,
+    _INDEXED_COLLECTIONS,
+    _paused_indexing,
     delete_by_filter,
     delete_by_ids,
     update_metadata_by_filter,
     export_documents,
     import_documents,
+    read_exported_documents,
 )
 
 
+class TestGetQdrantClient:
+    """Test _get_qdrant_client transport selection."""
+    
+    @pytest.mark.parametrize("prefer_grpc_env, expected", [
+        (None, False),
+        ("false", False),
+        ("true", True),
+        ("1", True),
+    ])
+    @patch('bulk_operations_service._cached_client')
+    def test_grpc_is_opt_in(self, mock_cached_client, monkeypatch, prefer_grpc_env, expected):
+        """Test REST is used unless QDRANT_PREFER_GRPC opts into gRPC."""
+        monkeypatch.setenv("QDRANT_URL", "http://localhost:6333")
+        monkeypatch.setenv("QDRANT_API_KEY", "key")
+        if prefer_grpc_env is None:
+            monkeypatch.delenv("QDRANT_PREFER_GRPC", raising=False)
+        else:
+            monkeypatch.setenv("QDRANT_PREFER_GRPC", prefer_grpc_env)
+        
+        _get_qdrant_client()
+        
+        mock_cached_client.assert_called_once_with("http://localhost:6333", "key", expected)
+
+
 class TestConvertHaystackFilterToQdrant:
     """Test _convert_haystack_filter_to_qdrant function with all operators."""
     
@@ -229,6 +259,48 @@ class TestConvertHaystackFilterToQdrant:
         
         assert result is not None
         assert result.must[0].key == "content"  # No prefix removal
+    
+    def test_convert_reuses_cached_filter(self):
+        """Test that equal filters (regardless of key order) are converted once."""
+        first = _convert_haystack_filter_to_qdrant(
+            {"field": "meta.status", "operator": "==", "value": "cached"}
+        )
+        second = _convert_haystack_filter_to_qdrant(
+            {"value": "cached", "operator": "==", "field": "meta.status"}
+        )
+        
+        assert first is second
+
+
+class TestEnsurePayloadIndexes:
+    """Test _ensure_payload_indexes helper."""
+    
+    def setup_method(self):
+        _INDEXED_COLLECTIONS.clear()
+    
+    @patch('bulk_operations_service.ensure_payload_indexes')
+    def test_ensures_once_per_collection(self, mock_ensure):
+        """Indexes are ensured on first use only."""
+        mock_ensure.return_value = {"status": "success"}
+        client = Mock()
+        
+        _ensure_payload_indexes("test_collection", client)
+        _ensure_payload_indexes("test_collection", client)
+        _ensure_payload_indexes("other_collection", client)
+        
+        assert mock_ensure.call_count == 2
+    
+    @patch('bulk_operations_service.ensure_payload_indexes')
+    def test_retries_after_failure(self, mock_ensure):
+        """A failed attempt is not cached and never raises."""
+        mock_ensure.side_effect = [Exception("unavailable"), {"status": "success"}]
+        client = Mock()
+        
+        _ensure_payload_indexes("test_collection", client)
+        _ensure_payload_indexes("test_collection", client)
+        
+        assert mock_ensure.call_count == 2
+        assert "test_collection" in _INDEXED_COLLECTIONS
 
 
 class TestDeleteByFilter:
@@ -236,18 +308,12 @@ class TestDeleteByFilter:
     
     @patch('bulk_operations_service._get_qdrant_client')
     def test_delete_by_filter_success(self, mock_get_client):
-        """Test successful deletion by filter."""
+        """Test successful server-side deletion by filter."""
         # Setup mocks
         mock_client = Mock()
         mock_get_client.return_value = mock_client
-        
-        # Mock scroll results
-        from qdrant_client.models import ScoredPoint
-        mock_points = [
-            ScoredPoint(id=1, score=1.0, payload={}, vector=None),
-            ScoredPoint(id=2, score=1.0, payload={}, vector=None),
-        ]
-        mock_client.scroll.return_value = (mock_points, None)
+        mock_client.get_collection.return_value.payload_schema = {"meta.category": "keyword"}
+        mock_client.count.return_value = Mock(count=2)
         mock_client.delete.return_value = None
         
         document_store = Mock()
@@ -259,12 +325,20 @@ class TestDeleteByFilter:
         assert result["status"] == "success"
         assert result["deleted_count"] == 2
         mock_client.delete.assert_called_once()
+        mock_client.scroll.assert_not_called()
+        
+        from qdrant_client.models import FilterSelector
+        selector = mock_client.delete.call_args.kwargs["points_selector"]
+        assert isinstance(selector, FilterSelector)
+        assert selector.filter.must[0].key == "meta.category"
     
     @patch('bulk_operations_service._get_qdrant_client')
     def test_delete_by_filter_no_matches(self, mock_get_client):
         """Test deletion when no documents match filter."""
         mock_client = Mock()
         mock_get_client.return_value = mock_client
+        mock_client.get_collection.return_value.payload_schema = {"meta.category": "keyword"}
+        mock_client.count.return_value = Mock(count=0)
         mock_client.scroll.return_value = ([], None)
         
         document_store = Mock()
@@ -278,14 +352,15 @@ class TestDeleteByFilter:
         mock_client.delete.assert_not_called()
     
     @patch('bulk_operations_service._get_qdrant_client')
-    def test_delete_by_filter_pagination(self, mock_get_client):
-        """Test deletion with pagination (multiple scroll calls)."""
+    def test_delete_by_filter_unindexed_field_falls_back_to_scroll(self, mock_get_client):
+        """Test deletion with pagination when the filtered field has no payload index."""
         mock_client = Mock()
         mock_get_client.return_value = mock_client
+        mock_client.get_collection.return_value.payload_schema = {}
         
-        from qdrant_client.models import ScoredPoint
+        from qdrant_client.models import Record
         # First scroll returns points with next_offset, second returns empty
-        mock_points1 = [ScoredPoint(id=i, score=1.0, payload={}, vector=None) for i in range(100)]
+        mock_points1 = [Record(id=i, payload={}, vector=None) for i in range(100)]
         mock_points2 = []
         mock_client.scroll.side_effect = [
             (mock_points1, "next_offset_123"),
@@ -302,6 +377,90 @@ class TestDeleteByFilter:
         assert result["status"] == "success"
         assert result["deleted_count"] == 100
         assert mock_client.scroll.call_count == 2
+        mock_client.count.assert_not_called()
+        # The scroll ended on an empty page, so the last delete is repeated as a waited barrier
+        waits = [call.kwargs["wait"] for call in mock_client.delete.call_args_list]
+        assert waits == [False, True]
+        assert mock_client.delete.call_args.kwargs["points_selector"] == list(range(100))
+    
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_delete_by_filter_fallback_splits_id_ranges_per_shard(self, mock_get_client):
+        """Test that the fallback on a multi-shard collection deletes every point exactly once."""
+        import threading
+        import uuid
+        from qdrant_client.models import Record
+        
+        point_ids = sorted((str(uuid.uuid4()) for _ in range(250)), key=lambda i: uuid.UUID(i).int)
+        lock = threading.Lock()
+        deleted = []
+        
+        def scroll(collection_name, scroll_filter, limit, offset, with_payload, with_vectors):
+            start = 0 if offset is None else next(
+                i for i, point_id in enumerate(point_ids) if uuid.UUID(point_id).int >= uuid.UUID(offset).int
+            )
+            page = point_ids[start:start + limit]
+            next_offset = point_ids[start + limit] if start + limit < len(point_ids) else None
+            return [Record(id=point_id, payload={}) for point_id in page], next_offset
+        
+        waited = []
+        
+        def delete(collection_name, points_selector, wait):
+            with lock:
+                deleted.extend(points_selector)
+                if wait:
+                    waited.append(points_selector[-1])
+        
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+        mock_client.get_collection.return_value.payload_schema = {}
+        mock_client.get_collection.return_value.config.params.shard_number = 3
+        mock_client.scroll.side_effect = scroll
+        mock_client.delete.side_effect = delete
+        
+        document_store = Mock()
+        document_store.index = "test_collection"
+        
+        filters = {"field": "meta.category", "operator": "==", "value": "user_rule"}
+        result = delete_by_filter(document_store, filters)
+        
+        assert result["status"] == "success"
+        assert result["deleted_count"] == 250
+        assert sorted(deleted) == sorted(point_ids)
+        # Each range waits on its final page delete only
+        assert len(waited) == 3
+        assert point_ids[-1] in waited
+    
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_delete_by_filter_rejects_unparseable_filter(self, mock_get_client):
+        """Test that a filter converting to no conditions never reaches Qdrant."""
+        document_store = Mock()
+        document_store.index = "test_collection"
+        
+        result = delete_by_filter(document_store, {"field": "meta.category", "operator": "~", "value": "x"})
+        
+        assert result["status"] == "error"
+        assert result["deleted_count"] == 0
+        mock_get_client.assert_not_called()
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_delete_by_filter_requires_delete_all_without_filter(self, mock_get_client):
+        """Test that an empty filter only deletes everything with delete_all=True."""
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+        mock_client.count.return_value = Mock(count=3)
+        document_store = Mock()
+        document_store.index = "test_collection"
+        
+        result = delete_by_filter(document_store, {})
+        assert result["status"] == "error"
+        mock_client.delete.assert_not_called()
+        
+        result = delete_by_filter(document_store, {}, delete_all=True)
+        assert result["status"] == "success"
+        assert result["deleted_count"] == 3
+        mock_client.delete.assert_called_once()
 
 
 class TestDeleteByIds:
@@ -338,16 +497,8 @@ class TestUpdateMetadataByFilter:
         """Test successful metadata update by filter."""
         mock_client = Mock()
         mock_get_client.return_value = mock_client
-        
-        from qdrant_client.models import ScoredPoint
-        mock_point = ScoredPoint(
-            id=1,
-            score=1.0,
-            payload={"meta": {"category": "user_rule", "status": "active"}},
-            vector=[0.1, 0.2, 0.3]
-        )
-        mock_client.scroll.return_value = ([mock_point], None)
-        mock_client.upsert.return_value = None
+        mock_client.count.return_value = Mock(count=1)
+        mock_client.set_payload.return_value = None
         
         document_store = Mock()
         document_store.index = "test_collection"
@@ -359,28 +510,54 @@ class TestUpdateMetadataByFilter:
         
         assert result["status"] == "success"
         assert result["updated_count"] == 1
-        mock_client.upsert.assert_called_once()
+        mock_client.set_payload.assert_called_once()
+        call_kwargs = mock_client.set_payload.call_args.kwargs
+        assert call_kwargs["payload"] == metadata_updates
+        assert call_kwargs["key"] == "meta"
+        mock_client.scroll.assert_not_called()
+        mock_client.upsert.assert_not_called()
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_update_metadata_by_filter_no_matches(self, mock_get_client):
+        """Test update when no documents match filter."""
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+        mock_client.count.return_value = Mock(count=0)
+        
+        document_store = Mock()
+        document_store.index = "test_collection"
+        
+        filters = {"field": "meta.category", "operator": "==", "value": "nonexistent"}
+        result = update_metadata_by_filter(document_store, filters, {"status": "deprecated"})
+        
+        assert result["status"] == "success"
+        assert result["updated_count"] == 0
+        mock_client.set_payload.assert_not_called()
 
 
 class TestExportDocuments:
     """Test export_documents function."""
     
-    def test_export_documents_success(self):
+    @patch('bulk_operations_service._ensure_payload_indexes')
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_export_documents_success(self, mock_get_client, mock_ensure):
         """Test successful document export."""
-        document_store = Mock()
-        mock_docs = [
-            Document(
-                content="Content 1",
-                meta={"doc_id": "doc1", "category": "user_rule"},
-                id="id1"
+        from qdrant_client.models import Record
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+        mock_client.scroll.return_value = ([
+            Record(
+                id=1,
+                payload={"id": "id1", "content": "Content 1", "meta": {"doc_id": "doc1", "category": "user_rule"}}
             ),
-            Document(
-                content="Content 2",
-                meta={"doc_id": "doc2", "category": "project_rule"},
-                id="id2"
+            Record(
+                id=2,
+                payload={"id": "id2", "content": "Content 2", "meta": {"doc_id": "doc2", "category": "project_rule"}}
             )
-        ]
-        document_store.filter_documents = Mock(return_value=mock_docs)
+        ], None)
+        
+        document_store = Mock()
+        document_store.index = "test_collection"
         
         filters = {"field": "meta.category", "operator": "==", "value": "user_rule"}
         result = export_documents(document_store, filters)
@@ -390,80 +567,406 @@ class TestExportDocuments:
         assert "documents" in result
         assert len(result["documents"]) == 2
     
-    def test_export_documents_no_filters(self):
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_export_documents_no_filters(self, mock_get_client):
         """Test export with no filters (exports all)."""
+        from qdrant_client.models import Record
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+        mock_client.scroll.return_value = (
+            [Record(id=1, payload={"id": "id1", "content": "Test", "meta": {}})],
+            None
+        )
+        
         document_store = Mock()
-        mock_docs = [Document(content="Test", meta={}, id="id1")]
-        document_store.filter_documents = Mock(return_value=mock_docs)
+        document_store.index = "test_collection"
         
         result = export_documents(document_store, None)
         
         assert result["status"] == "success"
         assert result["exported_count"] == 1
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_export_documents_without_embeddings_skips_vectors(self, mock_get_client):
+        """Test that vectors are not fetched when embeddings are not requested."""
+        from qdrant_client.models import Record
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+        mock_client.scroll.return_value = (
+            [Record(id=1, payload={"id": "id1", "content": "Test", "meta": {}})],
+            None
+        )
+        
+        document_store = Mock()
+        document_store.index = "test_collection"
+        
+        exported = export_documents(document_store, None, include_embeddings=False)
+        
+        assert exported == [{"id": "id1", "content": "Test", "meta": {}}]
+        assert mock_client.scroll.call_args.kwargs["with_vectors"] is False
+        document_store.filter_documents.assert_not_called()
+
+
+class TestExportDocumentsToFile:
+    """Test export_documents streaming to a JSONL file."""
+    
+    @patch('bulk_operations_service._ensure_payload_indexes')
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_export_streams_pages_and_embeddings(self, mock_get_client, mock_ensure, tmp_path):
+        """Test that pages are written as JSONL with embeddings in a binary sidecar."""
+        import json
+        import numpy as np
+        from qdrant_client.models import Record
+        
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+        mock_client.scroll.side_effect = [
+            ([Record(id=1, payload={"id": "doc-a", "content": "A", "meta": {"doc_id": "a"}}, vector=[0.1, 0.2])], 2),
+            ([Record(id=2, payload={"id": "doc-b", "content": "B", "meta": {"doc_id": "b"}}, vector=[0.3, 0.4])], None),
+        ]
+        
+        document_store = Mock()
+        document_store.index = "test_collection"
+        output_path = tmp_path / "export.jsonl"
+        
+        result = export_documents(
+            document_store,
+            include_embeddings=True,
+            output_path=output_path
+        )
+        
+        assert result["status"] == "success"
+        assert result["exported_count"] == 2
+        assert result["embeddings"] == {"dtype": "float32", "dim": 2, "rows": 2}
+        document_store.filter_documents.assert_not_called()
+        
+        lines = [json.loads(line) for line in output_path.read_text().splitlines()]
+        assert [line["id"] for line in lines] == ["doc-a", "doc-b"]
+        assert [line["embedding_row"] for line in lines] == [0, 1]
+        
+        matrix = np.fromfile(result["embeddings_path"], dtype="<f4").reshape(-1, 2)
+        assert np.allclose(matrix, [[0.1, 0.2], [0.3, 0.4]])
+        
+        documents = list(read_exported_documents(output_path))
+        assert [doc["id"] for doc in documents] == ["doc-a", "doc-b"]
+        assert "embedding_row" not in documents[0]
+        assert np.allclose([doc["embedding"] for doc in documents], [[0.1, 0.2], [0.3, 0.4]])
+
+
+class TestPausedIndexing:
+    """Test _paused_indexing context manager."""
+    
+    @staticmethod
+    def _client(threshold):
+        client = MagicMock()
+        client.get_collection.return_value.config.optimizer_config.indexing_threshold = threshold
+        return client
+    
+    def test_pauses_and_restores_threshold(self):
+        """Test indexing is paused during the load and the previous threshold restored."""
+        client = self._client(20000)
+        
+        with _paused_indexing(client, "test_collection"):
+            paused = client.update_collection.call_args.kwargs["optimizers_config"]
+            assert paused.indexing_threshold == 0
+        
+        assert client.update_collection.call_count == 2
+        restored = client.update_collection.call_args.kwargs["optimizers_config"]
+        assert restored.indexing_threshold == 20000
+    
+    def test_restores_threshold_on_error(self):
+        """Test the threshold is restored when the load fails."""
+        client = self._client(20000)
+        
+        with pytest.raises(ValueError):
+            with _paused_indexing(client, "test_collection"):
+                raise ValueError("load failed")
+        
+        restored = client.update_collection.call_args.kwargs["optimizers_config"]
+        assert restored.indexing_threshold == 20000
+    
+    @pytest.mark.parametrize("threshold", [None, 0])
+    def test_unset_or_paused_threshold_left_alone(self, threshold):
+        """Test nothing is changed when the threshold cannot be restored or is already paused."""
+        client = self._client(threshold)
+        
+        with _paused_indexing(client, "test_collection"):
+            pass
+        
+        client.update_collection.assert_not_called()
+    
+    def test_config_error_loads_normally(self):
+        """Test an unreadable collection config neither pauses nor restores."""
+        client = MagicMock()
+        client.get_collection.side_effect = Exception("unavailable")
+        
+        with _paused_indexing(client, "test_collection"):
+            pass
+        
+        client.update_collection.assert_not_called()
+
+
+class TestEnsureCollection:
+    """Test _ensure_collection function."""
+    
+    def test_existing_collection_untouched(self):
+        """Test that an existing collection is not set up again."""
+        document_store = Mock()
+        document_store.index = "docs"
+        client = Mock()
+        client.collection_exists.return_value = True
+        
+        _ensure_collection(document_store, client)
+        
+        client.collection_exists.assert_called_once_with("docs")
+        document_store._set_up_collection.assert_not_called()
+    
+    def test_missing_collection_set_up_with_store_config(self):
+        """Test that a missing collection is created with the store's configuration."""
+        document_store = Mock()
+        document_store.index = "docs"
+        document_store.embedding_dim = 4
+        document_store.similarity = "cosine"
+        document_store.use_sparse_embeddings = False
+        document_store.sparse_idf = False
+        document_store.on_disk = False
+        document_store.payload_fields_to_index = None
+        client = Mock()
+        client.collection_exists.return_value = False
+        
+        _ensure_collection(document_store, client)
+        
+        document_store._set_up_collection.assert_called_once_with(
+            "docs", 4, False, "cosine", False, False, False, None
+        )
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_import_sets_up_collection_before_lookup(self, mock_get_client):
+        """Test that import_documents creates a missing collection before the duplicate lookup."""
+        calls = []
+        document_store = Mock()
+        document_store.index = "docs"
+        document_store._set_up_collection.side_effect = lambda *args: calls.append("set_up")
+        mock_client = Mock()
+        mock_client.collection_exists.return_value = False
+        mock_client.scroll.side_effect = lambda **kwargs: calls.append("scroll") or ([], None)
+        mock_get_client.return_value = mock_client
+        
+        result = import_documents(
+            document_store,
+            [{"content": "Content", "meta": {"doc_id": "doc1", "category": "user_rule"}}],
+            duplicate_strategy="skip"
+        )
+        
+        assert result["status"] == "success"
+        assert calls[0] == "set_up"
+        assert "scroll" in calls
 
 
 class TestImportDocuments:
     """Test import_documents function."""
     
-    def test_import_documents_skip_strategy(self):
+    @staticmethod
+    def _mock_client(existing):
+        """Build a client whose scroll returns points for the given (doc_id, category) pairs."""
+        from qdrant_client.models import Record
+        mock_client = Mock()
+        mock_client.scroll.return_value = (
+            [
+                Record(id=i, payload={"meta": {"doc_id": doc_id, "category": category}}, vector=None)
+                for i, (doc_id, category) in enumerate(existing)
+            ],
+            None
+        )
+        return mock_client
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_import_documents_skip_strategy(self, mock_get_client):
         """Test import with skip duplicate strategy."""
         document_store = Mock()
         document_store.write_documents = Mock(return_value=None)
+        mock_client = self._mock_client([("doc1", "user_rule")])
+        mock_get_client.return_value = mock_client
         
-        from metadata_service import query_by_doc_id
-        with patch('bulk_operations_service.query_by_doc_id') as mock_query:
-            mock_query.return_value = [Document(content="Existing", meta={"doc_id": "doc1"}, id="id1")]
-            
-            documents_data = [
-                {
-                    "content": "New content",
-                    "meta": {"doc_id": "doc1", "category": "user_rule"}
-                },
-                {
-                    "content": "Another content",
-                    "meta": {"doc_id": "doc2", "category": "user_rule"}
-                }
+        documents_data = [
+            {
+                "content": "New content",
+                "meta": {"doc_id": "doc1", "category": "user_rule"}
+            },
+            {
+                "content": "Another content",
+                "meta": {"doc_id": "doc2", "category": "user_rule"}
+            }
+        ]
+        
+        result = import_documents(
+            document_store,
+            documents_data,
+            duplicate_strategy="skip",
+            embedder=None
+        )
+        
+        assert result["status"] == "success"
+        assert result["skipped_count"] == 1
+        assert result["imported_count"] == 1
+        # Existing doc_ids and content hashes are looked up once per batch,
+        # not once per document
+        assert mock_client.scroll.call_count == 2
+        scroll_filter = mock_client.scroll.call_args_list[0].kwargs["scroll_filter"]
+        assert scroll_filter.must[0].match.any == ["doc1", "doc2"]
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_import_documents_reuses_existing_embeddings(self, mock_get_client):
+        """Test that documents carrying an embedding are not sent to the embedder."""
+        document_store = Mock()
+        document_store.use_sparse_embeddings = False
+        mock_client = self._mock_client([])
+        mock_get_client.return_value = mock_client
+        embedder = Mock()
+        embedder.run.side_effect = lambda documents: {
+            "documents": [
+                Document(content=doc.content, meta=doc.meta, embedding=[0.5, 0.6])
+                for doc in documents
             ]
-            
-            result = import_documents(
-                document_store,
-                documents_data,
-                duplicate_strategy="skip",
-                embedder=None
-            )
-            
-            assert result["status"] == "success"
-            assert result["skipped_count"] == 1
-            assert result["imported_count"] == 1
+        }
+        
+        documents_data = [
+            {"content": "Exported", "meta": {"doc_id": "doc1", "category": "user_rule"}, "embedding": [0.1, 0.2]},
+            {"content": "New", "meta": {"doc_id": "doc2", "category": "user_rule"}},
+        ]
+        
+        result = import_documents(
+            document_store,
+            documents_data,
+            duplicate_strategy="skip",
+            embedder=embedder
+        )
+        
+        assert result["imported_count"] == 2
+        embedded = embedder.run.call_args.kwargs["documents"]
+        assert [doc.meta["doc_id"] for doc in embedded] == ["doc2"]
+        points = mock_client.upsert.call_args.kwargs["points"]
+        assert [point.vector for point in points] == [[0.1, 0.2], [0.5, 0.6]]
     
-    def test_import_documents_error_strategy(self):
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_import_documents_skip_duplicate_content(self, mock_get_client):
+        """Test that only exact repeats (same content and metadata) within an import are skipped."""
+        document_store = Mock()
+        document_store.write_documents = Mock(return_value=None)
+        mock_get_client.return_value = self._mock_client([])
+        embedder = Mock()
+        embedder.run.side_effect = lambda documents: {"documents": documents}
+        
+        documents_data = [
+            {"content": "Same content", "meta": {"doc_id": "doc1", "category": "user_rule"}},
+            {"content": "Same content", "meta": {"doc_id": "doc2", "category": "user_rule"}},
+            {"content": "SAME CONTENT", "meta": {"doc_id": "doc3", "category": "user_rule"}},
+            {"content": "", "meta": {"doc_id": "doc4", "category": "user_rule"}},
+            {"content": "", "meta": {"doc_id": "doc5", "category": "user_rule"}},
+            {"content": "Same content", "meta": {"doc_id": "doc1", "category": "user_rule"}},
+        ]
+        
+        result = import_documents(
+            document_store,
+            documents_data,
+            duplicate_strategy="skip",
+            embedder=embedder
+        )
+        
+        assert result["skipped_count"] == 1
+        assert result["imported_count"] == 5
+        embedded = embedder.run.call_args.kwargs["documents"]
+        assert [doc.meta["doc_id"] for doc in embedded] == ["doc1", "doc2", "doc3", "doc4", "doc5"]
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_import_documents_skip_stored_content_same_doc_id(self, mock_get_client):
+        """Test stored content is only a duplicate for the same doc_id, and chunks are excluded."""
+        from qdrant_client.models import Record
+        from deduplication_service import generate_content_fingerprint
+        document_store = Mock()
+        document_store.write_documents = Mock(return_value=None)
+        content_hash = generate_content_fingerprint("Stored content", {})["content_hash"]
+        mock_client = Mock()
+        mock_client.scroll.side_effect = [
+            ([], None),  # doc_id lookup: nothing stored under these (doc_id, category) keys
+            ([Record(id=1, payload={"meta": {"doc_id": "doc1", "hash_content": content_hash}}, vector=None)], None),
+        ]
+        mock_get_client.return_value = mock_client
+        embedder = Mock()
+        embedder.run.side_effect = lambda documents: {"documents": documents}
+        
+        documents_data = [
+            {"content": "Stored content", "meta": {"doc_id": "doc1", "category": "reference"}},
+            {"content": "Stored content", "meta": {"doc_id": "doc2", "category": "user_rule"}},
+        ]
+        
+        result = import_documents(
+            document_store,
+            documents_data,
+            duplicate_strategy="skip",
+            embedder=embedder
+        )
+        
+        assert result["skipped_count"] == 1
+        assert result["imported_count"] == 1
+        embedded = embedder.run.call_args.kwargs["documents"]
+        assert [doc.meta["doc_id"] for doc in embedded] == ["doc2"]
+        content_filter = mock_client.scroll.call_args_list[1].kwargs["scroll_filter"]
+        assert content_filter.must_not[0].key == "meta.is_chunk"
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_import_documents_error_strategy(self, mock_get_client):
         """Test import with error on duplicate strategy."""
         document_store = Mock()
+        mock_get_client.return_value = self._mock_client([("doc1", "user_rule")])
         
-        with patch('bulk_operations_service.query_by_doc_id') as mock_query:
-            mock_query.return_value = [Document(content="Existing", meta={"doc_id": "doc1"}, id="id1")]
-            
-            documents_data = [
-                {
-                    "content": "New content",
-                    "meta": {"doc_id": "doc1", "category": "user_rule"}
-                }
-            ]
-            
-            result = import_documents(
-                document_store,
-                documents_data,
-                duplicate_strategy="error",
-                embedder=None
-            )
-            
-            assert result["status"] == "success"  # Returns success but with errors
-            assert len(result["errors"]) > 0
-            assert result["imported_count"] == 0
+        documents_data = [
+            {
+                "content": "New content",
+                "meta": {"doc_id": "doc1", "category": "user_rule"}
+            }
+        ]
+        
+        result = import_documents(
+            document_store,
+            documents_data,
+            duplicate_strategy="error",
+            embedder=None
+        )
+        
+        assert result["status"] == "success"  # Returns success but with errors
+        assert len(result["errors"]) > 0
+        assert result["imported_count"] == 0
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_import_documents_same_doc_id_other_category(self, mock_get_client):
+        """Test that a doc_id existing only in another category is not a duplicate."""
+        document_store = Mock()
+        document_store.write_documents = Mock(return_value=None)
+        mock_get_client.return_value = self._mock_client([("doc1", "project_rule")])
+        
+        documents_data = [
+            {
+                "content": "New content",
+                "meta": {"doc_id": "doc1", "category": "user_rule"}
+            }
+        ]
+        
+        result = import_documents(
+            document_store,
+            documents_data,
+            duplicate_strategy="skip",
+            embedder=None
+        )
+        
+        assert result["skipped_count"] == 0
+        assert result["imported_count"] == 1
     
-    def test_import_documents_missing_doc_id(self):
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_import_documents_missing_doc_id(self, mock_get_client):
         """Test import with missing doc_id in metadata."""
         document_store = Mock()
+        mock_get_client.return_value = self._mock_client([])
         
         documents_data = [
             {
@@ -481,4 +984,62 @@ class TestImportDocuments:
         
         assert len(result["errors"]) > 0
         assert any("doc_id" in str(error).lower() for error in result["errors"])
-
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_import_documents_upserts_embedded_batches(self, mock_get_client):
+        """Test that embedded batches are upserted directly and only the last one waits."""
+        document_store = Mock()
+        document_store.use_sparse_embeddings = False
+        mock_client = self._mock_client([])
+        mock_get_client.return_value = mock_client
+        
+        embedder = Mock()
+        embedder.run.side_effect = lambda documents: {
+            "documents": [
+                Document(content=doc.content, meta=doc.meta, embedding=[0.1, 0.2])
+                for doc in documents
+            ]
+        }
+        
+        documents_data = [
+            {"content": f"Content {i}", "meta": {"doc_id": f"doc{i}", "category": "user_rule"}}
+            for i in range(5)
+        ]
+        
+        result = import_documents(
+            document_store,
+            documents_data,
+            duplicate_strategy="skip",
+            batch_size=2,
+            embedder=embedder
+        )
+        
+        assert result["status"] == "success"
+        assert result["imported_count"] == 5
+        document_store.write_documents.assert_not_called()
+        waits = [call.kwargs["wait"] for call in mock_client.upsert.call_args_list]
+        assert waits == [False, False, True]
+    
+    def test_import_documents_into_fresh_collection(self):
+        """Test that skip-strategy import creates a collection that does not exist yet and upserts into it."""
+        from qdrant_client import QdrantClient
+        client = QdrantClient(":memory:")
+        document_store = QdrantDocumentStore(":memory:", index="fresh", embedding_dim=2, similarity="dot_product")
+        documents_data = [
+            {
+                "content": f"Content {i}",
+                "meta": {"doc_id": f"doc{i}", "category": "user_rule"},
+                "embedding": [float(i), 1.0]
+            }
+            for i in range(3)
+        ]
+        
+        # The store and the raw client share one in-memory instance
+        with patch('qdrant_client.QdrantClient', return_value=client), \
+                patch('bulk_operations_service._get_qdrant_client', return_value=client):
+            assert not client.collection_exists("fresh")
+            result = import_documents(document_store, documents_data, duplicate_strategy="skip")
+        
+        assert result["status"] == "success"
+        assert result["imported_count"] == 3
+        assert client.count("fresh").count == 3
@@ -0,0 +1,373 @@
+"""
+Unit tests for chunk_service module.
+
+Tests: content_defined_chunk, chunk_document (cdc_v1 chunker), chunks_merkle,
+identify_chunk_changes, get_chunks_by_parent_doc_id, _scroll_chunks, get_chunk_embeddings.
+"""
+import random
+import uuid
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from haystack.dataclasses.document import Document
+from haystack_integrations.document_stores.qdrant.converters import DENSE_VECTORS_NAME, convert_id
+from qdrant_client.models import Record
+
+from chunk_service import (
+    content_defined_chunk,
+    chunk_document,
+    compare_chunks,
+    chunks_merkle,
+    identify_chunk_changes,
+    get_chunks_by_parent_doc_id,
+    _scroll_chunks,
+    get_chunk_embeddings,
+    CHUNKER_CDC,
+    CHARS_PER_TOKEN,
+    CHUNK_HASH_B3_FIELD,
+)
+from deduplication_service import BLAKE3_DIGEST_SIZE, hash_hex_like
+
+
+def _sample_text(word_count: int = 3000, seed: int = 0) -> str:
+    """Build reproducible prose-like text."""
+    rng = random.Random(seed)
+    words = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta"]
+    return " ".join(rng.choice(words) for _ in range(word_count))
+
+
+class TestContentDefinedChunk:
+    """Test content_defined_chunk function."""
+    
+    def test_empty_text(self):
+        """Test that empty text yields no chunks."""
+        assert content_defined_chunk("") == []
+    
+    def test_short_text_single_chunk(self):
+        """Test that text below the minimum size is one chunk."""
+        assert content_defined_chunk("short text", target_size=400) == ["short text"]
+    
+    def test_chunks_concatenate_to_text(self):
+        """Test that chunks cover the text exactly, in order."""
+        text = _sample_text()
+        chunks = content_defined_chunk(text, target_size=400)
+        
+        assert len(chunks) > 1
+        assert "".join(chunks) == text
+    
+    def test_chunk_size_bounds(self):
+        """Test that chunks stay between target_size // 2 and target_size * 2."""
+        chunks = content_defined_chunk(_sample_text(), target_size=400)
+        
+        assert all(len(chunk) >= 200 for chunk in chunks[:-1])
+        assert all(len(chunk) <= 800 for chunk in chunks)
+    
+    def test_insertion_keeps_later_chunks(self):
+        """Test that an insertion at the start leaves the following chunks byte-identical."""
+        text = _sample_text()
+        old_chunks = content_defined_chunk(text, target_size=400)
+        new_chunks = content_defined_chunk("INSERTED PREFIX " + text, target_size=400)
+        
+        assert old_chunks[1:] == new_chunks[1:]
+    
+    def test_long_span_without_whitespace_is_cut(self):
+        """Test that a span with no boundary is force-cut at max size."""
+        text = "x" * 2000
+        chunks = content_defined_chunk(text, target_size=400)
+        
+        assert "".join(chunks) == text
+        assert all(len(chunk) <= 800 for chunk in chunks)
+
+
+class TestChunkDocumentCdc:
+    """Test chunk_document with chunker="cdc_v1"."""
+    
+    def test_cdc_chunk_metadata(self):
+        """Test chunk metadata of content-defined chunks."""
+        text = _sample_text()
+        chunks = chunk_document(text, "doc1", chunk_size=100, chunker=CHUNKER_CDC)
+        
+        assert [chunk.content for chunk in chunks] == content_defined_chunk(
+            text, target_size=100 * CHARS_PER_TOKEN
+        )
+        for index, chunk in enumerate(chunks):
+            assert chunk.meta["chunk_id"] == f"doc1_chunk_{index}"
+            assert chunk.meta["chunk_index"] == index
+            assert chunk.meta["parent_doc_id"] == "doc1"
+            assert chunk.meta["is_chunk"] is True
+            assert chunk.meta["total_chunks"] == len(chunks)
+            assert chunk.meta["chunker"] == CHUNKER_CDC
+            assert chunk.meta["hash_content"] == chunk.meta["content_hash"]
+    
+    def test_cdc_parent_metadata_does_not_override_chunk_fields(self):
+        """Test that parent metadata is inherited without overriding chunk fields."""
+        chunks = chunk_document(
+            _sample_text(200), "doc1", chunk_size=100, chunker=CHUNKER_CDC,
+            parent_metadata={"category": "user_rule", "chunker": "other", "doc_id": "parent"}
+        )
+        
+        assert chunks[0].meta["category"] == "user_rule"
+        assert chunks[0].meta["chunker"] == CHUNKER_CDC
+        assert chunks[0].meta["doc_id"] == "doc1_chunk_0"
+    
+    def test_cdc_shifted_chunks_keep_hashes(self):
+        """Test that chunks moved by an insertion keep their content hashes."""
+        text = _sample_text()
+        old_hashes = [
+            chunk.meta["hash_content"]
+            for chunk in chunk_document(text, "doc1", chunk_size=100, chunker=CHUNKER_CDC)
+        ]
+        new_hashes = [
+            chunk.meta["hash_content"]
+            for chunk in chunk_document("INSERTED PREFIX " + text, "doc1", chunk_size=100, chunker=CHUNKER_CDC)
+        ]
+        
+        assert old_hashes[1:] == new_hashes[1:]
+    
+    @patch('chunk_service.CHUNK_HASH_ALGO', 'blake3')
+    def test_blake3_hash_matches_fingerprint_digest_size(self):
+        """Test that BLAKE3 chunk hashes have the fingerprint digest length hash_hex_like recognizes."""
+        fake_blake3 = MagicMock()
+        fake_blake3.return_value.hexdigest.return_value = "ab" * BLAKE3_DIGEST_SIZE
+        with patch('chunk_service.blake3', fake_blake3), patch('deduplication_service.blake3', fake_blake3):
+            chunks = chunk_document(_sample_text(200), "doc1", chunk_size=100, chunker=CHUNKER_CDC)
+            
+            fake_blake3.return_value.hexdigest.assert_called_with(length=BLAKE3_DIGEST_SIZE)
+            b3_hash = chunks[0].meta[CHUNK_HASH_B3_FIELD]
+            assert hash_hex_like(b"data", b3_hash) == b3_hash
+
+
+def _chunk(chunk_index: int, content: str, stored: bool = False) -> Document:
+    """Build a chunk; stored chunks carry only the content hash, as listed from Qdrant."""
+    [chunk] = chunk_document(content, "tmp", chunk_size=100, chunker=CHUNKER_CDC)
+    meta = {"chunk_index": chunk_index, "hash_content": chunk.meta["hash_content"]}
+    return Document(id=f"c{chunk_index}", content=None if stored else content, meta=meta)
+
+
+class TestChunksMerkle:
+    """Test chunks_merkle and the identify_chunk_changes fast path."""
+    
+    def test_merkle_ignores_list_order(self):
+        """Test that the root depends on (chunk_index, hash) pairs, not list order."""
+        chunks = [_chunk(0, "first"), _chunk(1, "second")]
+        
+        assert chunks_merkle(chunks) == chunks_merkle(list(reversed(chunks)))
+    
+    def test_merkle_computes_missing_hash_from_content(self):
+        """Test that a chunk without hash_content is hashed from its content."""
+        stored = _chunk(0, "first", stored=True)
+        unhashed = Document(content="first", meta={"chunk_index": 0})
+        
+        assert chunks_merkle([stored]) == chunks_merkle([unhashed])
+    
+    @pytest.mark.parametrize("new_contents", [
+        ["first", "second", "third"],
+        ["first", "changed", "third"],
+        ["second", "first", "third"],
+        ["first", "second"],
+        ["first", "second", "third", "fourth"],
+    ])
+    def test_merkle_equality_matches_compare_chunks(self, new_contents):
+        """Test that equal roots occur exactly when compare_chunks finds no change."""
+        old_chunks = [_chunk(i, text, stored=True) for i, text in enumerate(["first", "second", "third"])]
+        new_chunks = [_chunk(i, text) for i, text in enumerate(new_contents)]
+        
+        changes = compare_chunks(old_chunks, new_chunks)
+        nothing_changed = not (changes["changed"] or changes["new"] or changes["deleted"])
+        
+        assert (chunks_merkle(old_chunks) == chunks_merkle(new_chunks)) == nothing_changed
+    
+    @pytest.mark.parametrize("new_contents", [
+        ["first", "second", "third"],
+        ["first", "changed", "third"],
+        ["first", "second"],
+    ])
+    def test_identify_chunk_changes_fast_path_matches_compare_chunks(self, new_contents):
+        """Test that identify_chunk_changes reports what compare_chunks reports."""
+        old_chunks = [_chunk(i, text, stored=True) for i, text in enumerate(["first", "second", "third"])]
+        new_chunks = [_chunk(i, text) for i, text in enumerate(new_contents)]
+        
+        result = identify_chunk_changes(list(reversed(old_chunks)), new_chunks)
+        expected = compare_chunks(old_chunks, new_chunks)
+        
+        for key in ("unchanged", "changed", "new", "deleted"):
+            assert [chunk.id for chunk in result["changes"][key]] == [chunk.id for chunk in expected[key]]
+            assert result[f"{key}_count"] == len(expected[key])
+    
+    @patch('chunk_service.compare_chunks')
+    def test_identify_chunk_changes_skips_compare_when_unchanged(self, mock_compare):
+        """Test that identical chunk sets are reported unchanged without compare_chunks."""
+        old_chunks = [_chunk(1, "second", stored=True), _chunk(0, "first", stored=True)]
+        new_chunks = [_chunk(0, "first"), _chunk(1, "second")]
+        
+        result = identify_chunk_changes(old_chunks, new_chunks)
+        
+        mock_compare.assert_not_called()
+        assert result["unchanged_count"] == 2
+        assert [chunk.meta["chunk_index"] for chunk in result["changes"]["unchanged"]] == [0, 1]
+    
+    def test_longer_stored_blake3_hash_compares_by_prefix(self):
+        """Test that chunks stored with a longer BLAKE3 digest compare by its prefix."""
+        old_chunks = [_chunk(i, text, stored=True) for i, text in enumerate(["first", "second"])]
+        new_chunks = [_chunk(0, "first"), _chunk(1, "second")]
+        for chunk in old_chunks:
+            chunk.meta[CHUNK_HASH_B3_FIELD] = f"{chunk.meta['chunk_index']:02x}" * 32
+        for chunk in new_chunks:
+            chunk.meta[CHUNK_HASH_B3_FIELD] = f"{chunk.meta['chunk_index']:02x}" * BLAKE3_DIGEST_SIZE
+        new_chunks[1].meta[CHUNK_HASH_B3_FIELD] = "ff" * BLAKE3_DIGEST_SIZE
+        
+        changes = compare_chunks(old_chunks, new_chunks)
+        
+        assert [chunk.id for chunk in changes["unchanged"]] == ["c0"]
+        assert [chunk.meta["chunk_index"] for chunk in changes["changed"]] == [1]
+    
+    def test_legacy_content_hash_field(self):
+        """Test that stored chunks carrying only the legacy content_hash compare as unchanged."""
+        old_chunks = [_chunk(i, text, stored=True) for i, text in enumerate(["first", "second"])]
+        for chunk in old_chunks:
+            chunk.meta["content_hash"] = chunk.meta.pop("hash_content")
+        new_chunks = [_chunk(0, "first"), _chunk(1, "changed")]
+        
+        changes = compare_chunks(old_chunks, new_chunks)
+        
+        assert [chunk.id for chunk in changes["unchanged"]] == ["c0"]
+        assert [chunk.meta["chunk_index"] for chunk in changes["changed"]] == [1]
+        assert chunks_merkle(old_chunks[:1]) == chunks_merkle(new_chunks[:1])
+
+
+def _chunk_record(chunk_index: int, vector=None, content_hash_field: str = "hash_content") -> Record:
+    """Build a Qdrant record of a stored chunk."""
+    return Record(
+        id=str(uuid.UUID(convert_id(f"doc1_chunk_{chunk_index}"))),
+        payload={
+            "id": f"doc1_chunk_{chunk_index}",
+            "meta": {"chunk_index": chunk_index, "parent_doc_id": "doc1", content_hash_field: f"h{chunk_index}"},
+        },
+        vector=vector
+    )
+
+
+class TestScrollChunks:
+    """Test _scroll_chunks and get_chunks_by_parent_doc_id without content/embeddings."""
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_scroll_pages_without_content_or_vectors(self, mock_get_client):
+        """Test that chunks are scrolled page by page with only id and meta."""
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+        mock_client.scroll.side_effect = [
+            ([_chunk_record(1)], "next"),
+            ([_chunk_record(0)], None),
+        ]
+        document_store = Mock()
+        document_store.index = "test_collection"
+        filters = {"field": "meta.parent_doc_id", "operator": "==", "value": "doc1"}
+        
+        chunks = _scroll_chunks(document_store, filters, include_content=False, include_embeddings=False)
+        
+        assert [chunk.id for chunk in chunks] == ["doc1_chunk_1", "doc1_chunk_0"]
+        assert all(chunk.content is None and chunk.embedding is None for chunk in chunks)
+        first_call, second_call = mock_client.scroll.call_args_list
+        assert first_call.kwargs["collection_name"] == "test_collection"
+        assert first_call.kwargs["with_payload"] == ["id", "meta"]
+        assert first_call.kwargs["with_vectors"] is False
+        assert first_call.kwargs["offset"] is None
+        assert second_call.kwargs["offset"] == "next"
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_scroll_named_dense_vector(self, mock_get_client):
+        """Test that the dense vector is read from a named vector when sparse embeddings are on."""
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+        mock_client.scroll.return_value = ([_chunk_record(0, vector={DENSE_VECTORS_NAME: [0.5]})], None)
+        document_store = Mock()
+        document_store.index = "test_collection"
+        
+        chunks = _scroll_chunks(document_store, {}, include_content=True, include_embeddings=True)
+        
+        assert chunks[0].embedding == [0.5]
+        assert mock_client.scroll.call_args.kwargs["with_payload"] == ["id", "meta", "content"]
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_get_chunks_sorted_and_canonicalized(self, mock_get_client):
+        """Test that scrolled chunks are sorted and the content_hash alias becomes hash_content."""
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+        mock_client.scroll.return_value = (
+            [_chunk_record(1), _chunk_record(0, content_hash_field="content_hash")], None
+        )
+        document_store = Mock()
+        document_store.index = "test_collection"
+        
+        chunks = get_chunks_by_parent_doc_id(
+            document_store, "doc1", include_content=False, include_embeddings=False
+        )
+        
+        assert [chunk.meta["chunk_index"] for chunk in chunks] == [0, 1]
+        assert chunks[0].meta["hash_content"] == "h0"
+        document_store.filter_documents.assert_not_called()
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_get_chunks_falls_back_to_filter_documents(self, mock_get_client):
+        """Test that a failed scroll falls back to document_store.filter_documents."""
+        mock_get_client.side_effect = ConnectionError("qdrant down")
+        document_store = Mock()
+        document_store.filter_documents.return_value = [
+            Document(id="c1", content="b", meta={"chunk_index": 1}),
+            Document(id="c0", content="a", meta={"chunk_index": 0}),
+        ]
+        
+        chunks = get_chunks_by_parent_doc_id(
+            document_store, "doc1", include_content=False, include_embeddings=False
+        )
+        
+        assert [chunk.id for chunk in chunks] == ["c0", "c1"]
+        document_store.filter_documents.assert_called_once()
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_get_chunks_with_everything_uses_filter_documents(self, mock_get_client):
+        """Test that the full listing keeps using filter_documents."""
+        document_store = Mock()
+        document_store.filter_documents.return_value = []
+        
+        assert get_chunks_by_parent_doc_id(document_store, "doc1") == []
+        mock_get_client.assert_not_called()
+
+
+class TestGetChunkEmbeddings:
+    """Test get_chunk_embeddings function."""
+    
+    def test_empty_ids(self):
+        """Test that no ids means no request."""
+        assert get_chunk_embeddings(Mock(), []) == {}
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_maps_point_ids_back_to_chunk_ids(self, mock_get_client):
+        """Test that retrieved vectors are keyed by the Haystack document ID."""
+        mock_client = Mock()
+        mock_get_client.return_value = mock_client
+        mock_client.retrieve.return_value = [
+            _chunk_record(0, vector=[0.1, 0.2]),
+            _chunk_record(1, vector={DENSE_VECTORS_NAME: [0.3]}),
+            _chunk_record(2, vector=None),
+        ]
+        document_store = Mock()
+        document_store.index = "test_collection"
+        chunk_ids = ["doc1_chunk_0", "doc1_chunk_1", "doc1_chunk_2"]
+        
+        embeddings = get_chunk_embeddings(document_store, chunk_ids)
+        
+        assert embeddings == {"doc1_chunk_0": [0.1, 0.2], "doc1_chunk_1": [0.3]}
+        call_kwargs = mock_client.retrieve.call_args.kwargs
+        assert call_kwargs["ids"] == [convert_id(chunk_id) for chunk_id in chunk_ids]
+        assert call_kwargs["with_payload"] is False
+        assert call_kwargs["with_vectors"] is True
+    
+    @patch('bulk_operations_service._get_qdrant_client')
+    def test_retrieve_error_returns_empty(self, mock_get_client):
+        """Test that a failed retrieve returns no embeddings (chunks are re-embedded)."""
+        mock_get_client.return_value.retrieve.side_effect = ConnectionError("qdrant down")
+        document_store = Mock()
+        document_store.index = "test_collection"
+        
+        assert get_chunk_embeddings(document_store, ["doc1_chunk_0"]) == {}
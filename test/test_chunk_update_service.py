@@ -0,0 +1,446 @@
+"""
+Unit tests for chunk_update_service module.
+
+Tests: _reuse_embeddings, _write_chunks, update_chunked_document, store_chunked_document.
+"""
+import random
+from unittest.mock import Mock, patch
+
+import pytest
+from haystack.dataclasses.document import Document
+from haystack.document_stores.types import DuplicatePolicy
+
+from chunk_service import chunk_document, generate_parent_content_hash, CHUNKER_CDC
+from chunk_update_service import (
+    _reuse_embeddings,
+    _write_chunks,
+    update_chunked_document,
+    store_chunked_document,
+)
+
+
+def _sample_text(word_count: int = 3000, seed: int = 0) -> str:
+    """Build reproducible prose-like text."""
+    rng = random.Random(seed)
+    words = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta", "eta", "theta"]
+    return " ".join(rng.choice(words) for _ in range(word_count))
+
+
+def _stored_chunks(content: str, doc_id: str = "doc1", with_embeddings: bool = False):
+    """Build stored chunk documents as get_chunks_by_parent_doc_id returns them."""
+    parent_content_hash = generate_parent_content_hash(content)
+    stored = []
+    for chunk in chunk_document(content, doc_id, chunk_size=100, chunker=CHUNKER_CDC):
+        meta = dict(chunk.meta, status="active", parent_content_hash=parent_content_hash)
+        stored.append(Document(
+            id=f"point_{meta['chunk_index']}",
+            content=None,
+            meta=meta,
+            embedding=[float(meta['chunk_index'])] if with_embeddings else None
+        ))
+    return stored
+
+
+def _chunk_doc(content_hash: str, chunk_id: str) -> Document:
+    """Build a chunk document as _build_chunk_doc returns it."""
+    return Document(content=chunk_id, meta={"hash_content": content_hash, "chunk_id": chunk_id})
+
+
+def _embedder():
+    """Mock embedder that stamps a fixed embedding on each document."""
+    embedder = Mock()
+    
+    def run(documents):
+        for document in documents:
+            document.embedding = [9.0]
+        return {"documents": documents}
+    
+    embedder.run.side_effect = run
+    return embedder
+
+
+def _failing_store(failing_chunk_ids):
+    """Mock store whose batch writes fail when they contain any of failing_chunk_ids."""
+    document_store = Mock()
+    
+    def write_documents(documents, policy=None):
+        if any(document.meta.get("chunk_id") in failing_chunk_ids for document in documents):
+            raise ValueError("write failed")
+        return len(documents)
+    
+    document_store.write_documents.side_effect = write_documents
+    return document_store
+
+
+class TestReuseEmbeddings:
+    """Test _reuse_embeddings function."""
+    
+    def test_reuse_stored_embedding_by_hash(self):
+        """Test that chunks whose hash is stored at any index reuse its embedding."""
+        existing = [
+            Document(id="old0", meta={"hash_content": "h0", "chunk_index": 0}, embedding=[0.0]),
+            Document(id="old1", meta={"hash_content": "h1", "chunk_index": 1}, embedding=[1.0]),
+        ]
+        chunk_docs = [_chunk_doc("h1", "new0"), _chunk_doc("h2", "new1")]
+        
+        to_embed = _reuse_embeddings(chunk_docs, existing)
+        
+        assert chunk_docs[0].embedding == [1.0]
+        assert to_embed == [chunk_docs[1]]
+    
+    @patch('chunk_update_service.get_chunk_embeddings')
+    def test_fetch_missing_embeddings(self, mock_get_embeddings):
+        """Test that embeddings are fetched only for matching chunks stored without them."""
+        mock_get_embeddings.return_value = {"old1": [1.0]}
+        existing = [
+            Document(id="old0", meta={"hash_content": "h0"}),
+            Document(id="old1", meta={"hash_content": "h1"}),
+        ]
+        chunk_docs = [_chunk_doc("h1", "new0")]
+        document_store = Mock()
+        
+        to_embed = _reuse_embeddings(chunk_docs, existing, document_store)
+        
+        mock_get_embeddings.assert_called_once_with(document_store, ["old1"])
+        assert chunk_docs[0].embedding == [1.0]
+        assert to_embed == []
+    
+    @patch('chunk_update_service.get_chunk_embeddings')
+    def test_missing_embedding_is_embedded(self, mock_get_embeddings):
+        """Test that a matching chunk without a stored vector is still embedded."""
+        mock_get_embeddings.return_value = {}
+        existing = [Document(id="old0", meta={"hash_content": "h0"})]
+        chunk_docs = [_chunk_doc("h0", "new0")]
+        
+        to_embed = _reuse_embeddings(chunk_docs, existing, Mock())
+        
+        assert to_embed == chunk_docs
+        assert chunk_docs[0].embedding is None
+    
+    def test_no_store_no_fetch(self):
+        """Test that stored chunks without embeddings are not reused without a store."""
+        existing = [Document(id="old0", meta={"hash_content": "h0"})]
+        chunk_docs = [_chunk_doc("h0", "new0")]
+        
+        assert _reuse_embeddings(chunk_docs, existing) == chunk_docs
+
+
+class TestUpdateChunkedDocumentCdc:
+    """Test update_chunked_document with content-defined chunking."""
+    
+    @patch('chunk_service.DEFAULT_CHUNKER', CHUNKER_CDC)
+    @patch('chunk_update_service.update_metadata_by_filter')
+    @patch('chunk_update_service.deprecate_versions', return_value={"status": "success"})
+    @patch('chunk_update_service.get_chunk_embeddings')
+    @patch('chunk_update_service.get_chunks_by_parent_doc_id')
+    def test_shifted_chunks_reuse_embeddings(
+        self, mock_get_chunks, mock_get_embeddings, mock_deprecate, mock_update_metadata
+    ):
+        """Test that chunks shifted by an insertion reuse their stored embeddings."""
+        content = _sample_text()
+        existing = _stored_chunks(content)
+        mock_get_chunks.return_value = existing
+        mock_get_embeddings.side_effect = lambda store, ids: {
+            point_id: [float(point_id.split("_")[1])] for point_id in ids
+        }
+        embedder = _embedder()
+        document_store = Mock()
+        
+        # Insert a block large enough to add chunks, so later chunks move to new indices
+        result = update_chunked_document(
+            document_store, _sample_text(600, seed=1) + " " + content, "doc1", "user_rule",
+            chunk_size=100, embedder=embedder
+        )
+        
+        assert result["status"] == "success"
+        assert result["new_count"] > 0
+        # Every stored chunk but the first kept its content at a shifted index
+        assert result["reused_embedding_count"] == len(existing) - 1
+        embedded = embedder.run.call_args.kwargs["documents"]
+        assert len(embedded) == result["changed_count"] + result["new_count"] - result["reused_embedding_count"]
+        written = document_store.write_documents.call_args.args[0]
+        assert all(chunk_doc.embedding is not None for chunk_doc in written)
+        assert all(chunk_doc.meta["chunker"] == CHUNKER_CDC for chunk_doc in written)
+
+
+class TestUpdateChunkedDocumentShortCircuit:
+    """Test the unchanged-document short-circuit of update_chunked_document."""
+    
+    @patch('chunk_update_service.update_metadata_by_filter')
+    @patch('chunk_update_service.deprecate_versions')
+    @patch('chunk_update_service.chunk_document')
+    @patch('chunk_update_service.get_chunks_by_parent_doc_id')
+    def test_unchanged_document_returns_early(
+        self, mock_get_chunks, mock_chunk_document, mock_deprecate, mock_update_metadata
+    ):
+        """Test that identical content returns without re-chunking, embedding or writing."""
+        content = _sample_text()
+        existing = _stored_chunks(content)
+        mock_get_chunks.return_value = existing
+        embedder = _embedder()
+        document_store = Mock()
+        
+        result = update_chunked_document(document_store, content, "doc1", "user_rule", embedder=embedder)
+        
+        assert result["status"] == "success"
+        assert result["total_chunks"] == len(existing)
+        assert result["unchanged_count"] == len(existing)
+        assert result["changed_count"] == 0
+        assert result["new_count"] == 0
+        assert result["deleted_count"] == 0
+        assert result["chunk_ids"] == []
+        assert "unchanged" in result["message"]
+        mock_chunk_document.assert_not_called()
+        embedder.run.assert_not_called()
+        document_store.write_documents.assert_not_called()
+        mock_deprecate.assert_not_called()
+        mock_update_metadata.assert_not_called()
+        # Only hashes and metadata are needed for the comparison
+        assert mock_get_chunks.call_args.kwargs["include_content"] is False
+        assert mock_get_chunks.call_args.kwargs["include_embeddings"] is False
+    
+    @patch('chunk_service.DEFAULT_CHUNKER', CHUNKER_CDC)
+    @patch('chunk_update_service.update_metadata_by_filter')
+    @patch('chunk_update_service.deprecate_versions', return_value={"status": "success"})
+    @patch('chunk_update_service.get_chunks_by_parent_doc_id')
+    def test_missing_chunk_does_not_short_circuit(
+        self, mock_get_chunks, mock_deprecate, mock_update_metadata
+    ):
+        """Test that a stored chunk set with a chunk missing is re-chunked and repaired."""
+        content = _sample_text()
+        existing = _stored_chunks(content)
+        mock_get_chunks.return_value = existing[:-1]
+        document_store = Mock()
+        
+        result = update_chunked_document(document_store, content, "doc1", "user_rule", chunk_size=100)
+        
+        assert result["status"] == "success"
+        assert result["unchanged_count"] == len(existing) - 1
+        assert result["new_count"] == 1
+        assert result["chunk_ids"] == [existing[-1].meta["chunk_id"]]
+        document_store.write_documents.assert_called_once()
+        mock_update_metadata.assert_not_called()
+    
+    @patch('chunk_service.DEFAULT_CHUNKER', CHUNKER_CDC)
+    @patch('chunk_update_service.update_metadata_by_filter')
+    @patch('chunk_update_service.deprecate_versions', return_value={"status": "success"})
+    @patch('chunk_update_service.get_chunks_by_parent_doc_id')
+    def test_preserved_chunks_are_restamped(
+        self, mock_get_chunks, mock_deprecate, mock_update_metadata
+    ):
+        """Test that preserved chunks get the new parent_content_hash via update_metadata_by_filter."""
+        content = _sample_text()
+        existing = _stored_chunks(content)
+        # Chunks stored before parent_content_hash existed
+        for chunk in existing:
+            del chunk.meta["parent_content_hash"]
+        mock_get_chunks.return_value = existing
+        document_store = Mock()
+        
+        result = update_chunked_document(document_store, content, "doc1", "user_rule", chunk_size=100)
+        
+        assert result["status"] == "success"
+        assert result["unchanged_count"] == len(existing)
+        document_store.write_documents.assert_not_called()
+        mock_update_metadata.assert_called_once()
+        call_kwargs = mock_update_metadata.call_args.kwargs
+        assert call_kwargs["metadata_updates"] == {
+            "parent_content_hash": generate_parent_content_hash(content)
+        }
+        assert {"field": "meta.parent_doc_id", "operator": "==", "value": "doc1"} in call_kwargs["filters"]["conditions"]
+        assert {"field": "meta.status", "operator": "==", "value": "active"} in call_kwargs["filters"]["conditions"]
+        
+        # With the stamp in place, the next identical update short-circuits
+        for chunk in existing:
+            chunk.meta.update(call_kwargs["metadata_updates"])
+        mock_update_metadata.reset_mock()
+        result = update_chunked_document(document_store, content, "doc1", "user_rule", chunk_size=100)
+        
+        assert "unchanged" in result["message"]
+        mock_update_metadata.assert_not_called()
+
+
+class TestWriteChunks:
+    """Test _write_chunks function."""
+    
+    def test_batch_write(self):
+        """Test that a successful batch write writes every chunk in one call."""
+        document_store = Mock()
+        chunk_docs = [_chunk_doc(f"h{i}", f"c{i}") for i in range(3)]
+        
+        assert _write_chunks(document_store, chunk_docs, DuplicatePolicy.OVERWRITE) == []
+        document_store.write_documents.assert_called_once_with(chunk_docs, policy=DuplicatePolicy.OVERWRITE)
+    
+    def test_fallback_isolates_failing_chunks(self):
+        """Test that a failed batch write is retried per chunk, isolating the failing ones."""
+        document_store = _failing_store({"c1"})
+        chunk_docs = [_chunk_doc(f"h{i}", f"c{i}") for i in range(3)]
+        
+        failed = _write_chunks(document_store, chunk_docs, DuplicatePolicy.SKIP)
+        
+        assert failed == ["c1"]
+        # One batch attempt, then one write per chunk
+        assert document_store.write_documents.call_count == 1 + len(chunk_docs)
+        written = [
+            call.args[0][0].meta["chunk_id"] for call in document_store.write_documents.call_args_list[1:]
+        ]
+        assert written == ["c0", "c1", "c2"]
+
+
+class TestChunkWriteFailures:
+    """Test partial chunk write failures in store_chunked_document and update_chunked_document."""
+    
+    @patch('chunk_service.DEFAULT_CHUNKER', CHUNKER_CDC)
+    def test_store_partial_success(self):
+        """Test that store_chunked_document reports the chunks that could not be written."""
+        document_store = _failing_store({"doc1_chunk_2"})
+        
+        result = store_chunked_document(document_store, _sample_text(), "doc1", "user_rule", chunk_size=100)
+        
+        assert result["status"] == "partial_success"
+        assert result["failed_chunk_ids"] == ["doc1_chunk_2"]
+        assert "doc1_chunk_2" not in result["chunk_ids"]
+        assert len(result["chunk_ids"]) == result["total_chunks"] - 1
+    
+    @patch('chunk_service.DEFAULT_CHUNKER', CHUNKER_CDC)
+    def test_store_all_chunks_fail(self):
+        """Test that store_chunked_document errors when no chunk could be written."""
+        document_store = Mock()
+        document_store.write_documents.side_effect = ValueError("store down")
+        
+        result = store_chunked_document(document_store, _sample_text(), "doc1", "user_rule", chunk_size=100)
+        
+        assert result["status"] == "error"
+        assert result["error_type"] == "RuntimeError"
+    
+    @patch('chunk_service.DEFAULT_CHUNKER', CHUNKER_CDC)
+    @patch('chunk_update_service.update_metadata_by_filter')
+    @patch('chunk_update_service.deprecate_versions', return_value={"status": "success"})
+    @patch('chunk_update_service.get_chunks_by_parent_doc_id')
+    def test_update_partial_success(self, mock_get_chunks, mock_deprecate, mock_update_metadata):
+        """Test that update_chunked_document reports the chunks that could not be written."""
+        content = _sample_text()
+        existing = _stored_chunks(content)
+        mock_get_chunks.return_value = existing[:-2]
+        failing_chunk_id = existing[-1].meta["chunk_id"]
+        document_store = _failing_store({failing_chunk_id})
+        
+        result = update_chunked_document(document_store, content, "doc1", "user_rule", chunk_size=100)
+        
+        assert result["status"] == "partial_success"
+        assert result["new_count"] == 2
+        assert result["failed_chunk_ids"] == [failing_chunk_id]
+        assert result["chunk_ids"] == [existing[-2].meta["chunk_id"]]
+        assert "Failed to write: 1" in result["message"]
+
+
+def _edited_text(content: str) -> str:
+    """Replace two words so the chunks at two indices change in place."""
+    words = content.split(" ")
+    words[1500] = "omega"
+    words[2800] = "omega"
+    return " ".join(words)
+
+
+class TestUpdateDeprecation:
+    """Test that update_chunked_document deprecates old versions only after their replacements are written."""
+    
+    @patch('chunk_service.DEFAULT_CHUNKER', CHUNKER_CDC)
+    @patch('chunk_update_service.update_metadata_by_filter')
+    @patch('chunk_update_service.deprecate_versions', return_value={"status": "success"})
+    @patch('chunk_update_service.get_chunks_by_parent_doc_id')
+    def test_deprecate_after_write(self, mock_get_chunks, mock_deprecate, mock_update_metadata):
+        """Test that replaced and deleted chunks are deprecated after the new chunks are written."""
+        content = _sample_text()
+        existing = _stored_chunks(content)
+        mock_get_chunks.return_value = existing
+        calls = []
+        document_store = Mock()
+        document_store.write_documents.side_effect = lambda documents, policy=None: calls.append("write")
+        mock_deprecate.side_effect = lambda *args, **kwargs: calls.append("deprecate") or {"status": "success"}
+        
+        # Drop the last words so trailing chunks are deleted
+        result = update_chunked_document(
+            document_store, " ".join(_edited_text(content).split(" ")[:2900]), "doc1", "user_rule",
+            chunk_size=100
+        )
+        
+        assert result["status"] == "success"
+        assert result["changed_count"] > 0
+        assert result["deleted_count"] > 0
+        assert calls == ["write", "deprecate"]
+        deprecated = mock_deprecate.call_args.kwargs["document_ids"]
+        assert len(deprecated) == result["changed_count"] + result["deleted_count"]
+    
+    @patch('chunk_service.DEFAULT_CHUNKER', CHUNKER_CDC)
+    @patch('chunk_update_service.update_metadata_by_filter')
+    @patch('chunk_update_service.deprecate_versions', return_value={"status": "success"})
+    @patch('chunk_update_service.get_chunks_by_parent_doc_id')
+    def test_failed_write_keeps_old_version(self, mock_get_chunks, mock_deprecate, mock_update_metadata):
+        """Test that the old version of a chunk whose replacement failed to write is not deprecated."""
+        content = _sample_text()
+        existing = _stored_chunks(content)
+        mock_get_chunks.return_value = existing
+        document_store = _failing_store({existing[14].meta["chunk_id"]})
+        
+        result = update_chunked_document(document_store, _edited_text(content), "doc1", "user_rule", chunk_size=100)
+        
+        assert result["status"] == "partial_success"
+        assert result["failed_chunk_ids"] == [existing[14].meta["chunk_id"]]
+        mock_deprecate.assert_called_once_with(document_store, document_ids=["point_28"])
+    
+    @patch('chunk_service.DEFAULT_CHUNKER', CHUNKER_CDC)
+    @patch('chunk_update_service.update_metadata_by_filter')
+    @patch('chunk_update_service.deprecate_versions')
+    @patch('chunk_update_service.get_chunks_by_parent_doc_id')
+    def test_deprecation_error_is_reported(self, mock_get_chunks, mock_deprecate, mock_update_metadata):
+        """Test that a failed deprecation is surfaced as a partial success with its error."""
+        content = _sample_text()
+        mock_get_chunks.return_value = _stored_chunks(content)
+        mock_deprecate.return_value = {"status": "error", "error": "qdrant down"}
+        
+        result = update_chunked_document(Mock(), _edited_text(content), "doc1", "user_rule", chunk_size=100)
+        
+        assert result["status"] == "partial_success"
+        assert result["error"] == "qdrant down"
+        assert result["deleted_count"] == 0
+        assert result["failed_chunk_ids"] == []
+        assert "Failed to deprecate old versions: qdrant down" in result["message"]
+    
+    @patch('chunk_service.DEFAULT_CHUNKER', CHUNKER_CDC)
+    @patch('chunk_update_service.update_metadata_by_filter')
+    @patch('chunk_update_service.deprecate_versions', return_value={"status": "success"})
+    @patch('chunk_update_service.get_chunks_by_parent_doc_id')
+    def test_embedder_failure_keeps_old_versions(self, mock_get_chunks, mock_deprecate, mock_update_metadata):
+        """Test that old chunks stay active when embedding the replacements fails."""
+        content = _sample_text()
+        mock_get_chunks.return_value = _stored_chunks(content)
+        embedder = Mock()
+        embedder.run.side_effect = RuntimeError("embedder down")
+        document_store = Mock()
+        
+        result = update_chunked_document(
+            document_store, _edited_text(content), "doc1", "user_rule", chunk_size=100, embedder=embedder
+        )
+        
+        assert result["status"] == "error"
+        assert result["error"] == "embedder down"
+        document_store.write_documents.assert_not_called()
+        mock_deprecate.assert_not_called()
+    
+    @patch('chunk_service.DEFAULT_CHUNKER', CHUNKER_CDC)
+    @patch('chunk_update_service.update_metadata_by_filter')
+    @patch('chunk_update_service.deprecate_versions', return_value={"status": "success"})
+    @patch('chunk_update_service.get_chunks_by_parent_doc_id')
+    def test_write_failure_keeps_old_versions(self, mock_get_chunks, mock_deprecate, mock_update_metadata):
+        """Test that old chunks stay active when none of the replacements could be written."""
+        content = _sample_text()
+        mock_get_chunks.return_value = _stored_chunks(content)
+        document_store = Mock()
+        document_store.write_documents.side_effect = ValueError("store down")
+        
+        result = update_chunked_document(document_store, _edited_text(content), "doc1", "user_rule", chunk_size=100)
+        
+        assert result["status"] == "error"
+        assert result["error_type"] == "RuntimeError"
+        mock_deprecate.assert_not_called()
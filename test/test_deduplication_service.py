@@ -4,12 +4,26 @@ Unit tests for deduplication_service module.
 Tests all functions: normalize_content, generate_content_fingerprint,
 check_duplicate_level (all 4 levels), and decide_storage_action logic.
 """
+import hashlib
+import os
+from unittest.mock import MagicMock, patch
+
 import pytest
 from haystack.dataclasses.document import Document
 
+import deduplication_service
+
 from deduplication_service import (
     normalize_content,
     generate_content_fingerprint,
+    batched_sha256_hex,
+    hash_hex,
+    hash_hex_like,
+    content_hashes_batch,
+    generate_content_fingerprints_batch,
+    file_fingerprint_cache_key,
+    cached_file_hash,
+    build_duplicate_index,
     check_duplicate_level,
     decide_storage_action,
     DUPLICATE_LEVEL_EXACT,
@@ -142,6 +156,210 @@ class TestGenerateContentFingerprint:
         assert result["composite_key"] == f"{result['content_hash']}:{result['metadata_hash']}"
 
 
+    def test_fingerprint_precomputed_content_hash(self):
+        """Test precomputed content hash is reused and metadata hash still computed."""
+        content = "Test content"
+        metadata = {"category": "test"}
+        expected = generate_content_fingerprint(content, metadata)
+        
+        result = generate_content_fingerprint(
+            "ignored", metadata, precomputed_content_hash=expected["content_hash"]
+        )
+        
+        assert result == expected
+
+
+class TestBatchedSha256Hex:
+    """Test batched SHA256 hashing."""
+    
+    def test_batched_matches_hashlib(self):
+        """Test batched digests match per-buffer hashlib digests, in order."""
+        buffers = [b"first", b"", "second chunk".encode("utf-8")]
+        result = batched_sha256_hex(buffers)
+        
+        assert result == [hashlib.sha256(buffer).hexdigest() for buffer in buffers]
+    
+    def test_batched_empty(self):
+        """Test empty batch returns empty list."""
+        assert batched_sha256_hex([]) == []
+    
+    def test_batched_matches_fingerprint_content_hash(self):
+        """Test batched digest of normalized content matches fingerprint content_hash."""
+        content = "Some Content\r\n"
+        fingerprint = generate_content_fingerprint(content, {})
+        
+        assert batched_sha256_hex([normalize_content(content).encode("utf-8")]) == [fingerprint["content_hash"]]
+
+
+class TestFingerprintBatch:
+    """Test batched fingerprint generation."""
+    
+    def test_batch_matches_single(self):
+        """Test batch fingerprints equal per-document fingerprints, in order."""
+        pairs = [
+            ("First Doc\r\n", {"category": "other", "version": "v1"}),
+            ("", {}),
+            ("second [TODO: x] doc", {"b": 2, "a": 1}),
+        ]
+        
+        result = generate_content_fingerprints_batch(pairs)
+        
+        assert result == [generate_content_fingerprint(content, metadata) for content, metadata in pairs]
+    
+    def test_batch_empty(self):
+        """Test empty batch returns empty list."""
+        assert generate_content_fingerprints_batch([]) == []
+        assert content_hashes_batch([]) == []
+    
+    def test_content_hashes_match_fingerprint(self):
+        """Test content-only batch hashes match fingerprint content_hash."""
+        contents = ["alpha", "Beta  "]
+        
+        assert content_hashes_batch(contents) == [
+            generate_content_fingerprint(content, {})["content_hash"] for content in contents
+        ]
+
+
+class TestFingerprintCacheDir:
+    """Test the location of the LMDB fingerprint cache."""
+    
+    def test_cache_dir_is_absolute(self):
+        """Test the LMDB directory does not depend on the working directory."""
+        cache_dir = deduplication_service.FINGERPRINT_CACHE_DIR
+        assert cache_dir == "" or os.path.isabs(cache_dir)
+
+
+class TestFingerprintCache:
+    """Test the file fingerprint cache (cache_key)."""
+    
+    @pytest.fixture(autouse=True)
+    def memory_only_cache(self):
+        """Use an empty in-process cache and no LMDB tier."""
+        with patch.dict('deduplication_service._fingerprint_memory_cache', clear=True), \
+                patch('deduplication_service.FINGERPRINT_CACHE_DIR', ''):
+            yield
+    
+    def test_cache_key(self, tmp_path):
+        """Test the cache key is (absolute path, mtime_ns, size)."""
+        path = tmp_path / "doc.md"
+        path.write_text("hello")
+        
+        key = file_fingerprint_cache_key(path)
+        
+        assert key[0] == str(path.resolve())
+        assert key[2] == 5
+        assert file_fingerprint_cache_key(tmp_path / "missing.md") is None
+    
+    def test_unchanged_file_hits_cache(self, tmp_path):
+        """Test an unchanged file's content hash is served from the cache."""
+        path = tmp_path / "doc.md"
+        path.write_text("Hello")
+        key = file_fingerprint_cache_key(path)
+        first = generate_content_fingerprint("Hello", {"a": 1}, cache_key=key)
+        
+        with patch('deduplication_service.normalize_content') as mock_normalize:
+            second = generate_content_fingerprint("Hello", {"a": 2}, cache_key=key)
+        
+        mock_normalize.assert_not_called()
+        assert second["content_hash"] == first["content_hash"]
+        assert second["metadata_hash"] == generate_content_fingerprint("Hello", {"a": 2})["metadata_hash"]
+    
+    def test_changed_file_misses_cache(self):
+        """Test a different mtime or size invalidates the cached hash."""
+        path = "/tmp/doc.md"
+        generate_content_fingerprint("old", {}, cache_key=(path, 1, 3))
+        
+        result = generate_content_fingerprint("new content", {}, cache_key=(path, 2, 11))
+        
+        assert result["content_hash"] == generate_content_fingerprint("new content", {})["content_hash"]
+    
+    def test_cached_file_hash(self, tmp_path):
+        """Test the raw file hash is computed once per unchanged file."""
+        path = tmp_path / "doc.md"
+        path.write_bytes(b"Hello\r\n")
+        key = file_fingerprint_cache_key(path)
+        
+        assert cached_file_hash(path, key) == hashlib.sha256(b"Hello\r\n").hexdigest()
+        
+        path.unlink()
+        assert cached_file_hash(path, key) == hashlib.sha256(b"Hello\r\n").hexdigest()
+        assert cached_file_hash(path, None) is None
+    
+    def test_memory_tier_is_bounded(self):
+        """Test the in-process tier evicts the least recently used entries."""
+        with patch('deduplication_service.FINGERPRINT_MEMORY_CACHE_SIZE', 2):
+            for index in range(3):
+                generate_content_fingerprint(f"content {index}", {}, cache_key=(f"/tmp/doc{index}.md", 1, 9))
+            # Touch doc1 so doc2 becomes the least recently used
+            generate_content_fingerprint("content 1", {}, cache_key=("/tmp/doc1.md", 1, 9))
+            generate_content_fingerprint("content 3", {}, cache_key=("/tmp/doc3.md", 1, 9))
+        
+        paths = [key.split(":", 1)[1] for key in deduplication_service._fingerprint_memory_cache]
+        assert paths == ["/tmp/doc1.md", "/tmp/doc3.md"]
+    
+    @pytest.mark.parametrize("raw", [b"not-a-cache-entry", b"x:y:hash", b"\xff\xfe:1:2"])
+    def test_corrupt_lmdb_value_is_a_miss(self, raw):
+        """Test an unparsable LMDB value is treated as a cache miss."""
+        txn = MagicMock()
+        txn.get.return_value = raw
+        env = MagicMock()
+        env.begin.return_value.__enter__.return_value = txn
+        
+        with patch('deduplication_service._get_fingerprint_cache_env', return_value=env):
+            result = generate_content_fingerprint("Hello", {}, cache_key=("/tmp/doc.md", 1, 5))
+        
+        assert result["content_hash"] == generate_content_fingerprint("Hello", {})["content_hash"]
+    
+    def test_lmdb_tier_persists(self, tmp_path):
+        """Test hashes survive the in-process tier when lmdb is installed."""
+        pytest.importorskip("lmdb")
+        key = ("/tmp/doc.md", 1, 5)
+        with patch('deduplication_service.FINGERPRINT_CACHE_DIR', str(tmp_path / "cache")), \
+                patch('deduplication_service._fingerprint_cache_env', None):
+            expected = generate_content_fingerprint("Hello", {}, cache_key=key)
+            deduplication_service._fingerprint_memory_cache.clear()
+            
+            with patch('deduplication_service.normalize_content') as mock_normalize:
+                result = generate_content_fingerprint("Hello", {}, cache_key=key)
+        
+        mock_normalize.assert_not_called()
+        assert result == expected
+
+
+class TestHashHex:
+    """Test fingerprint hash algorithm selection."""
+    
+    def test_default_is_sha256(self):
+        """Test the default fingerprint hash is SHA256."""
+        assert hash_hex(b"data") == hashlib.sha256(b"data").hexdigest()
+    
+    @patch('deduplication_service.blake3', None)
+    @patch('deduplication_service.HASH_ALGO', 'blake3')
+    def test_blake3_falls_back_without_package(self):
+        """Test HASH_ALGO=blake3 falls back to SHA256 when blake3 is not installed."""
+        assert hash_hex(b"data") == hashlib.sha256(b"data").hexdigest()
+    
+    @patch('deduplication_service.HASH_ALGO', 'blake3')
+    def test_blake3_fingerprint(self):
+        """Test HASH_ALGO=blake3 hashes content and metadata with 128-bit BLAKE3."""
+        fake_blake3 = MagicMock()
+        fake_blake3.return_value.hexdigest.return_value = "ab" * 16
+        with patch('deduplication_service.blake3', fake_blake3):
+            result = generate_content_fingerprint("content", {"category": "other"})
+        
+        assert result["content_hash"] == "ab" * 16
+        assert result["metadata_hash"] == "ab" * 16
+        fake_blake3.return_value.hexdigest.assert_called_with(length=16)
+    
+    def test_hash_hex_like_matches_stored_algorithm(self):
+        """Test verification hashes with the algorithm of the stored digest (by length)."""
+        fake_blake3 = MagicMock()
+        fake_blake3.return_value.hexdigest.return_value = "cd" * 16
+        with patch('deduplication_service.blake3', fake_blake3):
+            assert hash_hex_like(b"data", "0" * 32) == "cd" * 16
+            assert hash_hex_like(b"data", "0" * 64) == hashlib.sha256(b"data").hexdigest()
+
+
 class TestCheckDuplicateLevel:
     """Test check_duplicate_level function for all 4 levels."""
     
@@ -406,6 +624,48 @@ class TestCheckDuplicateLevel:
         
         assert level == DUPLICATE_LEVEL_EXACT
         assert doc == existing_docs[1]
+    
+    def test_level_2_earliest_document_wins(self):
+        """Test the first qualifying document is returned, whichever check it matches."""
+        fingerprint = {
+            "content_hash": "new_hash",
+            "metadata_hash": "meta1",
+            "composite_key": "new_hash:meta1"
+        }
+        
+        existing_docs = [
+            Document(content="Doc 1", meta={"hash_content": "old1", "metadata_hash": "meta1"}),
+            Document(content="Doc 2", meta={"hash_content": "old2", "metadata_hash": "meta2", "doc_id": "doc_a"}),
+        ]
+        
+        level, doc, reason = check_duplicate_level(fingerprint, existing_docs, doc_id="doc_a")
+        
+        assert level == DUPLICATE_LEVEL_UPDATE
+        assert doc == existing_docs[0]
+        assert "metadata_hash" in reason
+    
+    def test_prebuilt_index_reused(self):
+        """Test a prebuilt duplicate index gives the same results across many checks."""
+        existing_docs = [
+            Document(content="Doc 1", meta={"hash_content": "hash1", "metadata_hash": "meta1", "doc_id": "doc_1"}),
+            Document(content="Doc 2", meta={"hash_content": "hash2", "metadata_hash": "meta2", "doc_id": "doc_2"}),
+        ]
+        duplicate_index = build_duplicate_index(existing_docs)
+        
+        for content_hash, metadata_hash, doc_id in [
+            ("hash1", "meta1", None),
+            ("hash9", "meta2", None),
+            ("hash9", "meta9", "doc_1"),
+            ("hash9", "meta9", None),
+        ]:
+            fingerprint = {
+                "content_hash": content_hash,
+                "metadata_hash": metadata_hash,
+                "composite_key": f"{content_hash}:{metadata_hash}"
+            }
+            assert check_duplicate_level(
+                fingerprint, existing_docs, doc_id=doc_id, duplicate_index=duplicate_index
+            ) == check_duplicate_level(fingerprint, existing_docs, doc_id=doc_id)
 
 
 class TestDecideStorageAction:
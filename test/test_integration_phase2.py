@@ -60,16 +60,8 @@ class TestBulkOperationsWorkflow:
         mock_client = Mock()
         mock_get_client.return_value = mock_client
         
-        from qdrant_client.models import ScoredPoint
-        mock_points = [
-            ScoredPoint(
-                id=i,
-                score=1.0,
-                payload={"meta": {"category": "user_rule", "doc_id": f"doc{i}"}},
-                vector=None
-            ) for i in range(5)
-        ]
-        mock_client.scroll.return_value = (mock_points, None)
+        mock_client.get_collection.return_value.payload_schema = {"meta.category": "keyword"}
+        mock_client.count.return_value = Mock(count=5)
         mock_client.delete.return_value = None
         
         # Export documents first
@@ -80,7 +72,12 @@ class TestBulkOperationsWorkflow:
                 id=str(i)
             ) for i in range(5)
         ]
-        mock_document_store.filter_documents = Mock(return_value=mock_docs)
+        from qdrant_client.models import Record
+        mock_client.scroll.return_value = (
+            [Record(id=i, payload={"id": doc.id, "content": doc.content, "meta": doc.meta})
+             for i, doc in enumerate(mock_docs)],
+            None
+        )
         
         filters = {"field": "meta.category", "operator": "==", "value": "user_rule"}
         export_result = export_documents(mock_document_store, filters)
@@ -100,17 +97,8 @@ class TestBulkOperationsWorkflow:
         mock_client = Mock()
         mock_get_client.return_value = mock_client
         
-        from qdrant_client.models import ScoredPoint
-        mock_points = [
-            ScoredPoint(
-                id=i,
-                score=1.0,
-                payload={"meta": {"category": "user_rule", "status": "active"}},
-                vector=[0.1, 0.2, 0.3]
-            ) for i in range(3)
-        ]
-        mock_client.scroll.return_value = (mock_points, None)
-        mock_client.upsert.return_value = None
+        mock_client.count.return_value = Mock(count=3)
+        mock_client.set_payload.return_value = None
         
         filters = {"field": "meta.category", "operator": "==", "value": "user_rule"}
         metadata_updates = {"status": "deprecated", "tags": ["archived"]}
@@ -119,7 +107,7 @@ class TestBulkOperationsWorkflow:
         
         assert result["status"] == "success"
         assert result["updated_count"] == 3
-        mock_client.upsert.assert_called_once()
+        mock_client.set_payload.assert_called_once()
     
     def test_import_export_workflow(self, mock_document_store):
         """Test import/export workflow with duplicate handling."""
@@ -136,9 +124,15 @@ class TestBulkOperationsWorkflow:
                 id="id2"
             )
         ]
-        mock_document_store.filter_documents = Mock(return_value=mock_docs)
-        
-        export_result = export_documents(mock_document_store, None)
+        from qdrant_client.models import Record
+        with patch('bulk_operations_service._get_qdrant_client') as mock_get_client:
+            mock_get_client.return_value.scroll.return_value = (
+                [Record(id=i, payload={"id": doc.id, "content": doc.content, "meta": doc.meta})
+                 for i, doc in enumerate(mock_docs)],
+                None
+            )
+            
+            export_result = export_documents(mock_document_store, None)
         
         assert export_result["status"] == "success"
         assert len(export_result["documents"]) == 2
@@ -152,8 +146,8 @@ class TestBulkOperationsWorkflow:
         ]
         
         # Import with skip strategy
-        with patch('bulk_operations_service.query_by_doc_id') as mock_query:
-            mock_query.return_value = []  # No existing docs
+        with patch('bulk_operations_service._get_qdrant_client') as mock_get_client:
+            mock_get_client.return_value.scroll.return_value = ([], None)  # No existing docs
             
             import_result = import_documents(
                 mock_document_store,
@@ -12,6 +12,7 @@ from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
 
 from metadata_service import (
     build_metadata_schema,
+    build_chunk_metadata,
     validate_metadata,
     query_by_file_path,
     query_by_content_hash,
@@ -177,6 +178,42 @@ class TestBuildMetadataSchema:
             assert metadata["category"] == category
 
 
+class TestBuildChunkMetadata:
+    """Test build_chunk_metadata function."""
+    
+    def _build(self, **kwargs):
+        return build_chunk_metadata(
+            content="Chunk content",
+            doc_id="doc_1_chunk_0",
+            chunk_id="doc_1_chunk_0",
+            chunk_index=0,
+            parent_doc_id="doc_1",
+            total_chunks=2,
+            category="user_rule",
+            hash_content="chunkhash",
+            **kwargs
+        )
+    
+    def test_parent_content_hash_stored(self):
+        """Test parent_content_hash is stored when provided."""
+        metadata = self._build(parent_content_hash="parenthash")
+        
+        assert metadata["parent_content_hash"] == "parenthash"
+    
+    def test_parent_content_hash_omitted_by_default(self):
+        """Test parent_content_hash is absent when not provided."""
+        metadata = self._build()
+        
+        assert "parent_content_hash" not in metadata
+    
+    def test_parent_content_hash_not_in_metadata_hash(self):
+        """Test parent_content_hash does not change metadata_hash."""
+        with_hash = self._build(parent_content_hash="parenthash")
+        without_hash = self._build()
+        
+        assert with_hash["metadata_hash"] == without_hash["metadata_hash"]
+
+
 class TestValidateMetadata:
     """Test validate_metadata function."""
     
@@ -1,18 +1,21 @@
 """
 Unit tests for update_service module.
 
-Tests: update_document_content, update_document_metadata, deprecate_version, get_version_history.
+Tests: update_document_content, update_document_metadata, deprecate_version, deprecate_versions,
+get_version_history.
 """
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from haystack.dataclasses.document import Document
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
 from haystack.components.embedders import SentenceTransformersDocumentEmbedder
+from haystack_integrations.document_stores.qdrant.converters import convert_id
 
 from update_service import (
     update_document_content,
     update_document_metadata,
     deprecate_version,
+    deprecate_versions,
     get_version_history,
 )
 
@@ -205,6 +208,80 @@ class TestDeprecateVersion:
         )
 
 
+class TestDeprecateVersions:
+    """Test deprecate_versions function."""
+    
+    @patch('update_service._get_qdrant_client')
+    def test_deprecate_versions_single_set_payload(self, mock_get_client):
+        """Test all versions are deprecated with one set_payload merged into meta."""
+        client = MagicMock()
+        mock_get_client.return_value = client
+        document_store = Mock()
+        document_store.index = "test_collection"
+        
+        result = deprecate_versions(document_store, ["hash1", "hash2", "hash1", None])
+        
+        assert result["status"] == "success"
+        assert result["deprecated_hashes"] == 2
+        client.set_payload.assert_called_once()
+        kwargs = client.set_payload.call_args.kwargs
+        assert kwargs["collection_name"] == "test_collection"
+        assert kwargs["key"] == "meta"
+        assert kwargs["payload"]["status"] == "deprecated"
+        condition = kwargs["points"].filter.must[0]
+        assert condition.key == "meta.hash_content"
+        assert condition.match.any == ["hash1", "hash2"]
+    
+    @patch('update_service._get_qdrant_client')
+    def test_deprecate_versions_by_document_ids(self, mock_get_client):
+        """Test versions can be deprecated by document ID in the same single call."""
+        client = MagicMock()
+        mock_get_client.return_value = client
+        document_store = Mock()
+        document_store.index = "test_collection"
+        
+        result = deprecate_versions(document_store, document_ids=["doc_1", "doc_2", "doc_1", None])
+        
+        assert result["status"] == "success"
+        assert result["deprecated_ids"] == 2
+        assert result["deprecated_hashes"] == 0
+        client.set_payload.assert_called_once()
+        condition = client.set_payload.call_args.kwargs["points"].filter.must[0]
+        assert condition.has_id == [convert_id("doc_1"), convert_id("doc_2")]
+    
+    @patch('update_service._get_qdrant_client')
+    def test_deprecate_versions_hashes_and_ids(self, mock_get_client):
+        """Test hashes and IDs are combined with OR in one filter."""
+        client = MagicMock()
+        mock_get_client.return_value = client
+        
+        deprecate_versions(Mock(), ["hash1"], document_ids=["doc_1"])
+        
+        client.set_payload.assert_called_once()
+        qdrant_filter = client.set_payload.call_args.kwargs["points"].filter
+        assert qdrant_filter.must is None
+        assert len(qdrant_filter.should) == 2
+    
+    @patch('update_service._get_qdrant_client')
+    def test_deprecate_versions_empty(self, mock_get_client):
+        """Test no call is made when there is nothing to deprecate."""
+        result = deprecate_versions(Mock(), [None, ""])
+        
+        assert result["status"] == "success"
+        assert result["deprecated_hashes"] == 0
+        mock_get_client.assert_not_called()
+    
+    @patch('update_service._get_qdrant_client')
+    def test_deprecate_versions_error(self, mock_get_client):
+        """Test client errors are returned as an error result."""
+        mock_get_client.return_value.set_payload.side_effect = Exception("Connection failed")
+        
+        result = deprecate_versions(Mock(), ["hash1"])
+        
+        assert result["status"] == "error"
+        assert "Connection failed" in result["error"]
+
+
 class TestGetVersionHistory:
     """Test get_version_history function."""
     
@@ -13,7 +13,8 @@ from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
 from haystack.components.embedders import SentenceTransformersDocumentEmbedder
 from haystack.document_stores.types import DuplicatePolicy
 from qdrant_client import QdrantClient
-from qdrant_client.models import PointStruct, Filter, FieldCondition, MatchValue
+from qdrant_client.models import PointStruct, Filter, FieldCondition, FilterSelector, HasIdCondition, MatchAny, MatchValue
+from haystack_integrations.document_stores.qdrant.converters import convert_id
 
 from deduplication_service import generate_content_fingerprint
 from metadata_service import build_metadata_schema, query_by_doc_id
@@ -339,6 +340,89 @@ def deprecate_version(
         }
 
 
+def deprecate_versions(
+    document_store: QdrantDocumentStore,
+    content_hashes: Optional[List[str]] = None,
+    collection_name: Optional[str] = None,
+    document_ids: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Mark several document versions as deprecated with a single set_payload() call.
+    
+    Batch form of deprecate_version: versions are matched by meta.hash_content
+    (MatchAny) and/or by document ID (has_id), so one round-trip replaces one call
+    per version. Matching by ID only touches the given points, whereas a content
+    hash also matches other documents storing the same content. The status and
+    updated_at fields are merged into payload["meta"] (key="meta"), leaving the
+    rest of the metadata intact.
+    
+    Args:
+        document_store: QdrantDocumentStore instance
+        content_hashes: Content hashes of the versions to deprecate (empty/None entries are ignored)
+        collection_name: Optional collection name (defaults to document_store's collection)
+        document_ids: Haystack document IDs of the versions to deprecate (empty/None entries are ignored)
+        
+    Returns:
+        Dictionary with deprecation results:
+        - status: "success" | "error"
+        - deprecated_hashes: Number of distinct content hashes deprecated
+        - deprecated_ids: Number of distinct document IDs deprecated
+    """
+    content_hashes = list(dict.fromkeys(content_hash for content_hash in content_hashes or [] if content_hash))
+    document_ids = list(dict.fromkeys(document_id for document_id in document_ids or [] if document_id))
+    if not content_hashes and not document_ids:
+        return {
+            "status": "success",
+            "deprecated_hashes": 0,
+            "deprecated_ids": 0,
+            "success": True
+        }
+    
+    try:
+        client = _get_qdrant_client()
+        
+        # Get collection name
+        if not collection_name:
+            collection_name = document_store.index
+        
+        conditions = []
+        if content_hashes:
+            conditions.append(FieldCondition(
+                key="meta.hash_content",
+                match=MatchAny(any=content_hashes)
+            ))
+        if document_ids:
+            # Points are keyed by the store's deterministic UUID of the Haystack ID
+            conditions.append(HasIdCondition(
+                has_id=[convert_id(document_id) for document_id in document_ids]
+            ))
+        qdrant_filter = Filter(must=conditions) if len(conditions) == 1 else Filter(should=conditions)
+        
+        client.set_payload(
+            collection_name=collection_name,
+            payload={"status": "deprecated", "updated_at": datetime.utcnow().isoformat() + 'Z'},
+            points=FilterSelector(filter=qdrant_filter),
+            key="meta",
+            wait=True
+        )
+        
+        return {
+            "status": "success",
+            "message": "Document versions deprecated successfully",
+            "deprecated_hashes": len(content_hashes),
+            "deprecated_ids": len(document_ids),
+            "success": True
+        }
+    
+    except Exception as e:
+        return {
+            "status": "error",
+            "error": str(e),
+            "error_type": type(e).__name__,
+            "success": False
+        }
+
+
 def get_version_history(
     document_store: QdrantDocumentStore,
     doc_id: str,
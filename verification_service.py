@@ -4,7 +4,6 @@ Verification Service for Qdrant/Haystack MCP Server.
 Implements content quality checks, placeholder detection, hash verification,
 and bulk verification operations per RULE 7.
 """
-import hashlib
 import re
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
@@ -12,7 +11,7 @@ from datetime import datetime
 from haystack.dataclasses.document import Document
 from haystack_integrations.document_stores.qdrant import QdrantDocumentStore
 
-from deduplication_service import normalize_content
+from deduplication_service import normalize_content, hash_hex_like
 from metadata_service import query_by_file_path, query_by_doc_id
 
 
@@ -108,7 +107,7 @@ def verify_hash_integrity(content: str, stored_hash: Optional[str]) -> Dict[str,
     
     # Normalize content before hashing (same as in deduplication)
     normalized_content = normalize_content(content)
-    computed_hash = hashlib.sha256(normalized_content.encode('utf-8')).hexdigest()
+    computed_hash = hash_hex_like(normalized_content.encode('utf-8'), stored_hash)
     
     return {
         'hash_valid': computed_hash == stored_hash,
@@ -366,8 +365,7 @@ def audit_storage_integrity(
     """
     from pathlib import Path
     from metadata_service import query_by_file_path
-    from deduplication_service import normalize_content
-    import hashlib
+    from deduplication_service import normalize_content, hash_hex_like
     
     # Get all stored documents
     try:
@@ -483,14 +481,14 @@ def audit_storage_integrity(
                             # Read source file content
                             source_content = source_file.read_text(encoding='utf-8')
                             
-                            # Normalize and hash source content
-                            normalized_source = normalize_content(source_content)
-                            source_hash = hashlib.sha256(normalized_source.encode('utf-8')).hexdigest()
-                            
                             # Get stored hash
                             stored_meta = stored_doc.meta or {}
                             stored_hash = stored_meta.get('hash_content') or stored_meta.get('content_hash')
                             
+                            # Normalize and hash source content (same algorithm as the stored hash)
+                            normalized_source = normalize_content(source_content)
+                            source_hash = hash_hex_like(normalized_source.encode('utf-8'), stored_hash)
+                            
                             if stored_hash and stored_hash != source_hash:
                                 # Content mismatch
                                 content_mismatches.append({